@@ -6,13 +6,34 @@ import os
 from dotenv import load_dotenv
 from extensions import db, bcrypt, jwt, migrate
 from flask_restx import Api
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from config import Config
+from services.response_cache import init_response_cache
+from services.notifications import init_notifications
+from services.auth_cache import init_auth_cache
+from services.token_blocklist import init_token_blocklist
+from services.password_hashing import init_password_hasher, get_password_hasher
+from services.skill_registry import init_skill_registry
+from services.image_uploads import UploadRequest, UPLOAD_TMP_DIR
+from services.blob_storage import init_blob_storage
+from services.image_processing import init_image_processor
+from json_provider import FastJSONProvider, output_json, dumps as json_dumps, loads as json_loads
 
 # .env 파일 로드
 load_dotenv()
 
 app = Flask(__name__)
 app.config.from_object(Config)
+# multipart 업로드 파일을 메모리 대신 업로드 폴더의 임시 파일로 바로 받음
+app.request_class = UploadRequest
+
+# JSON 직렬화 (orjson 사용 가능 시 orjson, 날짜는 ISO 8601)
+app.json = FastJSONProvider(app)
+app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {}).update({
+    'json_serializer': json_dumps,
+    'json_deserializer': json_loads
+})
 
 # CORS 설정
 CORS(app, resources={r"/*": {
@@ -32,6 +53,14 @@ db.init_app(app)
 bcrypt.init_app(app)
 migrate.init_app(app, db)
 jwt.init_app(app)
+init_response_cache(app)
+init_notifications(app)
+init_auth_cache(app)
+init_token_blocklist(app)
+init_password_hasher(app)
+init_skill_registry(app)
+init_blob_storage(app)
+init_image_processor(app)
 
 # Swagger UI 설정
 api = Api(
@@ -41,10 +70,20 @@ api = Api(
     description='Lion Connect 백엔드 API 문서',
     doc='/docs'
 )
+api.representation('application/json')(output_json)
+
+@api.errorhandler(JWTExtendedException)
+@api.errorhandler(PyJWTError)
+def handle_jwt_error(error):
+    # restx 가 JWT 예외를 500 으로 바꾸지 않도록 다시 던짐.
+    # restx 는 핸들러에서 난 예외를 Flask 의 에러 처리로 넘기므로, flask-jwt-extended 가 앱에 등록한
+    # 에러 핸들러와 아래 *_loader 콜백이 응답을 만듦
+    raise error
 
 # 업로드 폴더가 없으면 생성
 if not os.path.exists(app.config['UPLOAD_FOLDER']):
     os.makedirs(app.config['UPLOAD_FOLDER'])
+os.makedirs(os.path.join(app.config['UPLOAD_FOLDER'], UPLOAD_TMP_DIR), exist_ok=True)
 
 # 파일 확장자 검사 함수
 def allowed_file(filename):
@@ -63,20 +102,30 @@ def welcome():
 from routes.auth import auth_ns
 from routes.user import user_ns
 from routes.company import company_ns
+from routes.match import match_ns
+from routes.notification import notification_ns
 
 # 네임스페이스 등록
 api.add_namespace(auth_ns, path='/auth')
 api.add_namespace(user_ns, path='/user')
 api.add_namespace(company_ns, path='/company')
+api.add_namespace(match_ns, path='/match')
+api.add_namespace(notification_ns, path='/notifications')
 
 # 블루프린트 등록
 from routes.auth import auth_bp
 from routes.user import user_bp
 from routes.company import company_bp
+from routes.match import match_bp
+from routes.notification import notification_bp
+from routes.post import post_bp
 
 app.register_blueprint(auth_bp)
 app.register_blueprint(user_bp)
 app.register_blueprint(company_bp)
+app.register_blueprint(match_bp)
+app.register_blueprint(notification_bp)
+app.register_blueprint(post_bp, url_prefix='/posts')
 
 # JWT 에러 핸들러
 @jwt.expired_token_loader
@@ -97,6 +146,14 @@ def invalid_token_callback(error):
         'message': 'Invalid token'
     }), 401
 
+@jwt.revoked_token_loader
+def revoked_token_callback(jwt_header, jwt_payload):
+    return jsonify({
+        'status': 401,
+        'sub_status': 45,
+        'message': 'The token has been revoked'
+    }), 401
+
 @jwt.unauthorized_loader
 def unauthorized_callback(error):
     print(f"인증되지 않은 요청: {error}")  # 디버깅용 로그
@@ -108,7 +165,11 @@ def unauthorized_callback(error):
 
 @app.route('/health')
 def health_check():
-    return jsonify({'status': 'healthy'}), 200
+    hasher = get_password_hasher()
+    return jsonify({
+        'status': 'healthy',
+        'password_hashing': {'pending': hasher.pending, **hasher.stats.snapshot()}
+    }), 200
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
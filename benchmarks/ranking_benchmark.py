@@ -0,0 +1,63 @@
+"""수료생 추천 순위 계산 마이크로벤치마크.
+
+services.ranking.SkillMatrix 로 합성 데이터(수료생 × 기술)를 만들고, 질의 하나에 대해 전체 수료생의
+점수 계산 + 상위 K 선택에 걸리는 시간의 분포(p50/p99)를 측정합니다.
+
+    python benchmarks/ranking_benchmark.py --students 100000 --queries 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ranking import SkillMatrix
+
+
+def make_memberships(students, skills, per_student, rng):
+    """기술 인기도가 한쪽으로 치우친(Zipf 와 비슷한) 분포의 (user_id, 기술) 쌍을 만듭니다."""
+    names = [f'skill-{i}' for i in range(skills)]
+    weights = [1.0 / (i + 1) for i in range(skills)]
+    for user_id in range(1, students + 1):
+        for name in set(rng.choices(names, weights=weights, k=per_student)):
+            yield user_id, name
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--skills', type=int, default=2000)
+    parser.add_argument('--per-student', type=int, default=12)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--metric', choices=['cosine', 'jaccard'], default='cosine')
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    memberships = list(make_memberships(args.students, args.skills, args.per_student, rng))
+    started = time.perf_counter()
+    matrix = SkillMatrix.from_memberships(memberships)
+    print(f'matrix: {matrix.binary.shape[0]} x {matrix.binary.shape[1]}, nnz={matrix.binary.nnz}, '
+          f'built in {(time.perf_counter() - started) * 1000:.0f} ms')
+
+    names = matrix.labels
+    timings = []
+    for _ in range(args.queries):
+        terms = rng.sample(names, rng.randint(3, 8))
+        started = time.perf_counter()
+        matrix.rank(terms, args.top, metric=args.metric)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(f'{args.metric} top-{args.top}: p50 {percentile(timings, 50):.2f} ms, '
+          f'p99 {percentile(timings, 99):.2f} ms, max {max(timings):.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
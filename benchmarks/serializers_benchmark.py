@@ -0,0 +1,159 @@
+"""수료생 목록 직렬화 마이크로벤치마크.
+
+기존 방식(ORM 객체 속성으로 dict 를 만들고 flask-restx marshal 로 다시 한 번 변환)과
+services.serializers 의 컴파일된 직렬화기(튜플 행 -> dict)를 같은 데이터로 비교합니다.
+
+    python benchmarks/serializers_benchmark.py --students 10000
+
+CI(.github/workflows/benchmarks.yml)에서 작은 크기로 실행해 스크립트가 깨지지 않았는지 확인합니다.
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_restx import marshal
+from routes.user import student_profile_response
+from services.serializers import STUDENT_USER, WORK_EXPERIENCE, PROJECT, EDUCATION, AWARD, CERTIFICATE
+
+
+def make_rows(count):
+    """학생당 경력 2, 프로젝트 3, 학력 1, 수상 1, 자격증 1 개의 튜플 행을 만듭니다."""
+    d = date(2024, 1, 1)
+    variants = {name: {'width': width, 'height': width * 3 // 4, 'webp': f'/uploads/{name}.webp', 'jpeg': f'/uploads/{name}.jpg'}
+                for name, width in (('thumb', 320), ('card', 800))}
+    students = []
+    for i in range(count):
+        students.append({
+            'user': (i, f's{i}@example.com', f'학생{i}', '안녕하세요', '010-0000-0000',
+                     'https://portfolio', 'https://blog', 'https://github', 'KDT 백엔드'),
+            'skills': ['Python', 'Flask', 'React'],
+            'work_experiences': [(j, '회사', '개발팀', '인턴', False, d, d, '업무') for j in range(2)],
+            'projects': [(j, '프로젝트', '설명', '기관', 'https://p', '/uploads/p.jpg' if j == 0 else None, j == 0, d, d,
+                          ['React', 'Flask'], *((1600, 1200, variants) if j == 0 else (None, None, None)))
+                         for j in range(3)],
+            'education': [(0, '대학교', '컴퓨터공학', '학사', d, d)],
+            'awards': [(0, '수상', d, d, '설명')],
+            'certificates': [(0, '정보처리기사', '한국산업인력공단', d, '12345')],
+        })
+    return students
+
+
+def check_rows(students):
+    """합성 행의 길이가 현재 스키마의 컬럼 수와 같은지 확인합니다. (스키마에 컬럼이 추가되면 여기서 실패)"""
+    sections = [('user', STUDENT_USER), ('work_experiences', WORK_EXPERIENCE), ('projects', PROJECT),
+                ('education', EDUCATION), ('awards', AWARD), ('certificates', CERTIFICATE)]
+    for key, schema in sections:
+        rows = [students[0][key]] if key == 'user' else students[0][key]
+        for row in rows:
+            if len(row) != len(schema.columns):
+                raise SystemExit(f'{key}: 행 길이 {len(row)} != {schema.name} 컬럼 수 {len(schema.columns)}')
+
+
+def as_objects(schema, row):
+    return SimpleNamespace(**dict(zip([key for key, _ in schema.fields], row)))
+
+
+def legacy(students):
+    """기존 라우트의 dict 구성 + marshal_list_with 경로를 재현합니다."""
+    response_data = []
+    for s in students:
+        user = as_objects(STUDENT_USER, s['user'])
+        work_experiences = [as_objects(WORK_EXPERIENCE, r) for r in s['work_experiences']]
+        projects = [as_objects(PROJECT, r) for r in s['projects']]
+        education = [as_objects(EDUCATION, r) for r in s['education']]
+        awards = [as_objects(AWARD, r) for r in s['awards']]
+        certificates = [as_objects(CERTIFICATE, r) for r in s['certificates']]
+        response_data.append({
+            'user': {
+                'id': user.id, 'email': user.email, 'name': user.name, 'introduction': user.introduction,
+                'phone': user.phone, 'portfolio': user.portfolio, 'blog': user.blog, 'github': user.github,
+                'course': user.course, 'skills': list(s['skills'])
+            },
+            'work_experiences': [{
+                'id': exp.id, 'company': exp.company, 'department': exp.department, 'position': exp.position,
+                'is_current': exp.is_current,
+                'start_date': exp.start_date.isoformat() if exp.start_date else None,
+                'end_date': exp.end_date.isoformat() if exp.end_date else None,
+                'description': exp.description
+            } for exp in work_experiences],
+            'projects': [{
+                'id': proj.id, 'title': proj.title, 'description': proj.description,
+                'organization': proj.organization, 'portfolio_url': proj.portfolio_url,
+                'image_url': proj.image_url, 'is_representative': proj.is_representative,
+                'start_date': proj.start_date.isoformat() if proj.start_date else None,
+                'end_date': proj.end_date.isoformat() if proj.end_date else None,
+                'tech_stack': proj.tech_stack,
+                'image_width': proj.image_width, 'image_height': proj.image_height,
+                'image_variants': proj.image_variants
+            } for proj in projects],
+            'education': [{
+                'id': edu.id, 'school': edu.school, 'major': edu.major, 'degree': edu.degree,
+                'start_date': edu.start_date.isoformat() if edu.start_date else None,
+                'end_date': edu.end_date.isoformat() if edu.end_date else None
+            } for edu in education],
+            'awards': [{
+                'id': award.id, 'title': award.title,
+                'start_date': award.start_date.isoformat() if award.start_date else None,
+                'end_date': award.end_date.isoformat() if award.end_date else None,
+                'description': award.description
+            } for award in awards],
+            'certificates': [{
+                'id': cert.id, 'title': cert.title, 'organization': cert.organization,
+                'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
+                'credential_id': cert.credential_id
+            } for cert in certificates]
+        })
+    return marshal(response_data, student_profile_response)
+
+
+def compiled(students):
+    """컴파일된 직렬화기 경로입니다."""
+    response_data = []
+    for s in students:
+        user = STUDENT_USER.serialize(s['user'])
+        user['skills'] = list(s['skills'])
+        response_data.append({
+            'user': user,
+            'work_experiences': WORK_EXPERIENCE.serialize_many(s['work_experiences']),
+            'projects': PROJECT.serialize_many(s['projects']),
+            'education': EDUCATION.serialize_many(s['education']),
+            'awards': AWARD.serialize_many(s['awards']),
+            'certificates': CERTIFICATE.serialize_many(s['certificates']),
+        })
+    return response_data
+
+
+def best_of(func, students, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(students)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    students = make_rows(args.students)
+    check_rows(students)
+    assert [dict(p) for p in legacy(students[:10])] == [dict(p) for p in marshal(compiled(students[:10]), student_profile_response)]
+
+    legacy_time = best_of(legacy, students, args.repeat)
+    compiled_time = best_of(compiled, students, args.repeat)
+    print(f'students: {args.students}')
+    print(f'legacy (dict + marshal): {legacy_time * 1000:9.1f} ms')
+    print(f'compiled serializers   : {compiled_time * 1000:9.1f} ms')
+    print(f'speedup                : {legacy_time / compiled_time:9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -14,11 +14,82 @@ class Config:
     
     # JWT 설정
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-secret-key')
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(days=1)
+    # access token 은 짧게, 만료되면 /auth/refresh 로 비밀번호 확인 없이 갱신
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
+    JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=14)
+    JWT_REFRESH_REUSE_GRACE = 10  # 초, 교체 직후 같은 refresh token 재사용을 탈취로 보지 않는 시간 (동시 갱신 대비)
     JWT_ERROR_MESSAGE_KEY = 'error'
-    JWT_BLACKLIST_ENABLED = False
+    # 토큰 폐기 목록 (Bloom filter 로 폐기되지 않은 토큰은 DB 조회 없이 통과)
+    JWT_BLOCKLIST_BLOOM_CAPACITY = 100000
+    JWT_BLOCKLIST_BLOOM_ERROR_RATE = 0.001
+    JWT_BLOCKLIST_SYNC_INTERVAL = 5  # 초, 다른 워커의 폐기 내역을 가져오는 주기
+    JWT_BLOCKLIST_REBUILD_INTERVAL = 3600  # 초, 만료된 jti 를 빼고 필터를 새로 만드는 주기
+    # 비밀번호 해싱 (전용 스레드 풀에서 실행, 대기열이 차면 429)
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))  # work factor, 바꾸면 다음 로그인 때 다시 해싱
+    PASSWORD_HASH_WORKERS = 2  # 워커 프로세스당 동시에 해싱하는 수
+    PASSWORD_HASH_QUEUE_SIZE = 8  # 해싱을 기다릴 수 있는 요청 수
+    PASSWORD_HASH_TIMEOUT = 5  # 초, 이 시간 안에 해싱이 끝나지 않으면 503
+    SKILL_REGISTRY_MAX_ENTRIES = 50000  # 프로세스 내 기술 이름 -> id 캐시 크기
+    
+    # 수료생 명단 일괄 가입 (flask auth import-cohort, POST /auth/users/import)
+    COHORT_IMPORT_CHUNK_SIZE = 500  # 한 트랜잭션으로 저장하는 행 수
+    COHORT_IMPORT_PROCESSES = int(os.getenv('COHORT_IMPORT_PROCESSES', 0)) or None  # 비밀번호 해싱 프로세스 수 (기본값: CPU 수)
+    # API 로 한 번에 가져올 수 있는 최대 행 수 (더 큰 명단은 CLI 사용)
+    # bcrypt cost 12 는 한 번에 약 0.25초이므로 200행 / 2프로세스 ≈ 25초로 gunicorn timeout(120초) 보다 충분히 짧음
+    COHORT_IMPORT_MAX_ROWS = 200
+    COHORT_IMPORT_API_PROCESSES = 2  # API 요청 하나가 쓰는 해싱 프로세스 수 (다른 요청의 CPU 를 뺏지 않도록 제한)
+    AUTH_USER_CACHE_TTL = 60  # 초, 인증 사용자 정보(id, user_type) 캐시 유지 시간
+    AUTH_USER_CACHE_MAX_ENTRIES = 10000
     
     # 파일 업로드 설정
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
-    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'} 
\ No newline at end of file
+    ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'} 
+    IMAGE_UPLOAD_MAX_SIZE = 10 * 1024 * 1024  # 10MB, POST /user/images 로 올리는 이미지 한 장의 최대 크기
+    # 업로드 이미지 변형 (EXIF 제거, 크기별 WebP/JPEG, 요청 밖의 프로세스 풀에서 생성)
+    IMAGE_VARIANTS = {'thumb': 160, 'card': 480, 'full': 1600}  # 변형 이름 -> 긴 변 최대 픽셀
+    IMAGE_VARIANT_QUALITY = {'webp': 80, 'jpeg': 82}
+    IMAGE_PROCESSING_PROCESSES = int(os.getenv('IMAGE_PROCESSING_PROCESSES', 1))  # 워커 프로세스당 변환 프로세스 수
+    # 업로드 파일 저장소 (내용의 SHA-256 을 키로 저장해 같은 파일은 한 번만 저장, local 또는 s3)
+    BLOB_STORAGE_BACKEND = os.getenv('BLOB_STORAGE_BACKEND', 'local')
+    BLOB_S3_BUCKET = os.getenv('BLOB_S3_BUCKET')
+    BLOB_S3_PREFIX = os.getenv('BLOB_S3_PREFIX', 'uploads/')
+    BLOB_S3_ENDPOINT_URL = os.getenv('BLOB_S3_ENDPOINT_URL')  # MinIO 등 S3 호환 저장소 주소 (없으면 AWS S3)
+    BLOB_S3_REGION = os.getenv('BLOB_S3_REGION')
+    BLOB_S3_PUBLIC_URL = os.getenv('BLOB_S3_PUBLIC_URL')  # 파일 URL 앞부분 (CDN 주소 등, 없으면 버킷 주소)
+    BLOB_GC_GRACE_HOURS = 24  # 이보다 최근에 올린 파일은 참조가 없어도 지우지 않음 (flask user gc-uploads)
+    
+    # 수료생 목록 페이지네이션 설정
+    STUDENT_PAGE_DEFAULT_SIZE = 20
+    STUDENT_PAGE_MAX_SIZE = 100
+    STUDENT_EXPORT_BATCH_SIZE = 500  # 스트리밍 내보내기 시 한 번에 읽는 수료생 수
+    
+    # 매칭 추천 설정 (유사도 기준 상위 K 명)
+    MATCH_SUGGESTION_DEFAULT_SIZE = 20
+    MATCH_SUGGESTION_MAX_SIZE = 100
+    MATCH_BATCH_RESPOND_MAX_SIZE = 100  # 일괄 응답 한 번에 처리할 최대 요청 수
+    RANKING_METRIC = os.getenv('RANKING_METRIC', 'cosine')  # cosine 또는 jaccard (둘 다 IDF 가중)
+    RANKING_MATRIX_TTL = 300  # 초, 수료생 × 기술 행렬을 다시 만드는 최대 주기
+    RANKING_MATRIX_MIN_REFRESH = 30  # 초, 다른 워커의 변경을 반영하려고 백그라운드에서 다시 만드는 최소 간격
+    RECOMMENDATION_TOP_N = 100  # 기업별로 저장하는 추천 수료생 수
+    RECOMMENDATION_MAX_AGE = 24 * 60 * 60  # 초, 이보다 오래된 추천 목록은 stale 로 표시
+    
+    # 응답 캐시 설정 (local: 프로세스 내 LRU, shm: 같은 서버의 워커 간 공유, redis: 서버 간 공유)
+    # local 은 워커가 하나일 때만 쓸 수 있으므로 기본값은 워커 수에 따라 정함
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', '1'))  # gunicorn_config.py 가 워커 수를 넘겨줌
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND') or ('shm' if WEB_WORKERS > 1 else 'local')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '60'))  # 초
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    RESPONSE_CACHE_SHM_PATH = os.getenv('RESPONSE_CACHE_SHM_PATH', '/dev/shm/lion_connect_cache')
+    RESPONSE_CACHE_REDIS_URL = os.getenv('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    
+    # 알림(SSE) 설정
+    NOTIFICATION_CHANNEL = 'lion_connect_notifications'  # PostgreSQL LISTEN/NOTIFY 채널
+    NOTIFICATION_RETENTION_DAYS = 30
+    SSE_HEARTBEAT_INTERVAL = 15  # 초, 새 알림이 없을 때 keep-alive 주석을 보내는 간격
+    SSE_MAX_DURATION = 300  # 초, 한 연결을 유지하는 최대 시간 (이후 클라이언트가 Last-Event-ID 로 재연결)
+    SSE_RETRY_MS = 3000  # 클라이언트 재연결 대기 시간
+    SSE_BATCH_SIZE = 100
+    # 워커당 동시 SSE 연결 수. 연결마다 스레드를 하나씩 쓰므로 gunicorn threads(16)보다 작게 두어 일반 요청용 스레드를 남김
+    SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', '8'))
+    SSE_BUSY_RETRY_AFTER = 30  # 초, 연결이 가득 찼을 때 Retry-After 로 알려주는 재시도 대기 시간
@@ -17,9 +17,16 @@ def user_identity_lookup(user):
 
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
-    from models import User
+    # 권한 확인에 필요한 (id, user_type) 만 프로세스 캐시에서 읽음. 전체 User 가 필요하면 current_user_record() 사용
+    from services.auth_cache import load_auth_user
     identity = jwt_data["sub"]
-    return User.query.get(identity)
+    return load_auth_user(identity)
+
+@jwt.token_in_blocklist_loader
+def check_if_token_revoked(_jwt_header, jwt_payload):
+    # 폐기 목록 Bloom filter 에 없으면 DB 조회 없이 통과
+    from services.token_blocklist import is_token_revoked
+    return is_token_revoked(jwt_payload)
 
 @jwt.unauthorized_loader
 def unauthorized_callback(callback):
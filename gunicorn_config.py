@@ -1,4 +1,5 @@
 bind = "0.0.0.0:10000"
 workers = 4
-threads = 2
-timeout = 120 
\ No newline at end of file
+threads = 16  # SSE 알림 연결(/notifications/stream)이 연결마다 스레드를 하나씩 사용 (워커당 SSE_MAX_STREAMS 개까지, config.py 참고)
+timeout = 120 
+raw_env = [f"WEB_WORKERS={workers}"]  # 응답 캐시 백엔드 선택에 사용 (config.py 참고)
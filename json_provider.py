@@ -0,0 +1,86 @@
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from flask import current_app, make_response
+from flask.json.provider import DefaultJSONProvider
+
+# orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 동작
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    """표준 json 모듈이 처리하지 못하는 타입을 변환합니다. 날짜는 ISO 8601 문자열로 보냅니다."""
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+def dumps(obj, pretty=False, sort_keys=False):
+    """객체를 JSON 문자열로 직렬화합니다."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_default, option=option).decode('utf-8')
+    if pretty:
+        return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, indent=2)
+    return json.dumps(obj, default=_default, ensure_ascii=False, sort_keys=sort_keys, separators=(',', ':'))
+
+
+def loads(s):
+    """JSON 문자열(또는 bytes)을 객체로 역직렬화합니다."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """orjson 을 우선 사용하는 Flask JSON provider 입니다.
+
+    - date/datetime 은 HTTP 날짜 형식 대신 ISO 8601 문자열로 직렬화합니다.
+    - 디버그 모드가 아니면 들여쓰기 없이 출력합니다.
+    - 키 순서는 dict 에 넣은 순서를 그대로 따릅니다.
+    """
+    sort_keys = False
+
+    def _pretty(self):
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            kwargs.setdefault('default', _default)
+            kwargs.setdefault('ensure_ascii', False)
+            return json.dumps(obj, **kwargs)
+        return dumps(obj, sort_keys=self.sort_keys)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = dumps(obj, pretty=self._pretty(), sort_keys=self.sort_keys)
+        return self._app.response_class(f'{body}\n', mimetype=self.mimetype)
+
+
+def output_json(data, code, headers=None):
+    """flask-restx 의 application/json 표현 함수입니다."""
+    body = dumps(data, pretty=current_app.json._pretty(), sort_keys=current_app.json.sort_keys)
+    response = make_response(f'{body}\n', code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
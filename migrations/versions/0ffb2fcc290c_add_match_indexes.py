@@ -0,0 +1,26 @@
+"""add composite indexes to match
+
+Revision ID: 0ffb2fcc290c
+Revises: 6e04e5f1968f
+Create Date: 2026-10-17 14:48:11.602417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0ffb2fcc290c'
+down_revision = '6e04e5f1968f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_match_receiver_status', 'match', ['receiver_id', 'status'], unique=False)
+    op.create_index('ix_match_requester_created', 'match', ['requester_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_match_requester_created', table_name='match')
+    op.drop_index('ix_match_receiver_status', table_name='match')
@@ -0,0 +1,48 @@
+"""store facet display labels with the counts
+
+Revision ID: 2b6f0d8e4a17
+Revises: 7a1c5e9b3d24
+Create Date: 2026-10-18 14:41:06.327519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b6f0d8e4a17'
+down_revision = '7a1c5e9b3d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('facet_label_count',
+    sa.Column('facet', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('label', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value', 'label')
+    )
+    with op.batch_alter_table('facet_count', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('label', sa.String(length=100), nullable=True))
+
+    # 기존 소속 정보에서 표기별 수를 채우고, 값마다 가장 많이 쓰인 표기를 표시 이름으로 저장
+    op.execute(
+        "INSERT INTO facet_label_count (facet, value, label, count) "
+        "SELECT facet, value, label, COUNT(*) FROM student_facet WHERE label IS NOT NULL "
+        "GROUP BY facet, value, label"
+    )
+    op.execute(
+        "UPDATE facet_count SET label = ("
+        "SELECT l.label FROM facet_label_count l "
+        "WHERE l.facet = facet_count.facet AND l.value = facet_count.value "
+        "ORDER BY l.count DESC, l.label LIMIT 1)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('facet_count', schema=None) as batch_op:
+        batch_op.drop_column('label')
+
+    op.drop_table('facet_label_count')
@@ -0,0 +1,36 @@
+"""add notification_event
+
+Revision ID: 36c735c69c05
+Revises: 0ffb2fcc290c
+Create Date: 2026-10-17 15:31:49.270551
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '36c735c69c05'
+down_revision = '0ffb2fcc290c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('notification_event',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notification_event_user_id_id', 'notification_event', ['user_id', 'id'], unique=False)
+    op.create_index(op.f('ix_notification_event_created_at'), 'notification_event', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_notification_event_created_at'), table_name='notification_event')
+    op.drop_index('ix_notification_event_user_id_id', table_name='notification_event')
+    op.drop_table('notification_event')
@@ -0,0 +1,33 @@
+"""store normalized facet values with a display label
+
+Revision ID: 4c8d2e6b1f93
+Revises: e5a19c3f7d20
+Create Date: 2026-10-17 23:05:12.408311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c8d2e6b1f93'
+down_revision = 'e5a19c3f7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('student_facet', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('label', sa.String(length=100), nullable=True))
+
+    # 기존 값은 표기 그대로 저장되어 있어 ('React', 'react') 정규화된 값과 섞이지 않도록 비움
+    # 업그레이드 후 flask user rebuild-facets 로 다시 만듭니다.
+    op.execute('DELETE FROM facet_count')
+    op.execute('DELETE FROM student_facet')
+
+
+def downgrade():
+    op.execute('DELETE FROM facet_count')
+    op.execute('DELETE FROM student_facet')
+    with op.batch_alter_table('student_facet', schema=None) as batch_op:
+        batch_op.drop_column('label')
@@ -0,0 +1,41 @@
+"""add per-company recommendation tables
+
+Revision ID: 6e04e5f1968f
+Revises: fa3f95f7825c
+Create Date: 2026-10-17 14:02:37.551930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e04e5f1968f'
+down_revision = 'fa3f95f7825c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('company_recommendation',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('student_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('matching_skills', sa.JSON(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['user.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id', 'student_id')
+    )
+    op.create_table('company_recommendation_set',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.Column('rebuilt_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id')
+    )
+
+
+def downgrade():
+    op.drop_table('company_recommendation_set')
+    op.drop_table('company_recommendation')
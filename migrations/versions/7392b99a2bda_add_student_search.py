@@ -0,0 +1,51 @@
+"""add student full-text search index
+
+Revision ID: 7392b99a2bda
+Revises: cb9f32d19b57
+Create Date: 2026-10-17 11:03:18.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7392b99a2bda'
+down_revision = 'cb9f32d19b57'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('student_search',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.Text(), nullable=False),
+    sa.Column('tokens', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE student_search ADD COLUMN search_vector tsvector "
+                   "GENERATED ALWAYS AS (to_tsvector('simple', tokens)) STORED")
+        op.execute("CREATE INDEX ix_student_search_vector ON student_search USING GIN (search_vector)")
+    else:
+        op.execute("CREATE VIRTUAL TABLE student_search_fts USING fts5("
+                   "tokens, content='student_search', content_rowid='user_id')")
+        op.execute("CREATE TRIGGER student_search_ai AFTER INSERT ON student_search BEGIN "
+                   "INSERT INTO student_search_fts(rowid, tokens) VALUES (new.user_id, new.tokens); END")
+        op.execute("CREATE TRIGGER student_search_ad AFTER DELETE ON student_search BEGIN "
+                   "INSERT INTO student_search_fts(student_search_fts, rowid, tokens) VALUES ('delete', old.user_id, old.tokens); END")
+        op.execute("CREATE TRIGGER student_search_au AFTER UPDATE ON student_search BEGIN "
+                   "INSERT INTO student_search_fts(student_search_fts, rowid, tokens) VALUES ('delete', old.user_id, old.tokens); "
+                   "INSERT INTO student_search_fts(rowid, tokens) VALUES (new.user_id, new.tokens); END")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("DROP TRIGGER IF EXISTS student_search_au")
+        op.execute("DROP TRIGGER IF EXISTS student_search_ad")
+        op.execute("DROP TRIGGER IF EXISTS student_search_ai")
+        op.execute("DROP TABLE IF EXISTS student_search_fts")
+    op.drop_table('student_search')
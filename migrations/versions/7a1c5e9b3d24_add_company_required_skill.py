@@ -0,0 +1,45 @@
+"""index company required skills by normalized term
+
+Revision ID: 7a1c5e9b3d24
+Revises: 4c8d2e6b1f93
+Create Date: 2026-10-18 09:12:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a1c5e9b3d24'
+down_revision = '4c8d2e6b1f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    company_required_skill = op.create_table('company_required_skill',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('term', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id', 'term')
+    )
+    with op.batch_alter_table('company_required_skill', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_company_required_skill_term'), ['term'], unique=False)
+
+    # 기존 기업의 요구 기술을 정규화해 채움 (services.ranking.normalize_term 과 같은 규칙)
+    user = sa.table('user', sa.column('id', sa.Integer), sa.column('user_type', sa.String),
+                    sa.column('required_skills', sa.JSON))
+    rows = []
+    for company_id, required in op.get_bind().execute(
+            sa.select(user.c.id, user.c.required_skills).where(user.c.user_type == 'company')):
+        terms = {' '.join(str(skill or '').split()).lower()[:100] for skill in required or []} - {''}
+        rows.extend({'company_id': company_id, 'term': term} for term in terms)
+    if rows:
+        op.bulk_insert(company_required_skill, rows)
+
+
+def downgrade():
+    with op.batch_alter_table('company_required_skill', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_company_required_skill_term'))
+
+    op.drop_table('company_required_skill')
@@ -0,0 +1,36 @@
+"""add uploaded image table
+
+Revision ID: 8d41c27ab6f3
+Revises: f06dd5046a2a
+Create Date: 2026-10-17 19:12:05.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d41c27ab6f3'
+down_revision = 'f06dd5046a2a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('uploaded_image',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('filename', sa.String(length=200), nullable=False),
+    sa.Column('content_type', sa.String(length=50), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('filename')
+    )
+    op.create_index(op.f('ix_uploaded_image_user_id'), 'uploaded_image', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_uploaded_image_user_id'), table_name='uploaded_image')
+    op.drop_table('uploaded_image')
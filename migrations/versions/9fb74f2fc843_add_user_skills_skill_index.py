@@ -0,0 +1,24 @@
+"""add skill -> user index on user_skills
+
+Revision ID: 9fb74f2fc843
+Revises: b667eb0766dd
+Create Date: 2026-10-17 12:41:26.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9fb74f2fc843'
+down_revision = 'b667eb0766dd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_skills_skill_user', 'user_skills', ['skill_id', 'user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_skills_skill_user', table_name='user_skills')
@@ -0,0 +1,39 @@
+"""add student facet membership and counts
+
+Revision ID: b667eb0766dd
+Revises: 7392b99a2bda
+Create Date: 2026-10-17 11:48:02.917334
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b667eb0766dd'
+down_revision = '7392b99a2bda'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('student_facet',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('facet', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'facet', 'value')
+    )
+    op.create_index('ix_student_facet_facet_value', 'student_facet', ['facet', 'value', 'user_id'], unique=False)
+    op.create_table('facet_count',
+    sa.Column('facet', sa.String(length=20), nullable=False),
+    sa.Column('value', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('facet', 'value')
+    )
+
+
+def downgrade():
+    op.drop_table('facet_count')
+    op.drop_index('ix_student_facet_facet_value', table_name='student_facet')
+    op.drop_table('student_facet')
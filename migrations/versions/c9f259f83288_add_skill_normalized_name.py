@@ -0,0 +1,54 @@
+"""add normalized skill name and merge case/whitespace duplicates
+
+Revision ID: c9f259f83288
+Revises: 505f6ad38342
+Create Date: 2026-10-17 18:02:17.530946
+
+"""
+import unicodedata
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f259f83288'
+down_revision = '505f6ad38342'
+branch_labels = None
+depends_on = None
+
+
+def normalize(name):
+    # services.skill_registry.normalize_skill_name 과 같은 규칙 (마이그레이션은 앱 코드를 import 하지 않음)
+    return ' '.join(unicodedata.normalize('NFKC', name).split()).casefold()
+
+
+def upgrade():
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('normalized_name', sa.String(length=50), nullable=True))
+
+    # 정규화하면 같은 이름이 되는 기술은 id 가 가장 작은 것으로 합침
+    bind = op.get_bind()
+    canonical = {}
+    for skill_id, name in bind.execute(sa.text('SELECT id, name FROM skill ORDER BY id')):
+        key = normalize(name)
+        if key not in canonical:
+            canonical[key] = skill_id
+            bind.execute(sa.text('UPDATE skill SET normalized_name = :key WHERE id = :id'), {'key': key, 'id': skill_id})
+            continue
+        params = {'keep': canonical[key], 'dup': skill_id}
+        bind.execute(sa.text(
+            'DELETE FROM user_skills WHERE skill_id = :dup '
+            'AND user_id IN (SELECT user_id FROM user_skills WHERE skill_id = :keep)'
+        ), params)
+        bind.execute(sa.text('UPDATE user_skills SET skill_id = :keep WHERE skill_id = :dup'), params)
+        bind.execute(sa.text('DELETE FROM skill WHERE id = :dup'), params)
+
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.alter_column('normalized_name', existing_type=sa.String(length=50), nullable=False)
+        batch_op.create_unique_constraint('uq_skill_normalized_name', ['normalized_name'])
+
+
+def downgrade():
+    with op.batch_alter_table('skill', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_skill_normalized_name', type_='unique')
+        batch_op.drop_column('normalized_name')
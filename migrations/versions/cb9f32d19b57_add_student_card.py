@@ -0,0 +1,30 @@
+"""add student_card read model
+
+Revision ID: cb9f32d19b57
+Revises: 40cf8e534d18
+Create Date: 2026-10-17 10:12:41.204518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cb9f32d19b57'
+down_revision = '40cf8e534d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('student_card',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('document', sa.JSON(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('student_card')
@@ -0,0 +1,32 @@
+"""store uploads by content hash (uploaded_image.filename -> blob_key)
+
+Revision ID: e5a19c3f7d20
+Revises: 3b7e90d1c5a8
+Create Date: 2026-10-17 21:26:40.731592
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a19c3f7d20'
+down_revision = '3b7e90d1c5a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 같은 내용의 업로드는 같은 키를 공유하므로 unique 를 일반 인덱스로 바꿈
+    # 기존 행의 키('<user_id>_<uuid>.jpg')는 UPLOAD_FOLDER 바로 아래 파일을 가리키므로 그대로 둠 (GC 대상 아님)
+    with op.batch_alter_table('uploaded_image', schema=None) as batch_op:
+        batch_op.drop_constraint('uploaded_image_filename_key', type_='unique')
+        batch_op.alter_column('filename', new_column_name='blob_key', existing_type=sa.String(length=200), existing_nullable=False)
+        batch_op.create_index(batch_op.f('ix_uploaded_image_blob_key'), ['blob_key'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('uploaded_image', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_uploaded_image_blob_key'))
+        batch_op.alter_column('blob_key', new_column_name='filename', existing_type=sa.String(length=200), existing_nullable=False)
+        batch_op.create_unique_constraint('uploaded_image_filename_key', ['filename'])
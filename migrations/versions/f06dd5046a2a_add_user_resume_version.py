@@ -0,0 +1,26 @@
+"""add resume_version to user
+
+Revision ID: f06dd5046a2a
+Revises: c9f259f83288
+Create Date: 2026-10-17 19:11:48.602375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f06dd5046a2a'
+down_revision = 'c9f259f83288'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('resume_version')
@@ -0,0 +1,26 @@
+"""add required_skills to company users
+
+Revision ID: fa3f95f7825c
+Revises: 9fb74f2fc843
+Create Date: 2026-10-17 13:20:54.118240
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'fa3f95f7825c'
+down_revision = '9fb74f2fc843'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('required_skills', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('required_skills')
@@ -1,17 +1,22 @@
 from flask_sqlalchemy import SQLAlchemy
-from extensions import db, bcrypt
+from extensions import db
+from datetime import datetime
+from sqlalchemy.orm import validates
+from services.password_hashing import hash_password, verify_password, needs_rehash
 
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(100), nullable=False)
-    user_type = db.Column(db.String(20), nullable=False)  # 'student' or 'company'
+    user_type = db.Column(db.String(20), nullable=False)  # 'student', 'company' or 'admin' (flask auth create-admin)
     phone = db.Column(db.String(20))
     introduction = db.Column(db.Text)
+    resume_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # 이력서가 바뀔 때마다 1 증가 (If-Match 확인용)
     portfolio = db.Column(db.String(200))
     blog = db.Column(db.String(200))
     github = db.Column(db.String(200))
+    profile_image = db.Column(db.String(200))  # 프로필 이미지 URL (초기 스키마부터 있던 컬럼)
     
     # Student specific fields
     skills = db.relationship('Skill', secondary='user_skills', backref='users')
@@ -23,6 +28,7 @@ class User(db.Model):
     industry = db.Column(db.String(100))  # 산업군
     company_size = db.Column(db.String(50))  # 기업 규모
     company_website = db.Column(db.String(200))  # 기업 웹사이트
+    required_skills = db.Column(db.JSON)  # 요구 기술 목록 (수료생 추천에 사용)
     
     # Relationships
     work_experiences = db.relationship('WorkExperience', backref='user', lazy=True)
@@ -32,10 +38,14 @@ class User(db.Model):
     certificates = db.relationship('Certificate', backref='user', lazy=True)
 
     def set_password(self, password):
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = hash_password(password)
     
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password, password)
+        return verify_password(self.password, password)
+    
+    def password_needs_rehash(self):
+        # 예전 werkzeug 해시나 다른 cost 의 bcrypt 해시는 다음 로그인 때 다시 해싱
+        return needs_rehash(self.password)
 
 class WorkExperience(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -60,15 +70,29 @@ class Project(db.Model):
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
     tech_stack = db.Column(db.JSON)
+    # image_url 이 업로드한 이미지이면 변환 결과를 복사해 둠 (services.image_processing)
+    image_width = db.Column(db.Integer)  # 원본 크기 (회전 반영)
+    image_height = db.Column(db.Integer)
+    image_variants = db.Column(db.JSON)  # {'thumb'|'card'|'full': {'width', 'height', 'webp', 'jpeg'}} (webp, jpeg 는 URL)
 
 class Skill(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), unique=True, nullable=False)
+    # 대소문자/공백만 다른 이름이 따로 생기지 않도록 정규화한 이름 (services.skill_registry.normalize_skill_name)
+    normalized_name = db.Column(db.String(50), unique=True, nullable=False)
+
+    @validates('name')
+    def _set_normalized_name(self, key, name):
+        from services.skill_registry import normalize_skill_name
+        self.normalized_name = normalize_skill_name(name)
+        return name
 
 # User-Skill association table
 user_skills = db.Table('user_skills',
     db.Column('user_id', db.Integer, db.ForeignKey('user.id'), primary_key=True),
-    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+    db.Column('skill_id', db.Integer, db.ForeignKey('skill.id'), primary_key=True),
+    # 기술 -> 사용자 역색인 (기본 키는 user_id 가 앞이라 기술로 찾을 때 쓰지 못함)
+    db.Index('ix_user_skills_skill_user', 'skill_id', 'user_id')
 )
 
 class Education(db.Model):
@@ -94,4 +118,183 @@ class Certificate(db.Model):
     title = db.Column(db.String(200), nullable=False)  # 자격증명
     organization = db.Column(db.String(100), nullable=False)  # 기관
     issue_date = db.Column(db.Date, nullable=False)  # 취득일
-    credential_id = db.Column(db.String(100))  # 자격증번호 
\ No newline at end of file
+    credential_id = db.Column(db.String(100))  # 자격증번호 
+
+class StudentCard(db.Model):
+    """수료생 목록 응답 문서를 미리 만들어 저장하는 읽기 전용 모델입니다."""
+    __tablename__ = 'student_card'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    document = db.Column(db.JSON, nullable=False)  # /user/studentsprofile 목록 항목과 같은 형식
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StudentSearchDocument(db.Model):
+    """수료생 검색용 문서입니다.
+
+    tokens 는 한글 bigram 으로 토큰화한 색인용 텍스트이며, PostgreSQL 에서는 search_vector(tsvector)
+    생성 컬럼과 GIN 인덱스로, SQLite 에서는 FTS5 가상 테이블(student_search_fts)로 색인됩니다.
+    """
+    __tablename__ = 'student_search'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    content = db.Column(db.Text, nullable=False)  # 스니펫 생성을 위한 원문
+    tokens = db.Column(db.Text, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class StudentFacet(db.Model):
+    """수료생별 필터 항목(수료 과정, 기술 스택, 프로젝트 사용 기술) 소속 정보입니다."""
+    __tablename__ = 'student_facet'
+    __table_args__ = (
+        db.Index('ix_student_facet_facet_value', 'facet', 'value', 'user_id'),
+    )
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    facet = db.Column(db.String(20), primary_key=True)  # 'course', 'skill', 'tech'
+    value = db.Column(db.String(100), primary_key=True)  # 정규화된 값 (대소문자, 공백 차이 무시)
+    label = db.Column(db.String(100))  # 이 수료생이 쓴 표기
+
+class FacetCount(db.Model):
+    """필터 항목별 수료생 수 집계입니다. 수료생 프로필이 바뀔 때 증감으로 갱신됩니다."""
+    __tablename__ = 'facet_count'
+
+    facet = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    label = db.Column(db.String(100))  # 가장 많이 쓰인 표기 (facet_label_count 에서 계산)
+
+class FacetLabelCount(db.Model):
+    """필터 값별 표기('React', 'react' 등)마다 그렇게 쓴 수료생 수입니다. FacetCount.label 을 고르는 데 씁니다."""
+    __tablename__ = 'facet_label_count'
+
+    facet = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(100), primary_key=True)
+    label = db.Column(db.String(100), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class CompanyRecommendation(db.Model):
+    """기업별 추천 수료생 상위 N 명과 점수입니다. 수료생 기술이나 기업 요구 기술이 바뀔 때 해당 기업만 다시 계산됩니다."""
+    __tablename__ = 'company_recommendation'
+
+    company_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    rank = db.Column(db.Integer, nullable=False)  # 1 부터 시작
+    score = db.Column(db.Float, nullable=False)
+    matching_skills = db.Column(db.JSON, nullable=False)
+
+class CompanyRequiredSkill(db.Model):
+    """기업 요구 기술의 정규화된 이름입니다. 수료생 기술이 바뀔 때 다시 계산할 기업만 찾는 데 사용합니다."""
+    __tablename__ = 'company_required_skill'
+
+    company_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    term = db.Column(db.String(100), primary_key=True, index=True)  # services.ranking.normalize_term 결과
+
+class CompanyRecommendationSet(db.Model):
+    """기업별 추천 목록의 계산 시각입니다. 추천 조회 시 얼마나 오래된 목록인지 알려주는 데 사용합니다."""
+    __tablename__ = 'company_recommendation_set'
+
+    company_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    computed_at = db.Column(db.DateTime, nullable=False)  # 마지막으로 목록을 다시 계산한 시각
+    rebuilt_at = db.Column(db.DateTime)  # 마지막 전체 재계산(CLI) 시각
+
+class Match(db.Model):
+    """수료생/기업 간 매칭 요청입니다."""
+    __table_args__ = (
+        db.Index('ix_match_receiver_status', 'receiver_id', 'status'),  # 받은 요청 목록
+        db.Index('ix_match_requester_created', 'requester_id', 'created_at'),  # 보낸 요청 목록
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    requester_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    receiver_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, accepted, rejected
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    requester = db.relationship('User', foreign_keys=[requester_id])
+    receiver = db.relationship('User', foreign_keys=[receiver_id])
+
+class Post(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    likes = db.Column(db.Integer, default=0)
+
+    user = db.relationship('User')
+
+class Comment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('post.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    user = db.relationship('User')
+
+class NotificationEvent(db.Model):
+    """사용자에게 보내는 알림 이벤트입니다. SSE 스트림은 id 순서로 읽어 보내며, Last-Event-ID 로 이어받을 수 있습니다."""
+    __tablename__ = 'notification_event'
+    __table_args__ = (
+        db.Index('ix_notification_event_user_id_id', 'user_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    event_type = db.Column(db.String(50), nullable=False)  # match_requested, match_responded, comment_created
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+class RevokedToken(db.Model):
+    """로그아웃 등으로 폐기된 토큰의 jti 입니다. 만료 시각이 지나면 삭제해도 됩니다."""
+    __tablename__ = 'revoked_token'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    token_type = db.Column(db.String(10), nullable=False)  # 'access' 또는 'refresh'
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class UserTokenRevocation(db.Model):
+    """사용자별 토큰 일괄 폐기 시각입니다. 이 시각 이전에 발급된 해당 사용자의 토큰은 모두 거부됩니다."""
+    __tablename__ = 'user_token_revocation'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    revoked_before = db.Column(db.DateTime, nullable=False)
+
+class UploadedImage(db.Model):
+    """POST /user/images 로 올린 이미지입니다. 이력서/프로젝트 요청에서는 imageId 로 참조합니다."""
+    __tablename__ = 'uploaded_image'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+    blob_key = db.Column(db.String(200), nullable=False, index=True)  # 저장소 키 ('ab/cd/<sha256>.ext', 같은 내용이면 여러 행이 공유)
+    content_type = db.Column(db.String(50), nullable=False)  # 파일 내용으로 판별한 MIME 타입
+    size = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending', server_default='pending')  # 변형 생성 상태 (pending, ready, failed)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    variants = db.Column(db.JSON)  # 크기별 WebP/JPEG 변형의 저장소 키 {'thumb'|'card'|'full': {'width', 'height', 'webp', 'jpeg'}}
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def url(self):
+        from services.blob_storage import blob_url
+        return blob_url(self.blob_key)
+
+class RefreshToken(db.Model):
+    """발급한 refresh token 입니다. 갱신할 때마다 같은 family 의 새 토큰으로 교체되며,
+    이미 사용된 토큰이 다시 제출되면 탈취로 보고 family 전체를 폐기합니다."""
+    __tablename__ = 'refresh_token'
+
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(36), nullable=False, unique=True)
+    family = db.Column(db.String(36), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    used_at = db.Column(db.DateTime)  # 새 토큰으로 교체된 시각
+    revoked_at = db.Column(db.DateTime)  # 로그아웃 또는 재사용 감지로 폐기된 시각
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -1,9 +1,23 @@
-from flask import Blueprint, request, jsonify
-from models import User, Skill
+from flask import Blueprint, request, jsonify, current_app
+from models import User
 from extensions import db
-from flask_jwt_extended import create_access_token
-from flask_restx import Resource, Namespace, fields
-import re
+from flask_jwt_extended import jwt_required, get_jwt, current_user
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
+from flask_restx import Resource, Namespace, fields, reqparse
+from werkzeug.datastructures import FileStorage
+from services.profile_sync import sync_student_profiles
+from services.token_blocklist import revoke_token, revoke_all_tokens, prune_revoked_tokens
+from services.password_hashing import PasswordHashingUnavailable, validate_password
+from services.skill_registry import InvalidSkillName, resolve_skills
+from services.cohort_import import COHORT_FORMATS, detect_format, read_cohort_rows, import_cohort
+from services.refresh_tokens import (
+    InvalidRefreshToken, issue_tokens, rotate_refresh_token, revoke_refresh_token, prune_refresh_tokens
+)
+import click
+import csv
+import io
+import itertools
 
 auth_bp = Blueprint('auth', __name__)
 auth_ns = Namespace('auth', description='인증 관련 API')
@@ -35,21 +49,18 @@ company_fields = {
     'company_website': fields.String(required=True, description='기업 웹사이트')
 }
 
+logout_model = auth_ns.model('Logout', {
+    'refresh_token': fields.String(description='함께 폐기할 refresh token')
+})
+
+cohort_import_parser = reqparse.RequestParser()
+cohort_import_parser.add_argument('file', type=FileStorage, location='files', required=True, help='수료생 명단 (CSV 또는 NDJSON)')
+cohort_import_parser.add_argument('format', choices=COHORT_FORMATS, location='form', help='파일 형식 (없으면 파일 이름으로 추측)')
+cohort_import_parser.add_argument('course', location='form', help='course 열이 비어 있는 행에 쓸 수료 과정')
+
 student_signup_model = auth_ns.model('StudentSignup', student_fields)
 company_signup_model = auth_ns.model('CompanySignup', company_fields)
 
-def validate_password(password):
-    """비밀번호 유효성 검사"""
-    if len(password) < 8:
-        return False
-    if not re.search(r"[A-Za-z]", password):
-        return False
-    if not re.search(r"\d", password):
-        return False
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-        return False
-    return True
-
 @auth_ns.route('/signup')
 class Signup(Resource):
     @auth_ns.doc('새로운 사용자 등록',
@@ -66,7 +77,9 @@ class Signup(Resource):
                  201: '회원가입 성공',
                  400: '필수 필드 누락 또는 유효하지 않은 데이터',
                  409: '이메일 중복',
-                 500: '서버 오류'
+                 429: '비밀번호 처리 요청이 많음 (Retry-After 후 재시도)',
+                 500: '서버 오류',
+                 503: '비밀번호 처리 지연 (Retry-After 후 재시도)'
              })
     @auth_ns.expect(auth_ns.model('Signup', {
         'email': fields.String(required=True),
@@ -125,13 +138,8 @@ class Signup(Resource):
             
             # 사용자 유형별 추가 정보 저장
             if data['user_type'] == 'student':
-                # skills 처리
-                for skill_name in data['skills']:
-                    skill = Skill.query.filter_by(name=skill_name).first()
-                    if not skill:
-                        skill = Skill(name=skill_name)
-                        db.session.add(skill)
-                    user.skills.append(skill)
+                # skills 처리 (이름 정규화 후 한 번에 조회/생성)
+                user.skills = resolve_skills(data['skills'])
                 user.course = data['course']
             else:
                 user.company_name = data['company_name']
@@ -141,10 +149,19 @@ class Signup(Resource):
                 user.company_website = data['company_website']
             
             db.session.add(user)
+            if user.user_type == 'student':
+                db.session.flush()
+                sync_student_profiles([user.id])
             db.session.commit()
             
             return {'message': 'User created successfully'}, 201
             
+        except PasswordHashingUnavailable as e:
+            db.session.rollback()
+            return {'error': str(e)}, e.status_code, {'Retry-After': str(e.retry_after)}
+        except InvalidSkillName as e:
+            db.session.rollback()
+            return {'error': str(e)}, 400
         except Exception as e:
             db.session.rollback()
             return {'error': str(e)}, 500
@@ -157,7 +174,9 @@ class Login(Resource):
                  200: '로그인 성공',
                  400: '필수 필드 누락',
                  401: '인증 실패',
-                 500: '서버 오류'
+                 429: '비밀번호 처리 요청이 많음 (Retry-After 후 재시도)',
+                 500: '서버 오류',
+                 503: '비밀번호 처리 지연 (Retry-After 후 재시도)'
              })
     @auth_ns.expect(login_model)
     def post(self):
@@ -182,17 +201,242 @@ class Login(Resource):
                 print("비밀번호 불일치")  # 디버깅용 로그
                 return {'error': 'Invalid email or password'}, 401
             
+            if user.password_needs_rehash():
+                try:
+                    user.set_password(data['password'])
+                except PasswordHashingUnavailable:
+                    pass  # 로그인은 그대로 진행하고 다음 로그인 때 다시 시도
+            
             # user.id를 직접 전달
             print(f"토큰 생성을 위한 user.id: {user.id}")  # 디버깅용 로그
-            access_token = create_access_token(identity=user.id)
+            access_token, refresh_token = issue_tokens(user.id, user.user_type, fresh=True)
+            db.session.commit()
             print(f"토큰 생성 완료: {access_token[:10]}...")  # 디버깅용 로그 (토큰의 앞부분만 출력)
             
             return {
                 'access_token': access_token,
+                'refresh_token': refresh_token,
                 'user_type': user.user_type,
                 'message': 'Login successful'
             }, 200, {'Authorization': f'Bearer {access_token}'}
             
+        except PasswordHashingUnavailable as e:
+            db.session.rollback()
+            return {'error': str(e)}, e.status_code, {'Retry-After': str(e.retry_after)}
         except Exception as e:
+            db.session.rollback()
             print("로그인 처리 중 에러:", str(e))  # 디버깅용 로그
-            return {'error': str(e)}, 500 
\ No newline at end of file
+            return {'error': str(e)}, 500 
+
+@auth_ns.route('/refresh')
+class Refresh(Resource):
+    @auth_ns.doc('토큰 갱신',
+             description='''refresh token 으로 새 access token 과 refresh token 을 발급합니다.
+             
+             ### 사용 방법:
+             - Authorization 헤더에 access token 대신 refresh token 을 넣어 호출합니다.
+             - refresh token 은 한 번만 사용할 수 있으며, 응답으로 받은 새 refresh token 을 저장해야 합니다.
+             - 이미 사용한 refresh token 이 다시 제출되면 해당 로그인 세션의 refresh token 이 모두 폐기되어 다시 로그인해야 합니다.
+             ''',
+             responses={
+                 200: '갱신 성공',
+                 401: '인증 실패 또는 사용할 수 없는 refresh token',
+                 500: '서버 오류'
+             })
+    @jwt_required(refresh=True)
+    def post(self):
+        """토큰을 갱신합니다."""
+        try:
+            access_token, refresh_token = rotate_refresh_token(get_jwt(), current_user.user_type)
+            db.session.commit()
+            
+            return {
+                'access_token': access_token,
+                'refresh_token': refresh_token,
+                'user_type': current_user.user_type,
+                'message': 'Token refreshed'
+            }, 200, {'Authorization': f'Bearer {access_token}'}
+            
+        except InvalidRefreshToken as e:
+            # 재사용 감지로 family 를 폐기한 내역은 남김
+            db.session.commit()
+            return {'error': str(e)}, 401
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@auth_ns.route('/logout')
+class Logout(Resource):
+    @auth_ns.doc('로그아웃',
+             description='''현재 access token 을 폐기합니다. 폐기된 토큰으로는 더 이상 API 를 호출할 수 없습니다.
+             
+             - refresh_token 을 함께 보내면 해당 로그인 세션의 refresh token 도 모두 폐기합니다.
+             ''',
+             responses={
+                 200: '로그아웃 성공',
+                 400: '잘못된 refresh token',
+                 401: '인증 실패',
+                 500: '서버 오류'
+             })
+    @auth_ns.expect(logout_model)
+    @jwt_required()
+    def post(self):
+        """현재 토큰을 폐기합니다."""
+        try:
+            data = request.get_json(silent=True) or {}
+            if data.get('refresh_token'):
+                revoke_refresh_token(data['refresh_token'], current_user.id)
+            revoke_token(get_jwt())
+            db.session.commit()
+            return {'message': 'Logout successful'}, 200
+            
+        except (InvalidRefreshToken, JWTExtendedException, PyJWTError) as e:
+            db.session.rollback()
+            return {'error': 'Invalid refresh token'}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@auth_ns.route('/users/<int:user_id>/revoke-tokens')
+class RevokeUserTokens(Resource):
+    @auth_ns.doc('사용자 토큰 일괄 폐기',
+             description='''해당 사용자에게 지금까지 발급된 모든 토큰을 폐기합니다. (계정 탈취 대응 등)
+             
+             ### 접근 권한:
+             - 관리자(user_type: admin)만 접근 가능
+             - 관리자 계정은 서버에서 flask auth create-admin 명령으로 만듭니다.
+             ''',
+             responses={
+                 200: '폐기 성공',
+                 401: '인증 실패',
+                 403: '관리자가 아님',
+                 404: '사용자 없음',
+                 500: '서버 오류'
+             })
+    @jwt_required()
+    def post(self, user_id):
+        """사용자의 모든 토큰을 폐기합니다."""
+        try:
+            if current_user.user_type != 'admin':
+                return {'error': 'Admin only'}, 403
+            
+            if db.session.get(User, user_id) is None:
+                return {'error': 'User not found'}, 404
+            
+            revoke_all_tokens(user_id)
+            db.session.commit()
+            return {'message': 'All tokens revoked'}, 200
+            
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@auth_ns.route('/users/import')
+class CohortImport(Resource):
+    @auth_ns.doc('수료생 일괄 가입',
+             description='''수료생 명단 파일로 여러 수료생을 한 번에 가입시킵니다.
+             
+             ### 파일 형식:
+             - CSV: email, password, name, course, skills, phone 열 (skills 는 ; 또는 , 로 구분)
+             - NDJSON: 한 줄에 하나씩 같은 필드를 가진 JSON 객체 (skills 는 문자열 목록도 가능)
+             
+             ### 처리 방식:
+             - 잘못된 행이나 이미 가입된 이메일은 건너뛰고 errors 에 줄 번호와 함께 반환합니다.
+             - 요청 시간 제한 안에 끝나도록 한 번에 COHORT_IMPORT_MAX_ROWS(200) 행까지만 가져오며, 넘으면 400 을 반환합니다.
+             - 더 큰 명단은 서버에서 flask auth import-cohort 명령으로 가져옵니다.
+             
+             ### 접근 권한:
+             - 관리자(user_type: admin)만 접근 가능
+             - 관리자 계정은 서버에서 flask auth create-admin 명령으로 만듭니다.
+             ''',
+             responses={
+                 200: '가져오기 완료 (행별 오류 포함)',
+                 400: '잘못된 파일 또는 형식',
+                 401: '인증 실패',
+                 403: '관리자가 아님',
+                 500: '서버 오류'
+             })
+    @auth_ns.expect(cohort_import_parser)
+    @jwt_required()
+    def post(self):
+        """수료생 명단을 가져옵니다."""
+        try:
+            if current_user.user_type != 'admin':
+                return {'error': 'Admin only'}, 403
+            
+            args = cohort_import_parser.parse_args()
+            upload = args['file']
+            fmt = args['format'] or detect_format(upload.filename, upload.mimetype)
+            if fmt is None:
+                return {'error': f'Unknown file format, use one of: {", ".join(COHORT_FORMATS)}'}, 400
+            
+            # 요청 시간 제한(gunicorn timeout) 안에 끝나도록 행 수를 제한하고, 넘는 명단은 끝까지 읽지 않음
+            max_rows = current_app.config['COHORT_IMPORT_MAX_ROWS']
+            try:
+                rows = list(itertools.islice(
+                    read_cohort_rows(io.TextIOWrapper(upload.stream, encoding='utf-8-sig'), fmt), max_rows + 1
+                ))
+            except (UnicodeDecodeError, csv.Error) as e:
+                return {'error': f'Could not read file: {e}'}, 400
+            if len(rows) > max_rows:
+                return {'error': f'At most {max_rows} rows can be imported at once, use flask auth import-cohort for larger files'}, 400
+            
+            return import_cohort(rows, default_course=args['course'],
+                                 processes=current_app.config['COHORT_IMPORT_API_PROCESSES']), 200
+            
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@auth_bp.cli.command('import-cohort')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(COHORT_FORMATS), default=None, help='파일 형식 (기본값: 확장자로 추측)')
+@click.option('--course', default=None, help='course 열이 비어 있는 행에 쓸 수료 과정')
+@click.option('--chunk-size', default=None, type=int, help='한 트랜잭션으로 저장하는 행 수 (기본값: COHORT_IMPORT_CHUNK_SIZE)')
+@click.option('--processes', default=None, type=int, help='비밀번호 해싱 프로세스 수 (기본값: COHORT_IMPORT_PROCESSES)')
+def import_cohort_command(path, fmt, course, chunk_size, processes):
+    """CSV 또는 NDJSON 수료생 명단으로 수료생을 일괄 가입시킵니다."""
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        raise click.UsageError('파일 형식을 알 수 없습니다. --format 을 지정하세요.')
+    
+    def progress(done, total):
+        click.echo(f'{done}/{total}행 처리')
+    
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        result = import_cohort(
+            read_cohort_rows(stream, fmt),
+            default_course=course,
+            chunk_size=chunk_size,
+            processes=processes or current_app.config['COHORT_IMPORT_PROCESSES'],
+            progress=progress
+        )
+    
+    for error in result['errors']:
+        click.echo(f"{error['line']}행 {error['email'] or ''}: {error['error']}", err=True)
+    click.echo(f"{result['total']}행 중 {result['imported']}명 가입, {result['failed']}행 실패 "
+               f"({result['elapsed_seconds']}초, 초당 {result['rows_per_second']}명)")
+
+@auth_bp.cli.command('create-admin')
+@click.argument('email')
+@click.option('--name', default='관리자', show_default=True, help='표시 이름')
+@click.password_option(help='비밀번호 (지정하지 않으면 입력받음)')
+def create_admin_command(email, name, password):
+    """관리자 계정을 만듭니다. (회원가입 API 로는 student/company 만 가입할 수 있음)"""
+    if User.query.filter_by(email=email).first():
+        raise click.UsageError(f'이미 가입된 이메일입니다: {email}')
+    if not validate_password(password):
+        raise click.UsageError('비밀번호는 8자 이상이며 영문, 숫자, 특수문자를 포함해야 합니다.')
+    
+    user = User(email=email, name=name, user_type='admin')
+    user.set_password(password)
+    db.session.add(user)
+    db.session.commit()
+    click.echo(f'관리자 {email} (id {user.id}) 생성 완료')
+
+@auth_bp.cli.command('prune-revoked-tokens')
+def prune_revoked_token_records():
+    """만료되어 더 이상 필요 없는 토큰 폐기 기록과 refresh token 기록을 삭제합니다."""
+    deleted = prune_revoked_tokens() + prune_refresh_tokens()
+    db.session.commit()
+    click.echo(f'{deleted}개 폐기 기록 삭제 완료')
@@ -1,7 +1,13 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_restx import Resource, Namespace, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, current_user
 from models import User, db
+from services.auth_cache import current_user_record
+from services.ranking import SkillMatrix
+from services.recommendations import refresh_company_recommendations, recommended_students, recommendation_freshness, set_required_skills
+from services.response_cache import invalidate, user_version
+from services.serializers import COMPANY_PROFILE
+import click
 
 company_bp = Blueprint('company', __name__)
 company_ns = Namespace('company', description='기업 관련 API')
@@ -12,7 +18,8 @@ company_profile_model = company_ns.model('CompanyProfile', {
     'company_description': fields.String(required=True, description='회사 소개'),
     'industry': fields.String(required=True, description='산업군'),
     'company_size': fields.String(required=True, description='기업 규모'),
-    'company_website': fields.String(required=True, description='기업 웹사이트')
+    'company_website': fields.String(required=True, description='기업 웹사이트'),
+    'required_skills': fields.List(fields.String, required=False, description='요구 기술 목록 (수료생 추천에 사용)')
 })
 
 @company_ns.route('/profile')
@@ -29,19 +36,11 @@ class CompanyProfile(Resource):
     def get(self):
         """기업 프로필 정보를 조회합니다."""
         try:
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
-            
-            if not user or user.user_type != 'company':
+            if current_user.user_type != 'company':
                 return {'error': 'Unauthorized access'}, 401
             
-            return {
-                'company_name': user.company_name,
-                'company_description': user.company_description,
-                'industry': user.industry,
-                'company_size': user.company_size,
-                'company_website': user.company_website
-            }, 200
+            row = db.session.query(*COMPANY_PROFILE.columns).filter(User.id == current_user.id).first()
+            return COMPANY_PROFILE.serialize(row), 200
             
         except Exception as e:
             return {'error': str(e)}, 500
@@ -59,12 +58,11 @@ class CompanyProfile(Resource):
     def put(self):
         """기업 프로필 정보를 수정합니다."""
         try:
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
-            
-            if not user or user.user_type != 'company':
+            if current_user.user_type != 'company':
                 return {'error': 'Unauthorized access'}, 401
             
+            user = current_user_record()
+            
             data = request.get_json()
             
             # 필수 필드 검사
@@ -79,9 +77,63 @@ class CompanyProfile(Resource):
             user.company_size = data['company_size']
             user.company_website = data['company_website']
             
+            # 요구 기술은 선택 항목
+            if 'required_skills' in data:
+                required_skills = data['required_skills'] or []
+                if not isinstance(required_skills, list) or not all(isinstance(skill, str) for skill in required_skills):
+                    return {'error': 'required_skills must be a list of strings'}, 400
+                set_required_skills(user, list(dict.fromkeys(skill.strip() for skill in required_skills if skill.strip())))
+                refresh_company_recommendations([user.id])
+            
+            invalidate(user_version(user.id))
             db.session.commit()
             return {'message': 'Company profile updated successfully'}, 200
             
         except Exception as e:
             db.session.rollback()
-            return {'error': str(e)}, 500 
\ No newline at end of file
+            return {'error': str(e)}, 500 
+
+@company_ns.route('/recommendations')
+class CompanyRecommendations(Resource):
+    @company_ns.doc('추천 수료생 조회',
+                description='''기업 프로필의 요구 기술(required_skills)과 비슷한 수료생을 점수 순으로 조회합니다.
+                
+                - 요청마다 계산하지 않고 미리 저장해 둔 추천 목록을 읽습니다.
+                - 추천 목록은 요구 기술을 수정하거나, 관련 기술을 가진 수료생의 기술/프로젝트가 바뀔 때 해당 기업만 다시 계산됩니다.
+                - computed_at/age_seconds 로 목록이 언제 계산됐는지 알 수 있으며, 오래됐거나 계산된 적이 없으면 stale 이 true 입니다.
+                ''',
+                responses={
+                    200: '조회 성공',
+                    401: '인증 실패',
+                    500: '서버 오류'
+                })
+    @company_ns.param('limit', '최대 수료생 수')
+    @jwt_required()
+    def get(self):
+        """추천 수료생 목록을 조회합니다."""
+        try:
+            if current_user.user_type != 'company':
+                return {'error': 'Unauthorized access'}, 401
+            
+            limit = request.args.get('limit', current_app.config['STUDENT_PAGE_DEFAULT_SIZE'], type=int)
+            limit = max(1, min(limit, current_app.config['RECOMMENDATION_TOP_N']))
+            
+            return dict(
+                recommendation_freshness(current_user.id),
+                items=recommended_students(current_user.id, limit)
+            ), 200
+            
+        except Exception as e:
+            return {'error': str(e)}, 500
+
+@company_bp.cli.command('rebuild-recommendations')
+@click.option('--batch-size', default=100, show_default=True, help='한 트랜잭션에서 처리할 기업 수')
+def rebuild_company_recommendations(batch_size):
+    """수료생 × 기술 행렬을 새로 만들어 모든 기업의 추천 목록을 다시 계산합니다."""
+    matrix = SkillMatrix.load()
+    company_ids = [row.id for row in db.session.query(User.id).filter_by(user_type='company').order_by(User.id)]
+    for start in range(0, len(company_ids), batch_size):
+        chunk = company_ids[start:start + batch_size]
+        refresh_company_recommendations(chunk, matrix=matrix, rebuilt=True)
+        db.session.commit()
+        click.echo(f'{start + len(chunk)}/{len(company_ids)} 기업 추천 목록 갱신 완료')
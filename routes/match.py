@@ -1,115 +1,251 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, current_app
+from flask_restx import Resource, Namespace, fields
+from flask_jwt_extended import jwt_required, current_user
+from services.auth_cache import current_user_record
+from sqlalchemy import update
 from extensions import db
-from models import Match, User, Skill
-from sqlalchemy import and_
+from models import Match, User
+from services.notifications import publish
+from services.serializers import RECEIVED_MATCH, SENT_MATCH, USER_SUMMARY
+from services.skill_match import match_suggestions
 
 match_bp = Blueprint('match', __name__)
+match_ns = Namespace('match', description='매칭 관련 API')
 
-@match_bp.route('/suggestions', methods=['GET'])
-@jwt_required()
-def get_match_suggestions():
-    user_id = get_jwt_identity()
-    user = User.query.get_or_404(user_id)
-    
-    # 사용자의 기술 스택 가져오기
-    user_skills = [skill.name for skill in Skill.query.filter_by(user_id=user_id).all()]
-    
-    # 다른 사용자들의 기술 스택과 매칭
-    suggestions = []
-    other_users = User.query.filter(User.id != user_id).all()
-    
-    for other_user in other_users:
-        other_skills = [skill.name for skill in Skill.query.filter_by(user_id=other_user.id).all()]
-        matching_skills = set(user_skills) & set(other_skills)
-        
-        if matching_skills:
-            suggestions.append({
-                'user': {
-                    'id': other_user.id,
-                    'name': other_user.name,
-                    'introduction': other_user.introduction
-                },
-                'matching_skills': list(matching_skills)
+RESPONSE_STATUS = {'accept': 'accepted', 'reject': 'rejected'}
+
+# API 모델 정의
+match_request_model = match_ns.model('MatchRequest', {
+    'receiver_id': fields.Integer(required=True, description='매칭을 요청할 사용자 ID')
+})
+
+match_response_model = match_ns.model('MatchResponse', {
+    'response': fields.String(required=True, description="'accept' 또는 'reject'")
+})
+
+match_batch_response_model = match_ns.model('MatchBatchResponse', {
+    'match_ids': fields.List(fields.Integer, required=True, description='응답할 매칭 요청 ID 목록'),
+    'response': fields.String(required=True, description="'accept' 또는 'reject'")
+})
+
+def user_summary(user_id):
+    """알림에 넣을 사용자 정보(id, 이름)를 조회합니다."""
+    return USER_SUMMARY.serialize(db.session.query(*USER_SUMMARY.columns).filter(User.id == user_id).one())
+
+@match_ns.route('/suggestions')
+class MatchSuggestions(Resource):
+    @match_ns.doc('매칭 추천 조회',
+              description='''기술 스택이 비슷한 수료생을 유사도 순으로 조회합니다.
+
+              - 기업 회원은 기업 프로필의 요구 기술(required_skills)을 기준으로 추천합니다.
+              - 드문 기술이 겹칠수록 높은 점수를 받습니다.
+              ''',
+              responses={
+                  200: '조회 성공',
+                  401: '인증 실패',
+                  404: '사용자 없음'
+              })
+    @match_ns.param('limit', '최대 추천 수')
+    @jwt_required()
+    def get(self):
+        """매칭 추천 목록을 조회합니다."""
+        user = current_user_record()
+
+        # 유사도 기준 상위 K 명만 반환
+        limit = request.args.get('limit', current_app.config['MATCH_SUGGESTION_DEFAULT_SIZE'], type=int)
+        limit = max(1, min(limit, current_app.config['MATCH_SUGGESTION_MAX_SIZE']))
+
+        return {'suggestions': match_suggestions(user, limit)}, 200
+
+@match_ns.route('/request')
+class MatchRequestCreate(Resource):
+    @match_ns.doc('매칭 요청',
+              description='다른 사용자에게 매칭을 요청합니다.',
+              responses={
+                  201: '요청 성공',
+                  400: '잘못된 요청 또는 이미 요청함',
+                  401: '인증 실패',
+                  404: '받는 사용자 없음',
+                  500: '서버 오류'
+              })
+    @match_ns.expect(match_request_model)
+    @jwt_required()
+    def post(self):
+        """매칭을 요청합니다."""
+        try:
+            user_id = current_user.id
+            data = request.get_json() or {}
+            receiver_id = data.get('receiver_id')
+
+            if not isinstance(receiver_id, int) or receiver_id == user_id:
+                return {'error': '잘못된 매칭 요청입니다.'}, 400
+            if db.session.get(User, receiver_id) is None:
+                return {'error': '사용자를 찾을 수 없습니다.'}, 404
+
+            # 이미 존재하는 매칭 요청 확인
+            existing_match = Match.query.filter_by(
+                requester_id=user_id,
+                receiver_id=receiver_id,
+                status='pending'
+            ).first()
+
+            if existing_match:
+                return {'error': '이미 매칭 요청을 보냈습니다.'}, 400
+
+            new_match = Match(
+                requester_id=user_id,
+                receiver_id=receiver_id
+            )
+
+            db.session.add(new_match)
+            db.session.flush()
+            publish(receiver_id, 'match_requested', {
+                'match_id': new_match.id,
+                'requester': user_summary(user_id)
             })
-    
-    return jsonify({'suggestions': suggestions}), 200
-
-@match_bp.route('/request', methods=['POST'])
-@jwt_required()
-def request_match():
-    user_id = get_jwt_identity()
-    data = request.get_json()
-    receiver_id = data['receiver_id']
-    
-    # 이미 존재하는 매칭 요청 확인
-    existing_match = Match.query.filter(
-        and_(
-            Match.requester_id == user_id,
-            Match.receiver_id == receiver_id,
-            Match.status == 'pending'
-        )
-    ).first()
-    
-    if existing_match:
-        return jsonify({'error': '이미 매칭 요청을 보냈습니다.'}), 400
-    
-    new_match = Match(
-        requester_id=user_id,
-        receiver_id=receiver_id
-    )
-    
-    db.session.add(new_match)
-    db.session.commit()
-    
-    return jsonify({'message': '매칭 요청이 전송되었습니다.'}), 201
-
-@match_bp.route('/requests', methods=['GET'])
-@jwt_required()
-def get_match_requests():
-    user_id = get_jwt_identity()
-    
-    # 받은 매칭 요청
-    received_requests = Match.query.filter_by(receiver_id=user_id, status='pending').all()
-    # 보낸 매칭 요청
-    sent_requests = Match.query.filter_by(requester_id=user_id).all()
-    
-    return jsonify({
-        'received_requests': [{
-            'id': request.id,
-            'requester': {
-                'id': request.requester.id,
-                'name': request.requester.name
-            },
-            'created_at': request.created_at.isoformat()
-        } for request in received_requests],
-        'sent_requests': [{
-            'id': request.id,
-            'receiver': {
-                'id': request.receiver.id,
-                'name': request.receiver.name
-            },
-            'status': request.status,
-            'created_at': request.created_at.isoformat()
-        } for request in sent_requests]
-    }), 200
-
-@match_bp.route('/<int:match_id>/respond', methods=['POST'])
-@jwt_required()
-def respond_to_match(match_id):
-    user_id = get_jwt_identity()
-    data = request.get_json()
-    response = data['response']  # 'accept' or 'reject'
-    
-    match = Match.query.get_or_404(match_id)
-    
-    if match.receiver_id != user_id:
-        return jsonify({'error': '응답 권한이 없습니다.'}), 403
-    
-    if match.status != 'pending':
-        return jsonify({'error': '이미 처리된 요청입니다.'}), 400
-    
-    match.status = 'accepted' if response == 'accept' else 'rejected'
-    db.session.commit()
-    
-    return jsonify({'message': f'매칭 요청이 {response}되었습니다.'}), 200 
\ No newline at end of file
+            db.session.commit()
+
+            return {'message': '매칭 요청이 전송되었습니다.', 'match_id': new_match.id}, 201
+
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@match_ns.route('/requests')
+class MatchRequestList(Resource):
+    @match_ns.doc('매칭 요청 목록 조회',
+              description='받은 매칭 요청(대기 중)과 보낸 매칭 요청을 최신순으로 조회합니다.',
+              responses={
+                  200: '조회 성공',
+                  401: '인증 실패'
+              })
+    @jwt_required()
+    def get(self):
+        """받은/보낸 매칭 요청 목록을 조회합니다."""
+        user_id = current_user.id
+
+        # 요청한/받은 사용자 정보는 같은 쿼리에서 JOIN 으로 함께 읽음
+        received_requests = db.session.query(*RECEIVED_MATCH.columns) \
+            .join(Match.requester) \
+            .filter(Match.receiver_id == user_id, Match.status == 'pending') \
+            .order_by(Match.created_at.desc()) \
+            .all()
+        sent_requests = db.session.query(*SENT_MATCH.columns) \
+            .join(Match.receiver) \
+            .filter(Match.requester_id == user_id) \
+            .order_by(Match.created_at.desc()) \
+            .all()
+
+        return {
+            'received_requests': RECEIVED_MATCH.serialize_many(received_requests),
+            'sent_requests': SENT_MATCH.serialize_many(sent_requests)
+        }, 200
+
+@match_ns.route('/<int:match_id>/respond')
+class MatchRespond(Resource):
+    @match_ns.doc('매칭 요청 응답',
+              description='받은 매칭 요청을 수락하거나 거절합니다.',
+              responses={
+                  200: '응답 성공',
+                  400: '잘못된 요청 또는 이미 처리된 요청',
+                  401: '인증 실패',
+                  403: '응답 권한 없음',
+                  404: '매칭 요청 없음',
+                  500: '서버 오류'
+              })
+    @match_ns.expect(match_response_model)
+    @jwt_required()
+    def post(self, match_id):
+        """매칭 요청에 응답합니다."""
+        try:
+            user_id = current_user.id
+            data = request.get_json() or {}
+            response = data.get('response')  # 'accept' or 'reject'
+
+            if response not in RESPONSE_STATUS:
+                return {'error': "response 는 'accept' 또는 'reject' 여야 합니다."}, 400
+
+            match = Match.query.get_or_404(match_id)
+
+            if match.receiver_id != user_id:
+                return {'error': '응답 권한이 없습니다.'}, 403
+
+            if match.status != 'pending':
+                return {'error': '이미 처리된 요청입니다.'}, 400
+
+            match.status = RESPONSE_STATUS[response]
+            publish(match.requester_id, 'match_responded', {
+                'match_id': match.id,
+                'status': match.status,
+                'receiver': user_summary(match.receiver_id)
+            })
+            db.session.commit()
+
+            return {'message': f'매칭 요청이 {response}되었습니다.'}, 200
+
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
+
+@match_ns.route('/respond')
+class MatchBatchRespond(Resource):
+    @match_ns.doc('매칭 요청 일괄 응답',
+              description='''받은 대기 중인 매칭 요청 여러 개를 한 번에 수락하거나 거절합니다.
+
+              - 한 번의 UPDATE 로 처리하며, 본인이 받은 대기 중인 요청만 변경됩니다.
+              - 변경된 요청 ID 는 updated, 권한이 없거나 이미 처리됐거나 없는 요청 ID 는 skipped 로 반환합니다.
+              ''',
+              responses={
+                  200: '응답 성공',
+                  400: '잘못된 요청',
+                  401: '인증 실패',
+                  500: '서버 오류'
+              })
+    @match_ns.expect(match_batch_response_model)
+    @jwt_required()
+    def post(self):
+        """여러 매칭 요청에 한 번에 응답합니다."""
+        try:
+            user_id = current_user.id
+            data = request.get_json() or {}
+            response = data.get('response')
+            match_ids = data.get('match_ids')
+
+            if response not in RESPONSE_STATUS:
+                return {'error': "response 는 'accept' 또는 'reject' 여야 합니다."}, 400
+            if not isinstance(match_ids, list) or not match_ids or \
+                    not all(isinstance(match_id, int) for match_id in match_ids):
+                return {'error': 'match_ids 는 매칭 요청 ID 목록이어야 합니다.'}, 400
+            match_ids = list(dict.fromkeys(match_ids))
+            if len(match_ids) > current_app.config['MATCH_BATCH_RESPOND_MAX_SIZE']:
+                return {'error': f"한 번에 최대 {current_app.config['MATCH_BATCH_RESPOND_MAX_SIZE']}개까지 응답할 수 있습니다."}, 400
+
+            # 권한/상태 확인을 WHERE 조건으로 넣어 조회 없이 한 번에 변경
+            status = RESPONSE_STATUS[response]
+            updated = db.session.execute(
+                update(Match)
+                .where(Match.id.in_(match_ids), Match.receiver_id == user_id, Match.status == 'pending')
+                .values(status=status, updated_at=db.func.now())
+                .returning(Match.id, Match.requester_id)
+                .execution_options(synchronize_session=False)
+            ).all()
+
+            if updated:
+                receiver = user_summary(user_id)
+                for match_id, requester_id in updated:
+                    publish(requester_id, 'match_responded', {
+                        'match_id': match_id,
+                        'status': status,
+                        'receiver': receiver
+                    })
+            db.session.commit()
+
+            updated_ids = {match_id for match_id, _ in updated}
+            return {
+                'updated': [match_id for match_id in match_ids if match_id in updated_ids],
+                'skipped': [match_id for match_id in match_ids if match_id not in updated_ids]
+            }, 200
+
+        except Exception as e:
+            db.session.rollback()
+            return {'error': str(e)}, 500
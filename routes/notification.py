@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, request, current_app
+from flask_restx import Resource, Namespace
+from flask_jwt_extended import jwt_required, current_user
+from extensions import db
+from services.notifications import event_stream, prune_events, StreamLimitReached
+import click
+
+notification_bp = Blueprint('notifications', __name__)
+notification_ns = Namespace('notifications', description='알림 관련 API')
+
+@notification_ns.route('/stream')
+class NotificationStream(Resource):
+    @notification_ns.doc('알림 스트림',
+                     description='''로그인한 사용자의 알림을 Server-Sent Events(text/event-stream)로 받습니다.
+
+                     ### 이벤트 종류:
+                     - match_requested: 매칭 요청을 받음
+                     - match_responded: 보낸 매칭 요청이 수락/거절됨
+                     - comment_created: 내 게시글에 댓글이 달림
+
+                     ### 사용 방법:
+                     - EventSource 는 헤더를 지정할 수 없으므로 ?jwt=<access token> 으로 토큰을 전달할 수 있습니다.
+                     - 각 이벤트에는 id 가 있으며, 연결이 끊기면 브라우저가 Last-Event-ID 헤더로 이어받습니다.
+                     - 직접 이어받을 때는 last_event_id 파라미터를 사용할 수 있습니다.
+                     - 연결은 일정 시간 후 서버가 닫으며, 클라이언트는 retry 간격 후 다시 연결합니다.
+                     - 서버의 동시 연결 수가 가득 차면 503 과 Retry-After 헤더로 응답합니다. 그 시간(초) 뒤 다시 연결하세요.
+                     ''',
+                     responses={
+                         200: '스트림 시작 (text/event-stream)',
+                         400: '잘못된 Last-Event-ID',
+                         401: '인증 실패',
+                         503: '동시 연결 수 초과 (Retry-After 후 재시도)'
+                     })
+    @notification_ns.param('jwt', 'Access token (Authorization 헤더 대신 사용 가능)')
+    @notification_ns.param('last_event_id', '마지막으로 받은 이벤트 id (Last-Event-ID 헤더와 같음)')
+    @jwt_required(locations=['headers', 'query_string'])
+    def get(self):
+        """알림 스트림을 엽니다."""
+        user_id = current_user.id
+
+        raw_last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        last_event_id = None
+        if raw_last_event_id:
+            try:
+                last_event_id = int(raw_last_event_id)
+            except ValueError:
+                return {'error': 'Invalid Last-Event-ID'}, 400
+
+        try:
+            return event_stream(user_id, last_event_id)
+        except StreamLimitReached as e:
+            return {'error': str(e)}, e.status_code, {'Retry-After': str(e.retry_after)}
+
+@notification_bp.cli.command('prune')
+@click.option('--days', default=None, type=int, help='보관 기간 (기본값: NOTIFICATION_RETENTION_DAYS)')
+def prune_notifications(days):
+    """보관 기간이 지난 알림을 삭제합니다."""
+    days = days if days is not None else current_app.config['NOTIFICATION_RETENTION_DAYS']
+    deleted = prune_events(datetime.utcnow() - timedelta(days=days))
+    db.session.commit()
+    click.echo(f'{deleted}개 알림 삭제 완료')
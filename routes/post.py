@@ -2,6 +2,8 @@ from flask import Blueprint, request, jsonify
 from extensions import db
 from models import Post, Comment, User
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.notifications import publish
+from services.serializers import POST, COMMENT, USER_SUMMARY
 
 post_bp = Blueprint('post', __name__)
 
@@ -10,20 +12,11 @@ def get_posts():
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
     
-    posts = Post.query.order_by(Post.created_at.desc()).paginate(page=page, per_page=per_page)
+    posts = db.session.query(*POST.columns).join(Post.user) \
+        .order_by(Post.created_at.desc()).paginate(page=page, per_page=per_page)
     
     return jsonify({
-        'posts': [{
-            'id': post.id,
-            'title': post.title,
-            'content': post.content,
-            'user': {
-                'id': post.user.id,
-                'name': post.user.name
-            },
-            'created_at': post.created_at.isoformat(),
-            'likes': post.likes
-        } for post in posts.items],
+        'posts': POST.serialize_many(posts.items),
         'total': posts.total,
         'pages': posts.pages,
         'current_page': posts.page
@@ -32,7 +25,7 @@ def get_posts():
 @post_bp.route('', methods=['POST'])
 @jwt_required()
 def create_post():
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     data = request.get_json()
     
     new_post = Post(
@@ -48,36 +41,18 @@ def create_post():
 
 @post_bp.route('/<int:post_id>', methods=['GET'])
 def get_post(post_id):
-    post = Post.query.get_or_404(post_id)
-    comments = Comment.query.filter_by(post_id=post_id).all()
+    post = db.session.query(*POST.columns).join(Post.user).filter(Post.id == post_id).first_or_404()
+    comments = db.session.query(*COMMENT.columns).join(Comment.user).filter(Comment.post_id == post_id).all()
     
     return jsonify({
-        'post': {
-            'id': post.id,
-            'title': post.title,
-            'content': post.content,
-            'user': {
-                'id': post.user.id,
-                'name': post.user.name
-            },
-            'created_at': post.created_at.isoformat(),
-            'likes': post.likes
-        },
-        'comments': [{
-            'id': comment.id,
-            'content': comment.content,
-            'user': {
-                'id': comment.user.id,
-                'name': comment.user.name
-            },
-            'created_at': comment.created_at.isoformat()
-        } for comment in comments]
+        'post': POST.serialize(post),
+        'comments': COMMENT.serialize_many(comments)
     }), 200
 
 @post_bp.route('/<int:post_id>', methods=['PUT'])
 @jwt_required()
 def update_post(post_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     post = Post.query.get_or_404(post_id)
     
     if post.user_id != user_id:
@@ -93,7 +68,7 @@ def update_post(post_id):
 @post_bp.route('/<int:post_id>', methods=['DELETE'])
 @jwt_required()
 def delete_post(post_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     post = Post.query.get_or_404(post_id)
     
     if post.user_id != user_id:
@@ -106,8 +81,9 @@ def delete_post(post_id):
 @post_bp.route('/<int:post_id>/comments', methods=['POST'])
 @jwt_required()
 def create_comment(post_id):
-    user_id = get_jwt_identity()
+    user_id = int(get_jwt_identity())
     data = request.get_json()
+    post = Post.query.get_or_404(post_id)
     
     new_comment = Comment(
         post_id=post_id,
@@ -116,6 +92,16 @@ def create_comment(post_id):
     )
     
     db.session.add(new_comment)
+    db.session.flush()
+    
+    # 게시글 작성자에게 댓글 알림 (본인 댓글 제외)
+    if post.user_id != user_id:
+        commenter = db.session.query(*USER_SUMMARY.columns).filter(User.id == user_id).one()
+        publish(post.user_id, 'comment_created', {
+            'post_id': post_id,
+            'comment_id': new_comment.id,
+            'user': USER_SUMMARY.serialize(commenter)
+        })
     db.session.commit()
     
     return jsonify({'message': '댓글이 작성되었습니다.', 'comment_id': new_comment.id}), 201
@@ -1,16 +1,34 @@
-from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context, send_from_directory, abort
+from flask_jwt_extended import jwt_required, current_user
 from extensions import db
-from models import User, WorkExperience, Project, Education, Skill, Award, Certificate
-from flask_restx import Resource, Namespace, fields
+from models import User, WorkExperience, Project, Education, Award, Certificate, UploadedImage
+from services.auth_cache import current_user_record
+from services.profile_loader import load_profile_bundle
+from services.pagination import InvalidCursor, parse_page_args, seek_page
+from services.student_card import load_card_documents, student_card_query, rebuild_student_cards
+from services.profile_sync import sync_student_profiles
+from services.skill_registry import InvalidSkillName, resolve_skills
+from services.resume_writer import (PROFILE_FIELDS, ResumeValidationError, RESUME_PATCH_SECTIONS, bump_resume_version,
+                                    patch_profile, patch_resume_section, resolve_image_ids, write_resume)
+from services.response_cache import cached_response, user_version, DIRECTORY_VERSION
+from services.serializers import PROFILE_USER
+from services.image_uploads import ImageUploadError, save_uploaded_image
+from services.image_processing import image_process_pool, link_project_images, record_image_variants, submit_render, variant_urls
+from services.blob_storage import BLOB_CACHE_CONTROL, BLOB_KEY_PATTERN
+from services.upload_gc import UnlistedImageColumns, collect_garbage
+from json_provider import dumps as json_dumps
+from services.search import search_students, index_students, ensure_search_schema
+from services.facets import facet_counts, parse_facet_filters, apply_facet_filters, refresh_student_facets, rebuild_facet_counts
+from services.recommendations import recommended_students
+from flask_restx import Resource, Namespace, fields, reqparse
+from werkzeug.datastructures import FileStorage
 import logging
 import traceback
 import json
 from werkzeug.utils import secure_filename
 import os
-import uuid
-from datetime import datetime
-import base64
+from datetime import datetime, timedelta
+import click
 
 # 로깅 설정
 logging.basicConfig(level=logging.DEBUG)
@@ -21,6 +39,7 @@ user_ns = Namespace('user', description='사용자 관련 API')
 
 # API 모델 정의
 work_experience_model = user_ns.model('WorkExperience', {
+    'id': fields.Integer(description='수정할 기존 경력 ID (없으면 내용으로 짝지음)'),
     'company': fields.String(required=True, description='회사명'),
     'department': fields.String(required=True, description='부서'),
     'position': fields.String(required=True, description='직책'),
@@ -31,11 +50,14 @@ work_experience_model = user_ns.model('WorkExperience', {
 })
 
 project_model = user_ns.model('Project', {
+    'id': fields.Integer(description='수정할 기존 프로젝트 ID (없으면 내용으로 짝지음)'),
     'title': fields.String(required=True, description='프로젝트명'),
     'description': fields.String(required=True, description='프로젝트 설명'),
     'organization': fields.String(description='이행기관'),
     'portfolio_url': fields.String(description='포트폴리오 링크'),
-    'image': fields.String(description='프로젝트 이미지 (Base64)'),
+    'imageId': fields.Integer(description='프로젝트 이미지 ID (POST /user/images 로 업로드)'),
+    'image_url': fields.String(description='프로젝트 이미지 URL'),
+    'image': fields.String(description='image_url 의 예전 이름 (POST /user/project 전용, URL 만 허용. 파일은 POST /user/images 로 업로드)'),
     'is_representative': fields.Boolean(description='대표 프로젝트 여부'),
     'startDate': fields.String(required=True, description='시작일 (YYYY-MM-DD)'),
     'endDate': fields.String(required=True, description='종료일 (YYYY-MM-DD)'),
@@ -43,6 +65,7 @@ project_model = user_ns.model('Project', {
 })
 
 education_model = user_ns.model('Education', {
+    'id': fields.Integer(description='수정할 기존 학력 ID (없으면 내용으로 짝지음)'),
     'school': fields.String(required=True, description='학교명'),
     'major': fields.String(required=True, description='전공'),
     'degree': fields.String(required=True, description='학위'),
@@ -51,6 +74,7 @@ education_model = user_ns.model('Education', {
 })
 
 award_model = user_ns.model('Award', {
+    'id': fields.Integer(description='수정할 기존 수상 ID (없으면 내용으로 짝지음)'),
     'title': fields.String(required=True, description='수상 및 활동명'),
     'startDate': fields.String(required=True, description='시작일 (YYYY-MM-DD)'),
     'endDate': fields.String(required=True, description='종료일 (YYYY-MM-DD)'),
@@ -58,6 +82,7 @@ award_model = user_ns.model('Award', {
 })
 
 certificate_model = user_ns.model('Certificate', {
+    'id': fields.Integer(description='수정할 기존 자격증 ID (없으면 내용으로 짝지음)'),
     'title': fields.String(required=True, description='자격증명'),
     'organization': fields.String(required=True, description='기관'),
     'issueDate': fields.String(required=True, description='취득일 (YYYY-MM-DD)'),
@@ -66,7 +91,7 @@ certificate_model = user_ns.model('Certificate', {
 
 profile_model = user_ns.model('Profile', {
     'name': fields.String(description='이름'),
-    'email': fields.String(description='이메일'),
+    'email': fields.String(description='이메일 (수정 불가, 보내도 무시)'),
     'phone': fields.String(description='전화번호'),
     'introduction': fields.String(description='자기소개'),
     'portfolio': fields.String(description='포트폴리오 URL'),
@@ -94,6 +119,41 @@ resume_model = user_ns.model('Resume', {
     'certificates': fields.List(fields.Nested(certificate_model), description='자격증')
 })
 
+image_upload_parser = reqparse.RequestParser()
+image_upload_parser.add_argument('file', type=FileStorage, location='files', required=True, help='이미지 파일 (JPEG, PNG, GIF, WebP)')
+
+def uploaded_image_response(image):
+    return {
+        'id': image.id,
+        'url': image.url,
+        'content_type': image.content_type,
+        'size': image.size,
+        'status': image.status,
+        'width': image.width,
+        'height': image.height,
+        'variants': variant_urls(image.variants)
+    }
+
+resume_patch_model = user_ns.model('ResumePatch', {
+    'upsert': fields.List(fields.Raw, description='추가하거나 수정할 항목 (id 가 있으면 보낸 필드만 수정, 없으면 추가)'),
+    'delete': fields.List(fields.Integer, description='삭제할 항목 ID'),
+    'add': fields.List(fields.String, description='추가할 기술 (skills 섹션)'),
+    'remove': fields.List(fields.String, description='뺄 기술 (skills 섹션)')
+})
+
+def resume_if_match():
+    """If-Match 헤더의 이력서 버전 목록을 반환합니다. '*' 이면 None (버전 확인 안 함) 입니다."""
+    if request.if_match.star_tag:
+        return None
+    return [int(tag) for tag in request.if_match.as_set() if tag.isdigit()]
+
+def resume_etag(version):
+    return {'ETag': f'"{version}"'}
+
+def resume_conflict(user_id):
+    version = db.session.query(User.resume_version).filter(User.id == user_id).scalar()
+    return {'error': 'Resume has been modified', 'resume_version': version}, 412, resume_etag(version)
+
 student_profile_response = user_ns.model('StudentProfileResponse', {
     'user': fields.Nested(user_ns.model('StudentInfo', {
         'id': fields.Integer(description='사용자 ID'),
@@ -127,7 +187,10 @@ student_profile_response = user_ns.model('StudentProfileResponse', {
         'is_representative': fields.Boolean(description='대표 프로젝트 여부'),
         'start_date': fields.String(description='시작일'),
         'end_date': fields.String(description='종료일'),
-        'tech_stack': fields.List(fields.String, description='사용 기술')
+        'tech_stack': fields.List(fields.String, description='사용 기술'),
+        'image_width': fields.Integer(description='이미지 원본 너비'),
+        'image_height': fields.Integer(description='이미지 원본 높이'),
+        'image_variants': fields.Raw(description='크기별 이미지 변형 {thumb|card|full: {width, height, webp, jpeg}} (목록에는 thumb, card 만 포함)')
     }))),
     'education': fields.List(fields.Nested(user_ns.model('EducationInfo', {
         'id': fields.Integer(description='학력 ID'),
@@ -153,32 +216,45 @@ student_profile_response = user_ns.model('StudentProfileResponse', {
     })))
 })
 
+student_profile_page_response = user_ns.model('StudentProfilePage', {
+    'items': fields.List(fields.Nested(student_profile_response), description='수료생 목록'),
+    'next_cursor': fields.String(description='다음 페이지 커서 (마지막 페이지면 null)')
+})
+
+student_search_response = user_ns.model('StudentSearchResponse', {
+    'results': fields.List(fields.Nested(user_ns.model('StudentSearchResult', {
+        'student': fields.Nested(student_profile_response, description='수료생 정보'),
+        'score': fields.Float(description='관련도 점수 (높을수록 관련도 높음)'),
+        'snippet': fields.String(description='검색어가 <mark> 로 강조된 본문 일부')
+    })))
+})
+
+facet_value_model = user_ns.model('FacetValue', {
+    'value': fields.String(description='필터 값 (정규화된 값, 대소문자 구분 없음)'),
+    'label': fields.String(description='표시 이름 (수료생들이 가장 많이 쓴 표기)'),
+    'count': fields.Integer(description='해당 수료생 수')
+})
+
+student_facets_response = user_ns.model('StudentFacetsResponse', {
+    'course': fields.List(fields.Nested(facet_value_model), description='수료 과정별 수료생 수'),
+    'skill': fields.List(fields.Nested(facet_value_model), description='기술 스택별 수료생 수'),
+    'tech': fields.List(fields.Nested(facet_value_model), description='프로젝트 사용 기술별 수료생 수')
+})
+
 def allowed_file(filename):
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
-def save_base64_image(base64_string, user_id):
-    try:
-        # Base64 문자열에서 데이터 부분만 추출
-        if ',' in base64_string:
-            header, base64_string = base64_string.split(',', 1)
-        
-        # 이미지 데이터를 디코드
-        image_data = base64.b64decode(base64_string)
-        
-        # 파일 이름 생성
-        filename = f"{user_id}_{uuid.uuid4()}.jpg"
-        
-        # 파일 저장
-        file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
-        
-        # 파일의 URL 반환
-        return f"/uploads/{filename}"
-    except Exception as e:
-        logger.error(f"Error saving base64 image: {str(e)}")
-        return None
+@user_bp.route('/uploads/<path:filename>')
+def uploaded_file(filename):
+    """로컬 저장소의 업로드 파일을 보냅니다. (운영에서는 웹 서버가 UPLOAD_FOLDER 를 직접 서비스해도 됨)"""
+    if filename.startswith('.'):
+        abort(404)
+    response = send_from_directory(current_app.config['UPLOAD_FOLDER'], filename)
+    # 저장소 키는 내용의 해시이므로 내용이 바뀌지 않음
+    if BLOB_KEY_PATTERN.match(filename):
+        response.headers['Cache-Control'] = BLOB_CACHE_CONTROL
+    return response
 
 @user_ns.route('/profile')
 class Profile(Resource):
@@ -191,94 +267,33 @@ class Profile(Resource):
                  500: '서버 오류'
              })
     @jwt_required()
+    @cached_response(user_version)
     def get(self):
         """사용자의 프로필 정보를 조회합니다."""
         try:
             # 토큰에서 사용자 ID 가져오기
-            current_user_id = get_jwt_identity()
-            print(f"토큰에서 가져온 user_id: {current_user_id}, 타입: {type(current_user_id)}")  # 디버깅용 로그
+            current_user_id = current_user.id
             
             # 데이터베이스에서 사용자 조회
-            user = User.query.get(current_user_id)
-            print(f"조회된 사용자: {user}, 타입: {type(user)}")  # 디버깅용 로그
+            user = db.session.query(*PROFILE_USER.columns).filter(User.id == current_user_id).first()
             
             if not user:
                 print("사용자를 찾을 수 없음")  # 디버깅용 로그
                 return {'message': 'User not found'}, 404
                 
             try:
-                # 관련 데이터 조회
-                work_experiences = WorkExperience.query.filter_by(user_id=current_user_id).all()
-                projects = Project.query.filter_by(user_id=current_user_id).all()
-                education = Education.query.filter_by(user_id=current_user_id).all()
-                awards = Award.query.filter_by(user_id=current_user_id).all()
-                certificates = Certificate.query.filter_by(user_id=current_user_id).all()
-                skills = user.skills  # User 모델의 relationship을 통해 skills 조회
-                
-                print(f"조회된 데이터 수: work_experiences={len(work_experiences)}, projects={len(projects)}, education={len(education)}, awards={len(awards)}, certificates={len(certificates)}, skills={len(skills)}")  # 디버깅용 로그
+                # 관련 데이터 조회 (테이블당 한 번의 쿼리)
+                bundle = load_profile_bundle(user.id)
                 
                 # 응답 데이터 구성
                 response_data = {
-                    'user': {
-                        'id': user.id,
-                        'email': user.email,
-                        'name': user.name,
-                        'introduction': user.introduction,
-                        'phone': user.phone,
-                        'portfolio': user.portfolio,
-                        'blog': user.blog,
-                        'github': user.github,
-                        'user_type': user.user_type  # user_type 추가
-                    },
-                    'work_experiences': [{
-                        'id': exp.id,
-                        'company': exp.company,
-                        'department': exp.department,
-                        'position': exp.position,
-                        'is_current': exp.is_current,
-                        'start_date': exp.start_date.isoformat() if exp.start_date else None,
-                        'end_date': exp.end_date.isoformat() if exp.end_date else None,
-                        'description': exp.description
-                    } for exp in work_experiences],
-                    'projects': [{
-                        'id': proj.id,
-                        'title': proj.title,
-                        'description': proj.description,
-                        'organization': proj.organization,
-                        'portfolio_url': proj.portfolio_url,
-                        'image_url': proj.image_url,
-                        'is_representative': proj.is_representative,
-                        'start_date': proj.start_date.isoformat() if proj.start_date else None,
-                        'end_date': proj.end_date.isoformat() if proj.end_date else None,
-                        'tech_stack': proj.tech_stack
-                    } for proj in projects],
-                    'education': [{
-                        'id': edu.id,
-                        'school': edu.school,
-                        'major': edu.major,
-                        'degree': edu.degree,
-                        'start_date': edu.start_date.isoformat() if edu.start_date else None,
-                        'end_date': edu.end_date.isoformat() if edu.end_date else None
-                    } for edu in education],
-                    'awards': [{
-                        'id': award.id,
-                        'title': award.title,
-                        'start_date': award.start_date.isoformat() if award.start_date else None,
-                        'end_date': award.end_date.isoformat() if award.end_date else None,
-                        'description': award.description
-                    } for award in awards],
-                    'certificates': [{
-                        'id': cert.id,
-                        'title': cert.title,
-                        'organization': cert.organization,
-                        'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
-                        'credential_id': cert.credential_id
-                    } for cert in certificates],
-                    'skills': [{
-                        'id': skill.id,
-                        'name': skill.name,
-                        'level': skill.level
-                    } for skill in skills]
+                    'user': PROFILE_USER.serialize(user),
+                    'work_experiences': bundle['work_experiences'],
+                    'projects': bundle['projects'],
+                    'education': bundle['education'],
+                    'awards': bundle['awards'],
+                    'certificates': bundle['certificates'],
+                    'skills': bundle['skills']
                 }
                 
                 return response_data, 200
@@ -304,20 +319,84 @@ class Profile(Resource):
     def put(self):
         """사용자의 프로필 정보를 수정합니다."""
         try:
-            user_id = get_jwt_identity()
-            user = User.query.get_or_404(user_id)
+            user = current_user_record()
             data = request.get_json()
+            if not isinstance(data, dict):
+                return {'error': 'Invalid profile data'}, 400
             
-            for key, value in data.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
-            
-            db.session.commit()
+            # 수정할 수 있는 기본 정보만 반영 (user_type, password, email 등은 무시)
+            changed = patch_profile(user, {field: data[field] for field in PROFILE_FIELDS if field in data})
+            if changed:
+                bump_resume_version(user.id)
+                sync_student_profiles([user.id])
+                db.session.commit()
             return {'message': '프로필이 업데이트되었습니다.'}, 200
         except Exception as e:
             logger.error(f"Error in update_profile: {str(e)}")
             return {'error': str(e)}, 500
 
+@user_ns.route('/images')
+class ImageUpload(Resource):
+    @jwt_required()
+    @user_ns.doc('이미지 업로드',
+             description='''
+             이미지를 multipart/form-data 의 file 필드로 올립니다.
+             
+             - 파일 내용으로 형식을 확인하며 JPEG, PNG, GIF, WebP 만 받습니다.
+             - 반환한 id 를 프로젝트/이력서 요청의 imageId 로 보내면 그 이미지가 연결됩니다.
+             
+             - 크기별 WebP/JPEG 변형은 업로드 후 백그라운드에서 만듭니다. (GET /user/images/{id} 의 status 로 확인)
+             
+             응답: id, url, content_type, size, status, width, height, variants
+             ''',
+             responses={
+                 201: '업로드 성공',
+                 400: '허용하지 않는 파일',
+                 401: '인증 실패',
+                 413: '파일이 너무 큼',
+                 500: '서버 오류'
+             })
+    @user_ns.expect(image_upload_parser)
+    def post(self):
+        """이미지를 업로드하고 이미지 ID 를 반환합니다."""
+        args = image_upload_parser.parse_args()
+        try:
+            # 파일은 UploadRequest 가 이미 임시 파일로 받아 두었으므로 형식 확인 후 이름만 바꿔 저장
+            image = save_uploaded_image(current_user.id, args['file'])
+            db.session.commit()
+        except ImageUploadError as e:
+            db.session.rollback()
+            return {'error': str(e)}, 400
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in upload_image: {str(e)}")
+            return {'error': str(e)}, 500
+        
+        return uploaded_image_response(image), 201
+
+@user_ns.route('/images/<int:image_id>')
+@user_ns.param('image_id', '이미지 ID')
+class UploadedImageResource(Resource):
+    @jwt_required()
+    @user_ns.doc('업로드 이미지 조회',
+             description='''
+             업로드한 이미지의 변형 생성 상태를 조회합니다.
+             
+             - status 가 ready 가 되면 variants 에 thumb/card/full 크기별 webp, jpeg URL 과 크기가 채워집니다.
+             - failed 이면 원본(url)만 사용할 수 있습니다.
+             ''',
+             responses={
+                 200: '조회 성공',
+                 401: '인증 실패',
+                 404: '이미지를 찾을 수 없음'
+             })
+    def get(self, image_id):
+        """업로드한 이미지의 변형 생성 상태를 조회합니다."""
+        image = db.session.get(UploadedImage, image_id)
+        if image is None or image.user_id != current_user.id:
+            return {'error': 'Image not found'}, 404
+        return uploaded_image_response(image), 200
+
 @user_ns.route('/work-experience')
 class WorkExperienceResource(Resource):
     @jwt_required()
@@ -331,7 +410,7 @@ class WorkExperienceResource(Resource):
     @user_ns.expect(work_experience_model)
     def post(self):
         """새로운 경력 사항을 추가합니다."""
-        user_id = get_jwt_identity()
+        user_id = current_user.id
         data = request.get_json()
         
         new_experience = WorkExperience(
@@ -346,6 +425,8 @@ class WorkExperienceResource(Resource):
         )
         
         db.session.add(new_experience)
+        bump_resume_version(user_id)
+        sync_student_profiles([user_id])
         db.session.commit()
         
         return {'message': '경력이 추가되었습니다.'}, 201
@@ -363,16 +444,28 @@ class ProjectResource(Resource):
     @user_ns.expect(project_model)
     def post(self):
         """새로운 프로젝트를 추가합니다."""
-        user_id = get_jwt_identity()
+        user_id = current_user.id
         data = request.get_json()
         
+        # 예전 클라이언트가 보내는 image 는 image_url 로 취급 (Base64 이미지는 더 이상 받지 않음)
+        image = data.get('image')
+        if image is not None and 'image_url' not in data:
+            if not isinstance(image, str) or not image.startswith(('http://', 'https://', '/')) or len(image) > 200:
+                return {'error': 'image must be a URL, upload the file with POST /user/images and send imageId'}, 400
+            data = {**data, 'image_url': image}
+        
+        try:
+            data = resolve_image_ids(user_id, [data])[0]
+        except ResumeValidationError as e:
+            return {'error': str(e)}, 400
+        
         new_project = Project(
             user_id=user_id,
             title=data['title'],
             description=data['description'],
             organization=data.get('organization'),
             portfolio_url=data.get('portfolio_url'),
-            image_url=data.get('image'),
+            image_url=data.get('image_url'),
             is_representative=data.get('is_representative', False),
             start_date=data['startDate'],
             end_date=data['endDate'],
@@ -380,6 +473,10 @@ class ProjectResource(Resource):
         )
         
         db.session.add(new_project)
+        db.session.flush()
+        link_project_images([new_project.id])
+        bump_resume_version(user_id)
+        sync_student_profiles([user_id])
         db.session.commit()
         
         return {'message': '프로젝트가 추가되었습니다.'}, 201
@@ -397,15 +494,21 @@ class SkillResource(Resource):
     @user_ns.expect(skill_model)
     def post(self):
         """새로운 기술 스택을 추가합니다."""
-        user_id = get_jwt_identity()
-        data = request.get_json()
+        user = current_user_record()
+        data = request.get_json() or {}
         
-        new_skill = Skill(
-            user_id=user_id,
-            name=data['name']
-        )
+        # 기존 기술 스택이면 재사용하고(대소문자/공백 무시), 없으면 새로 생성해 사용자에 연결
+        try:
+            skills = resolve_skills([data.get('name') or ''])
+        except InvalidSkillName as e:
+            return {'error': str(e)}, 400
+        if not skills:
+            return {'error': '기술 이름이 필요합니다.'}, 400
+        if skills[0] not in user.skills:
+            user.skills.append(skills[0])
         
-        db.session.add(new_skill)
+        bump_resume_version(user.id)
+        sync_student_profiles([user.id])
         db.session.commit()
         
         return {'message': '기술 스택이 추가되었습니다.'}, 201
@@ -431,21 +534,27 @@ class Resume(Resource):
              - education: 학력 목록
              - awards: 수상 목록
              - certificates: 자격증 목록
+             
+             저장 방식:
+             - 각 항목에 기존 항목의 id 를 넣으면 그 항목을 수정합니다. id 가 없으면 내용이 같은 기존 항목과 짝짓습니다.
+             - 바뀐 항목만 추가/수정/삭제하며, 요청에 없는 기존 항목은 삭제됩니다.
+             - skills 를 보내면 기술 스택을 그 목록과 같게 맞추고, 보내지 않으면 그대로 둡니다.
+             - 응답의 changed 가 false 이면 저장된 내용이 없습니다. 섹션별 inserted/updated/deleted 에 항목 id 를 반환합니다.
+             - If-Match 헤더에 resume_version 을 넣으면 그 버전일 때만 저장합니다. 응답의 ETag 가 새 버전입니다.
              ''',
              responses={
                  200: '이력서 저장 성공',
+                 400: '잘못된 이력서 데이터',
                  401: '인증 실패',
                  404: '사용자를 찾을 수 없음',
+                 412: '다른 곳에서 이력서가 먼저 수정됨',
                  500: '서버 오류'
              })
     @user_ns.expect(resume_model)
     def post(self):
         """사용자의 이력서를 저장합니다."""
         try:
-            current_user_id = get_jwt_identity()
-            print(f"[DEBUG] 토큰에서 가져온 user_id: {current_user_id}, 타입: {type(current_user_id)}")
-            
-            user = User.query.get(current_user_id)
+            user = current_user_record()
             print(f"[DEBUG] 조회된 사용자: {user}, 타입: {type(user)}")
             
             if not user:
@@ -454,141 +563,34 @@ class Resume(Resource):
             
             data = request.get_json()
             print(f"[DEBUG] 받은 요청 데이터: {data}")
+            if not isinstance(data, dict):
+                return {'error': 'Invalid resume data'}, 400
             
             try:
-                # 기본 정보 업데이트 (이메일 제외)
-                user.name = data.get('name', user.name)
-                user.phone = data.get('phone', user.phone)
-                user.introduction = data.get('introduction', user.introduction)
-                user.portfolio = data.get('portfolio', user.portfolio)
-                user.blog = data.get('blog', user.blog)
-                user.github = data.get('github', user.github)
-                
-                print("[DEBUG] 기본 정보 업데이트 완료")
-                
-                # 기존 데이터 삭제
-                WorkExperience.query.filter_by(user_id=current_user_id).delete()
-                Project.query.filter_by(user_id=current_user_id).delete()
-                Education.query.filter_by(user_id=current_user_id).delete()
-                Award.query.filter_by(user_id=current_user_id).delete()
-                Certificate.query.filter_by(user_id=current_user_id).delete()
-                
-                print("[DEBUG] 기존 데이터 삭제 완료")
-                
-                # 경력 사항 저장
-                for exp_data in data.get('workExperience', []):
-                    print(f"[DEBUG] 경력 데이터 처리: {exp_data}")
-                    try:
-                        exp = WorkExperience(
-                            user_id=current_user_id,
-                            company=exp_data['company'],
-                            department=exp_data.get('department'),
-                            position=exp_data.get('position'),
-                            is_current=exp_data.get('is_current', False),
-                            description=exp_data.get('description'),
-                            start_date=datetime.strptime(exp_data['startDate'], '%Y-%m-%d').date() if exp_data.get('startDate') else None,
-                            end_date=datetime.strptime(exp_data['endDate'], '%Y-%m-%d').date() if exp_data.get('endDate') else None
-                        )
-                        db.session.add(exp)
-                        print(f"[DEBUG] 경력 추가: {exp.company}")
-                    except Exception as e:
-                        print(f"[DEBUG] 경력 데이터 처리 중 오류: {str(e)}")
-                        raise
-                
-                # 프로젝트 저장
-                for proj_data in data.get('projects', []):
-                    print(f"[DEBUG] 프로젝트 데이터 처리: {proj_data}")
-                    try:
-                        proj = Project(
-                            user_id=current_user_id,
-                            title=proj_data['title'],
-                            organization=proj_data.get('organization'),
-                            description=proj_data.get('description'),
-                            portfolio_url=proj_data.get('portfolio_url'),
-                            image_url=proj_data.get('image_url'),
-                            is_representative=proj_data.get('is_representative', False),
-                            start_date=datetime.strptime(proj_data['startDate'], '%Y-%m-%d').date() if proj_data.get('startDate') else None,
-                            end_date=datetime.strptime(proj_data['endDate'], '%Y-%m-%d').date() if proj_data.get('endDate') else None,
-                            tech_stack=proj_data.get('techStack', [])
-                        )
-                        db.session.add(proj)
-                        print(f"[DEBUG] 프로젝트 추가: {proj.title}")
-                    except Exception as e:
-                        print(f"[DEBUG] 프로젝트 데이터 처리 중 오류: {str(e)}")
-                        raise
+                # 바뀐 항목만 INSERT/UPDATE/DELETE (변경이 없으면 아무것도 쓰지 않음)
+                changes = write_resume(user, data)
+                logger.debug(f"이력서 변경 내역: {changes}")
                 
-                # 학력 저장
-                for edu_data in data.get('education', []):
-                    print(f"[DEBUG] 학력 데이터 처리: {edu_data}")
-                    try:
-                        edu = Education(
-                            user_id=current_user_id,
-                            school=edu_data['school'],
-                            major=edu_data.get('major'),
-                            degree=edu_data.get('degree'),
-                            start_date=datetime.strptime(edu_data['startDate'], '%Y-%m-%d').date() if edu_data.get('startDate') else None,
-                            end_date=datetime.strptime(edu_data['endDate'], '%Y-%m-%d').date() if edu_data.get('endDate') else None
-                        )
-                        db.session.add(edu)
-                        print(f"[DEBUG] 학력 추가: {edu.school}")
-                    except Exception as e:
-                        print(f"[DEBUG] 학력 데이터 처리 중 오류: {str(e)}")
-                        raise
+                # If-Match 는 선택 사항 (보내면 그 버전일 때만 저장)
+                expected = resume_if_match() if request.if_match else None
+                if changes['changed']:
+                    version = bump_resume_version(user.id, expected)
+                    if version is None:
+                        db.session.rollback()
+                        return resume_conflict(user.id)
+                    sync_student_profiles([user.id])
+                    db.session.commit()
+                    print("[DEBUG] 모든 데이터 저장 완료")
+                else:
+                    version = user.resume_version
+                    if expected is not None and version not in expected:
+                        return resume_conflict(user.id)
                 
-                # 수상 내역 저장
-                for award_data in data.get('awards', []):
-                    print(f"[DEBUG] 수상 데이터 처리: {award_data}")
-                    try:
-                        award = Award(
-                            user_id=current_user_id,
-                            title=award_data['title'],
-                            start_date=datetime.strptime(award_data['startDate'], '%Y-%m-%d').date() if award_data.get('startDate') else None,
-                            end_date=datetime.strptime(award_data['endDate'], '%Y-%m-%d').date() if award_data.get('endDate') else None,
-                            description=award_data.get('description')
-                        )
-                        db.session.add(award)
-                        print(f"[DEBUG] 수상 추가: {award.title}")
-                    except Exception as e:
-                        print(f"[DEBUG] 수상 데이터 처리 중 오류: {str(e)}")
-                        raise
-                
-                # 자격증 저장
-                for cert_data in data.get('certificates', []):
-                    print(f"[DEBUG] 자격증 데이터 처리: {cert_data}")
-                    try:
-                        cert = Certificate(
-                            user_id=current_user_id,
-                            title=cert_data['title'],
-                            organization=cert_data.get('organization'),
-                            issue_date=datetime.strptime(cert_data['issueDate'], '%Y-%m-%d').date() if cert_data.get('issueDate') else None,
-                            credential_id=cert_data.get('credential_id')
-                        )
-                        db.session.add(cert)
-                        print(f"[DEBUG] 자격증 추가: {cert.title}")
-                    except Exception as e:
-                        print(f"[DEBUG] 자격증 데이터 처리 중 오류: {str(e)}")
-                        raise
-                
-                # 기술 스택 저장
-                print(f"[DEBUG] 기술 스택 처리: {data.get('skills', [])}")
-                try:
-                    for skill_name in data.get('skills', []):
-                        skill = Skill.query.filter_by(name=skill_name).first()
-                        if not skill:
-                            skill = Skill(name=skill_name)
-                            db.session.add(skill)
-                            db.session.flush()  # ID 생성을 위해 flush
-                        user.skills.append(skill)
-                    print("[DEBUG] 기술 스택 추가 완료")
-                except Exception as e:
-                    print(f"[DEBUG] 기술 스택 처리 중 오류: {str(e)}")
-                    raise
-                
-                db.session.commit()
-                print("[DEBUG] 모든 데이터 저장 완료")
-                
-                return {'message': 'Resume saved successfully'}, 200
+                return {'message': 'Resume saved successfully', 'resume_version': version, **changes}, 200, resume_etag(version)
                 
+            except (ResumeValidationError, InvalidSkillName) as e:
+                db.session.rollback()
+                return {'error': str(e)}, 400
             except Exception as e:
                 db.session.rollback()
                 print(f"[DEBUG] 데이터 저장 중 오류 발생: {str(e)}")
@@ -600,11 +602,131 @@ class Resume(Resource):
             logger.error(f"Error in save_resume: {str(e)}")
             return {'error': str(e)}, 500
 
+@user_ns.route('/resume/<string:section>')
+@user_ns.param('section', f'수정할 섹션 ({", ".join(RESUME_PATCH_SECTIONS)})')
+class ResumeSection(Resource):
+    @jwt_required()
+    @user_ns.doc('이력서 섹션 수정',
+             description='''
+             이력서의 한 섹션만 부분 수정합니다. 바뀐 행만 씁니다.
+             
+             요청 데이터:
+             - profile: 수정할 기본 정보 필드만 보냅니다. (name, phone, introduction, portfolio, blog, github)
+             - skills: {"add": ["React"], "remove": ["jQuery"]}
+             - workExperience, projects, education, awards, certificates:
+               {"upsert": [{"id": 3, "position": "팀장"}, {...새 항목}], "delete": [5]}
+               id 가 있는 항목은 보낸 필드만 수정하고, id 가 없는 항목은 추가합니다.
+             
+             동시 수정 방지:
+             - If-Match 헤더에 마지막으로 받은 resume_version 을 넣어야 합니다. (예: If-Match: "7", 확인하지 않으려면 *)
+             - 그 사이에 다른 곳에서 수정했으면 412 와 현재 resume_version 을 반환합니다.
+             - 응답의 ETag 가 새 버전입니다.
+             ''',
+             responses={
+                 200: '이력서 섹션 수정 성공',
+                 400: '잘못된 이력서 데이터',
+                 401: '인증 실패',
+                 404: '없는 섹션',
+                 412: '다른 곳에서 이력서가 먼저 수정됨',
+                 428: 'If-Match 헤더 없음',
+                 500: '서버 오류'
+             })
+    @user_ns.expect(resume_patch_model)
+    def patch(self, section):
+        """이력서의 한 섹션만 부분 수정합니다."""
+        try:
+            if section not in RESUME_PATCH_SECTIONS:
+                return {'error': f'Unknown resume section: {section}'}, 404
+            if not request.if_match:
+                return {'error': 'If-Match header is required'}, 428
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return {'error': 'Invalid resume data'}, 400
+            
+            user = current_user_record()
+            expected = resume_if_match()
+            try:
+                name, change, changed = patch_resume_section(user, section, data)
+                if changed:
+                    # 버전 확인과 증가를 조건부 UPDATE 하나로 처리
+                    version = bump_resume_version(user.id, expected)
+                    if version is None:
+                        db.session.rollback()
+                        return resume_conflict(user.id)
+                    sync_student_profiles([user.id])
+                    db.session.commit()
+                else:
+                    version = user.resume_version
+                    if expected is not None and version not in expected:
+                        return resume_conflict(user.id)
+            except (ResumeValidationError, InvalidSkillName) as e:
+                db.session.rollback()
+                return {'error': str(e)}, 400
+            
+            return {
+                'message': 'Resume updated successfully',
+                'resume_version': version,
+                'changed': changed,
+                name: change
+            }, 200, resume_etag(version)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error in patch_resume_section: {str(e)}")
+            return {'error': str(e)}, 500
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_ndjson():
+    """요청의 Accept 헤더가 NDJSON 을 우선하는지 확인합니다."""
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def stream_student_profiles(students_query):
+    """수료생 카드를 서버 측 커서로 batch 단위로 읽어 NDJSON 한 줄씩 스트리밍하는 응답을 만듭니다."""
+    batch_size = current_app.config['STUDENT_EXPORT_BATCH_SIZE']
+
+    def render(batch):
+        for profile in load_card_documents(batch):
+            yield json_dumps(profile) + '\n'
+
+    def generate():
+        batch = []
+        for row in students_query.order_by(User.id).yield_per(batch_size):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield from render(batch)
+                batch = []
+        yield from render(batch)
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    # 프록시가 응답을 모아서 보내지 않도록 버퍼링 비활성화
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def student_list_versions(identity):
+    # 추천 정렬은 요청한 기업의 요구 기술에 따라 달라지므로 기업별 버전도 함께 사용
+    if request.args.get('sort') == 'recommended':
+        return DIRECTORY_VERSION, user_version(identity)
+    return DIRECTORY_VERSION
+
 @user_ns.route('/studentsprofile')
 class StudentList(Resource):
     @user_ns.doc('수료생 목록 조회',
              description='''모든 수료생의 상세 정보를 조회합니다.
              
+             ### 필터:
+             - course, skill, tech(프로젝트 사용 기술) 파라미터로 목록을 좁힐 수 있습니다.
+             - 같은 항목은 여러 번 또는 쉼표로 구분해 지정하며(OR), 서로 다른 항목은 모두 만족해야 합니다(AND).
+             
+             ### 페이지네이션:
+             - limit 또는 after 파라미터를 지정하면 {items, next_cursor} 형태로 응답합니다.
+             - 다음 페이지는 next_cursor 값을 after 로 전달해 조회합니다. 마지막 페이지에서는 null 입니다.
+             
+             ### 추천 정렬:
+             - sort=recommended 를 지정하면 기업 프로필의 요구 기술(required_skills)과 비슷한 수료생 상위 limit 명을 점수 순으로 반환합니다.
+             - 드문 기술이 겹칠수록 높은 점수를 받으며(IDF 가중), 각 항목에 match_score 와 matching_skills 가 추가됩니다.
+             - 요구 기술과 겹치는 기술이 없는 수료생은 포함되지 않습니다.
+             - 미리 계산해 둔 기업별 추천 목록에서 읽으며, 필터를 지정하면 그 목록 안에서 좁힙니다. (계산 시각은 /company/recommendations 참고)
+             
              ### 응답 데이터 포함 내용:
              - 기본 정보 (이름, 이메일, 연락처 등)
              - 수료 과정
@@ -619,97 +741,258 @@ class StudentList(Resource):
              - 기업 회원만 접근 가능
              ''',
              responses={
-                 200: ('조회 성공', student_profile_response),
+                 200: ('조회 성공 (limit/after 지정 시 StudentProfilePage)', [student_profile_response]),
+                 400: '잘못된 페이지 파라미터',
                  401: '인증 실패 (토큰 없음 또는 기업 회원이 아님)',
                  500: '서버 오류'
              })
+    @user_ns.param('course', '수료 과정 필터')
+    @user_ns.param('skill', '기술 스택 필터')
+    @user_ns.param('tech', '프로젝트 사용 기술 필터')
+    @user_ns.param('limit', '페이지 크기 (서버 최대값으로 제한). 지정하면 커서 페이지네이션 모드로 응답합니다.')
+    @user_ns.param('after', '이전 응답의 next_cursor 값')
+    @user_ns.param('sort', 'recommended 지정 시 요구 기술과의 유사도 순으로 정렬')
     @jwt_required()
-    @user_ns.marshal_list_with(student_profile_response)
+    @cached_response(student_list_versions)
     def get(self):
         """모든 수료생의 상세 정보를 조회합니다."""
         try:
             # 현재 로그인한 사용자가 기업 회원인지 확인
-            current_user_id = get_jwt_identity()
-            current_user = User.query.get(current_user_id)
-            
-            if not current_user or current_user.user_type != 'company':
+            if current_user.user_type != 'company':
                 return {'message': 'Unauthorized access'}, 401
 
-            # 모든 수료생 조회
-            students = User.query.filter_by(user_type='student').all()
-            
-            response_data = []
-            for student in students:
-                # 각 학생의 관련 데이터 조회
-                work_experiences = WorkExperience.query.filter_by(user_id=student.id).all()
-                projects = Project.query.filter_by(user_id=student.id).all()
-                education = Education.query.filter_by(user_id=student.id).all()
-                awards = Award.query.filter_by(user_id=student.id).all()
-                certificates = Certificate.query.filter_by(user_id=student.id).all()
-                
-                student_data = {
-                    'user': {
-                        'id': student.id,
-                        'email': student.email,
-                        'name': student.name,
-                        'introduction': student.introduction,
-                        'phone': student.phone,
-                        'portfolio': student.portfolio,
-                        'blog': student.blog,
-                        'github': student.github,
-                        'course': student.course,
-                        'skills': [skill.name for skill in student.skills]
-                    },
-                    'work_experiences': [{
-                        'id': exp.id,
-                        'company': exp.company,
-                        'department': exp.department,
-                        'position': exp.position,
-                        'is_current': exp.is_current,
-                        'start_date': exp.start_date.isoformat() if exp.start_date else None,
-                        'end_date': exp.end_date.isoformat() if exp.end_date else None,
-                        'description': exp.description
-                    } for exp in work_experiences],
-                    'projects': [{
-                        'id': proj.id,
-                        'title': proj.title,
-                        'description': proj.description,
-                        'organization': proj.organization,
-                        'portfolio_url': proj.portfolio_url,
-                        'image_url': proj.image_url,
-                        'is_representative': proj.is_representative,
-                        'start_date': proj.start_date.isoformat() if proj.start_date else None,
-                        'end_date': proj.end_date.isoformat() if proj.end_date else None,
-                        'tech_stack': proj.tech_stack
-                    } for proj in projects],
-                    'education': [{
-                        'id': edu.id,
-                        'school': edu.school,
-                        'major': edu.major,
-                        'degree': edu.degree,
-                        'start_date': edu.start_date.isoformat() if edu.start_date else None,
-                        'end_date': edu.end_date.isoformat() if edu.end_date else None
-                    } for edu in education],
-                    'awards': [{
-                        'id': award.id,
-                        'title': award.title,
-                        'start_date': award.start_date.isoformat() if award.start_date else None,
-                        'end_date': award.end_date.isoformat() if award.end_date else None,
-                        'description': award.description
-                    } for award in awards],
-                    'certificates': [{
-                        'id': cert.id,
-                        'title': cert.title,
-                        'organization': cert.organization,
-                        'issue_date': cert.issue_date.isoformat() if cert.issue_date else None,
-                        'credential_id': cert.credential_id
-                    } for cert in certificates]
-                }
-                response_data.append(student_data)
-            
-            return response_data, 200
+            # 수료생 카드 테이블에서 미리 만들어진 문서를 읽음
+            filters = parse_facet_filters(request.args)
+            students_query = apply_facet_filters(student_card_query(), filters)
+
+            if request.args.get('sort') == 'recommended':
+                try:
+                    limit, _ = parse_page_args(
+                        request.args,
+                        current_app.config['STUDENT_PAGE_DEFAULT_SIZE'],
+                        current_app.config['STUDENT_PAGE_MAX_SIZE']
+                    )
+                except InvalidCursor as e:
+                    return {'message': str(e)}, 400
+                return recommended_students(current_user.id, limit, filters), 200
+
+            # Accept: application/x-ndjson 요청은 스트리밍 응답으로 처리
+            if wants_ndjson():
+                return stream_student_profiles(students_query)
+
+            # limit/after 가 없으면 기존과 같이 전체 목록을 반환
+            if 'limit' not in request.args and 'after' not in request.args:
+                rows = students_query.order_by(User.id).all()
+                return load_card_documents(rows), 200
+
+            try:
+                limit, last_id = parse_page_args(
+                    request.args,
+                    current_app.config['STUDENT_PAGE_DEFAULT_SIZE'],
+                    current_app.config['STUDENT_PAGE_MAX_SIZE']
+                )
+            except InvalidCursor as e:
+                return {'message': str(e)}, 400
+
+            rows, next_cursor = seek_page(students_query, User.id, limit, last_id)
+            return {
+                'items': load_card_documents(rows),
+                'next_cursor': next_cursor
+            }, 200
             
         except Exception as e:
             logger.error(f"Error in student list: {str(e)}")
             logger.error(traceback.format_exc())
-            return {'message': 'Internal server error'}, 500 
\ No newline at end of file
+            return {'message': 'Internal server error'}, 500
+
+@user_ns.route('/studentsprofile/export')
+class StudentExport(Resource):
+    @user_ns.doc('수료생 목록 스트리밍 내보내기',
+             description='''모든 수료생의 상세 정보를 NDJSON(한 줄에 한 명) 형식으로 스트리밍합니다.
+             
+             - 각 줄은 /user/studentsprofile 의 목록 항목과 같은 형식입니다.
+             - 서버 측 커서로 일정 개수씩 읽어 직렬화하는 즉시 전송하므로 전체 목록을 메모리에 올리지 않습니다.
+             - /user/studentsprofile 에 Accept: application/x-ndjson 헤더로 요청해도 같은 응답을 받을 수 있습니다.
+             
+             ### 접근 권한:
+             - 기업 회원만 접근 가능
+             ''',
+             responses={
+                 200: '조회 성공 (application/x-ndjson)',
+                 401: '인증 실패 (토큰 없음 또는 기업 회원이 아님)'
+             })
+    @jwt_required()
+    def get(self):
+        """모든 수료생의 상세 정보를 NDJSON 으로 스트리밍합니다."""
+        if current_user.user_type != 'company':
+            return {'message': 'Unauthorized access'}, 401
+
+        return stream_student_profiles(apply_facet_filters(student_card_query(), parse_facet_filters(request.args)))
+
+@user_ns.route('/studentsprofile/facets')
+class StudentFacets(Resource):
+    @user_ns.doc('수료생 필터 항목 집계 조회',
+             description='''수료 과정(course), 기술 스택(skill), 프로젝트 사용 기술(tech) 별 수료생 수를 조회합니다.
+             
+             - 수료생 프로필이 바뀔 때마다 갱신되는 집계 테이블에서 읽으므로 요청마다 집계하지 않습니다.
+             - 집계는 전체 수료생 기준이며, 현재 선택된 필터와 무관합니다.
+             
+             ### 접근 권한:
+             - 기업 회원만 접근 가능
+             ''',
+             responses={
+                 200: ('조회 성공', student_facets_response),
+                 401: '인증 실패 (토큰 없음 또는 기업 회원이 아님)',
+                 500: '서버 오류'
+             })
+    @user_ns.param('limit', '항목별 최대 값 개수')
+    @jwt_required()
+    @cached_response(lambda identity: DIRECTORY_VERSION)
+    def get(self):
+        """필터 항목별 수료생 수를 조회합니다."""
+        try:
+            if current_user.user_type != 'company':
+                return {'message': 'Unauthorized access'}, 401
+
+            limit = min(request.args.get('limit', 50, type=int), current_app.config['STUDENT_PAGE_MAX_SIZE'])
+            return facet_counts(max(limit, 1)), 200
+
+        except Exception as e:
+            logger.error(f"Error in student facets: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {'message': 'Internal server error'}, 500
+
+@user_ns.route('/studentsprofile/search')
+class StudentSearch(Resource):
+    @user_ns.doc('수료생 검색',
+             description='''자기소개, 수료 과정, 기술 스택, 프로젝트(제목/설명/사용 기술), 경력 설명에서 수료생을 검색합니다.
+             
+             - 한글은 글자 단위 bigram 으로 색인하므로 띄어쓰기나 조사와 무관하게 부분 일치로 검색됩니다.
+             - 결과는 관련도 순으로 정렬되며, 검색어가 강조된 스니펫을 함께 반환합니다.
+             
+             ### 접근 권한:
+             - 기업 회원만 접근 가능
+             ''',
+             responses={
+                 200: ('검색 성공', student_search_response),
+                 400: '검색어 누락',
+                 401: '인증 실패 (토큰 없음 또는 기업 회원이 아님)',
+                 500: '서버 오류'
+             })
+    @user_ns.param('q', '검색어', required=True)
+    @user_ns.param('limit', '최대 결과 수 (서버 최대값으로 제한)')
+    @jwt_required()
+    @cached_response(lambda identity: DIRECTORY_VERSION)
+    def get(self):
+        """수료생을 전문 검색합니다."""
+        try:
+            if current_user.user_type != 'company':
+                return {'message': 'Unauthorized access'}, 401
+
+            query = request.args.get('q', '').strip()
+            if not query:
+                return {'message': 'q is required'}, 400
+            limit = min(request.args.get('limit', current_app.config['STUDENT_PAGE_DEFAULT_SIZE'], type=int),
+                        current_app.config['STUDENT_PAGE_MAX_SIZE'])
+
+            matches = search_students(query, max(limit, 1))
+            rows = student_card_query().filter(User.id.in_([match['user_id'] for match in matches])).all()
+            documents = {document['user']['id']: document for document in load_card_documents(rows)}
+
+            return {
+                'results': [{
+                    'student': documents[match['user_id']],
+                    'score': match['score'],
+                    'snippet': match['snippet']
+                } for match in matches if match['user_id'] in documents]
+            }, 200
+
+        except Exception as e:
+            logger.error(f"Error in student search: {str(e)}")
+            logger.error(traceback.format_exc())
+            return {'message': 'Internal server error'}, 500
+
+@user_bp.cli.command('backfill-cards')
+@click.option('--batch-size', default=500, show_default=True, help='한 트랜잭션에서 처리할 수료생 수')
+def backfill_student_cards(batch_size):
+    """모든 수료생의 카드를 다시 만듭니다."""
+    student_ids = [row.id for row in db.session.query(User.id).filter_by(user_type='student').order_by(User.id)]
+    for start in range(0, len(student_ids), batch_size):
+        chunk = student_ids[start:start + batch_size]
+        rebuild_student_cards(chunk)
+        db.session.commit()
+        click.echo(f'{start + len(chunk)}/{len(student_ids)} 수료생 카드 갱신 완료')
+
+@user_bp.cli.command('reindex-search')
+@click.option('--batch-size', default=500, show_default=True, help='한 트랜잭션에서 처리할 수료생 수')
+def reindex_student_search(batch_size):
+    """검색 색인 구조를 만들고 모든 수료생의 검색 문서를 다시 만듭니다."""
+    ensure_search_schema()
+    student_ids = [row.id for row in db.session.query(User.id).filter_by(user_type='student').order_by(User.id)]
+    for start in range(0, len(student_ids), batch_size):
+        chunk = student_ids[start:start + batch_size]
+        index_students(chunk)
+        db.session.commit()
+        click.echo(f'{start + len(chunk)}/{len(student_ids)} 수료생 검색 문서 갱신 완료')
+
+@user_bp.cli.command('rebuild-facets')
+@click.option('--batch-size', default=500, show_default=True, help='한 트랜잭션에서 처리할 수료생 수')
+def rebuild_student_facets(batch_size):
+    """모든 수료생의 필터 항목 소속과 집계를 다시 만듭니다."""
+    student_ids = [row.id for row in db.session.query(User.id).filter_by(user_type='student').order_by(User.id)]
+    for start in range(0, len(student_ids), batch_size):
+        chunk = student_ids[start:start + batch_size]
+        refresh_student_facets(chunk)
+        db.session.commit()
+    rebuild_facet_counts()
+    db.session.commit()
+    click.echo(f'{len(student_ids)} 수료생 필터 항목 집계 완료')
+
+@user_bp.cli.command('process-images')
+@click.option('--all', 'reprocess_all', is_flag=True, help='이미 변환한 이미지도 다시 변환 (IMAGE_VARIANTS 를 바꾼 뒤 사용)')
+@click.option('--processes', type=int, default=None, help='변환 프로세스 수 (기본값: CPU 수)')
+def process_uploaded_images(reprocess_all, processes):
+    """변환되지 않았거나 실패한 업로드 이미지의 크기별 변형을 만듭니다."""
+    # 같은 내용의 업로드는 한 번만 변환하고 결과를 나눠 씀
+    query = db.session.query(UploadedImage.id, UploadedImage.blob_key).order_by(UploadedImage.id)
+    if not reprocess_all:
+        query = query.filter(UploadedImage.status != 'ready')
+    images = query.all()
+    done = failed = 0
+    with image_process_pool(processes) as pool:
+        futures = {}
+        for image_id, key in images:
+            if key not in futures:
+                futures[key] = submit_render(pool, key)
+        for image_id, key in images:
+            future = futures[key]
+            try:
+                result = future.result()
+            except Exception as e:
+                click.echo(f'이미지 {image_id} 변환 실패: {e}')
+                result = None
+            record_image_variants(image_id, result)
+            db.session.commit()
+            if result is None:
+                failed += 1
+            else:
+                done += 1
+    click.echo(f'{done}개 이미지 변환 완료, {failed}개 실패')
+
+@user_bp.cli.command('gc-uploads')
+@click.option('--dry-run', is_flag=True, help='지우지 않고 지울 파일 수와 크기만 출력')
+@click.option('--grace-hours', type=float, default=None, help='이보다 최근 파일은 지우지 않음 (기본값: BLOB_GC_GRACE_HOURS)')
+@click.option('--batch-size', default=1000, show_default=True, help='한 번에 읽고 지울 행/파일 수')
+def gc_uploads(dry_run, grace_hours, batch_size):
+    """참조하지 않는 업로드 파일과 저장하지 않은 업로드 기록을 정리합니다."""
+    grace = timedelta(hours=grace_hours if grace_hours is not None else current_app.config['BLOB_GC_GRACE_HOURS'])
+    try:
+        stats = collect_garbage(
+            grace, dry_run=dry_run, batch_size=batch_size,
+            progress=lambda scanned, deleted: click.echo(f'{scanned}개 파일 검사, {deleted}개 삭제 대상')
+        )
+    except UnlistedImageColumns as e:
+        raise click.ClickException(str(e))
+    prefix = '[dry-run] ' if dry_run else ''
+    click.echo(f"{prefix}업로드 기록 {stats['pruned_uploads']}개 정리, 파일 {stats['scanned']}개 중 "
+               f"{stats['referenced']}개 사용 중, {stats['deleted']}개 삭제 ({stats['freed_bytes'] / (1024 * 1024):.1f}MB)")
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from flask import current_app
+from flask_jwt_extended import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from extensions import db
+from models import User
+
+PENDING_USER_INVALIDATIONS = 'auth_user_invalidations'
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """JWT 로 인증된 사용자의 권한 확인용 정보입니다. (flask_jwt_extended.current_user 로 접근)"""
+    id: int
+    user_type: str
+
+
+class AuthUserCache:
+    """사용자 id -> AuthUser 를 보관하는 프로세스 내 LRU 캐시입니다.
+
+    같은 프로세스에서 사용자가 수정/삭제되면 커밋 시점에 바로 지우고,
+    다른 워커에서의 변경은 TTL 이 지나면 반영됩니다.
+    """
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, auth_user = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return auth_user
+
+    def set(self, user_id, auth_user):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, auth_user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+def init_auth_cache(app):
+    app.extensions['auth_user_cache'] = AuthUserCache(
+        app.config['AUTH_USER_CACHE_MAX_ENTRIES'],
+        app.config['AUTH_USER_CACHE_TTL']
+    )
+
+
+def load_auth_user(identity):
+    """JWT identity 로 AuthUser 를 찾습니다. 캐시에 없을 때만 (id, user_type) 두 컬럼을 조회합니다."""
+    user_id = int(identity)
+    cache = current_app.extensions['auth_user_cache']
+    auth_user = cache.get(user_id)
+    if auth_user is None:
+        row = db.session.query(User.id, User.user_type).filter(User.id == user_id).first()
+        if row is None:
+            return None
+        auth_user = AuthUser(row.id, row.user_type)
+        cache.set(user_id, auth_user)
+    return auth_user
+
+
+def current_user_record():
+    """현재 요청 사용자의 User 객체를 반환합니다.
+
+    세션의 identity map 을 사용하므로 한 요청 안에서 여러 번 호출해도 한 번만 조회합니다.
+    """
+    return db.session.get(User, current_user.id)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _schedule_user_invalidation(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_USER_INVALIDATIONS, set()).add(target.id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_auth_users(session):
+    pending = session.info.pop(PENDING_USER_INVALIDATIONS, None)
+    cache = current_app.extensions.get('auth_user_cache') if pending else None
+    if cache is not None:
+        for user_id in pending:
+            cache.discard(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_user_invalidations(session, previous_transaction):
+    session.info.pop(PENDING_USER_INVALIDATIONS, None)
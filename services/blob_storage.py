@@ -0,0 +1,254 @@
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from flask import current_app
+
+HASH_CHUNK_SIZE = 64 * 1024
+# 'ab/cd/<sha256><확장자>' 형식의 저장소 키
+BLOB_KEY_PATTERN = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.[a-z0-9]+)?$')
+BLOB_URL_KEY_PATTERN = re.compile(r'([0-9a-f]{2})/([0-9a-f]{2})/(\1\2[0-9a-f]{60}(\.[a-z0-9]+)?)$')
+BLOB_CACHE_CONTROL = 'public, max-age=31536000, immutable'  # 내용이 바뀌면 키도 바뀌므로 영구 캐시
+
+
+def blob_key(digest, extension=''):
+    """SHA-256 hex digest 로 저장소 키를 만듭니다. 한 디렉터리에 파일이 몰리지 않도록 앞 네 글자로 두 단계 나눕니다."""
+    return f'{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def key_from_url(url):
+    """URL 끝의 저장소 키를 찾습니다. 저장소 URL 앞부분(도메인, CDN)이 바뀌어도 키를 찾을 수 있게 끝부분만 봅니다.
+
+    저장소 키가 아니면(외부 링크, 예전 업로드 파일) None 을 반환합니다.
+    """
+    match = BLOB_URL_KEY_PATTERN.search(url) if url else None
+    return match.group(0) if match else None
+
+
+def file_digest(path):
+    """파일의 SHA-256 hex digest 를 고정 크기로 나눠 읽으며 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashingFile:
+    """쓰는 동안 SHA-256 을 함께 계산하는 파일 래퍼입니다. 업로드를 받으면서 해시를 구해 다시 읽지 않습니다."""
+
+    def __init__(self, file):
+        self._file = file
+        self.sha256 = hashlib.sha256()
+
+    def write(self, data):
+        self.sha256.update(data)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class BlobStorage:
+    """content-addressed 업로드 저장소의 인터페이스입니다.
+
+    같은 키에는 항상 같은 내용이 들어가므로 put 은 이미 있는 키를 다시 쓰지 않고,
+    파일을 덮어쓰거나 고치는 연산은 없습니다. 지우는 것은 참조가 없는 파일을 정리할 때뿐입니다.
+    """
+
+    def put(self, key, path, content_type=None):
+        """로컬 파일을 key 로 저장합니다. 이미 있으면 아무것도 하지 않고 False 를 반환합니다.
+
+        path 의 파일은 저장소로 옮겨질 수 있으므로 호출한 뒤에는 다시 쓰지 않습니다. (남아 있으면 호출한 쪽에서 지움)
+        """
+        raise NotImplementedError
+
+    def delete(self, keys):
+        """키 목록의 파일을 지웁니다."""
+        raise NotImplementedError
+
+    def iter_blobs(self):
+        """저장된 (키, 크기, 수정 시각 UTC) 를 하나씩 반환합니다. 전체 목록을 메모리에 올리지 않습니다."""
+        raise NotImplementedError
+
+    @contextlib.contextmanager
+    def local_copy(self, key):
+        """key 의 내용을 읽을 수 있는 로컬 파일 경로를 줍니다."""
+        raise NotImplementedError
+
+    def url(self, key):
+        raise NotImplementedError
+
+
+class LocalBlobStorage(BlobStorage):
+    """UPLOAD_FOLDER 아래 'ab/cd/<sha256>.ext' 로 저장합니다. 임시 파일을 rename 해서 넣으므로 같은 파일 시스템의 scratch_dir 을 씁니다."""
+
+    def __init__(self, root, url_prefix='/uploads/'):
+        self.root = root
+        self.url_prefix = url_prefix
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+
+    def put(self, key, path, content_type=None):
+        target = self.path(key)
+        if os.path.exists(target):
+            # 다시 올라온 파일이 정리(GC)의 유예 시간 안에 들도록 수정 시각을 갱신
+            os.utime(target)
+            return False
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        # 같은 내용을 동시에 올려도 rename 은 원자적이고 결과가 같으므로 잠그지 않음
+        os.replace(path, target)
+        return True
+
+    def delete(self, keys):
+        for key in keys:
+            try:
+                os.unlink(self.path(key))
+            except FileNotFoundError:
+                pass
+
+    def iter_blobs(self):
+        # 두 글자 hex 디렉터리만 보므로 예전 업로드 파일과 .tmp 는 건드리지 않음
+        for first in sorted(os.scandir(self.root), key=lambda entry: entry.name):
+            if not (first.is_dir() and re.fullmatch(r'[0-9a-f]{2}', first.name)):
+                continue
+            for second in os.scandir(first.path):
+                if not (second.is_dir() and re.fullmatch(r'[0-9a-f]{2}', second.name)):
+                    continue
+                for entry in os.scandir(second.path):
+                    key = f'{first.name}/{second.name}/{entry.name}'
+                    if entry.is_file() and BLOB_KEY_PATTERN.match(key):
+                        stat = entry.stat()
+                        yield key, stat.st_size, datetime.fromtimestamp(stat.st_mtime, timezone.utc)
+
+    @contextlib.contextmanager
+    def local_copy(self, key):
+        yield self.path(key)
+
+    def url(self, key):
+        return self.url_prefix + key
+
+
+class S3BlobStorage(BlobStorage):
+    """S3 호환 저장소(AWS S3, MinIO 등)에 prefix + 키로 저장합니다.
+
+    endpoint_url 로 로컬 MinIO 등을 가리킬 수 있고, 테스트에서는 client 를 직접 넘길 수 있습니다.
+    """
+
+    DELETE_BATCH_SIZE = 1000  # DeleteObjects 한 번에 지울 수 있는 최대 수
+
+    def __init__(self, bucket, prefix='uploads/', public_url=None, endpoint_url=None, region=None,
+                 scratch_dir=None, client=None):
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError('BLOB_STORAGE_BACKEND=s3 를 사용하려면 boto3 패키지가 필요합니다.')
+            client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        if public_url is None:
+            public_url = f'{endpoint_url.rstrip("/")}/{bucket}' if endpoint_url else f'https://{bucket}.s3.amazonaws.com'
+        self.public_url = public_url.rstrip('/') + '/'
+        self.scratch_dir = scratch_dir
+
+    def _exists(self, key):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.prefix + key)
+        except Exception as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def put(self, key, path, content_type=None):
+        if self._exists(key):
+            return False
+        extra = {'CacheControl': BLOB_CACHE_CONTROL}
+        if content_type:
+            extra['ContentType'] = content_type
+        self.client.upload_file(path, self.bucket, self.prefix + key, ExtraArgs=extra)
+        return True
+
+    def delete(self, keys):
+        keys = list(keys)
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            batch = keys[start:start + self.DELETE_BATCH_SIZE]
+            self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': self.prefix + key} for key in batch], 'Quiet': True}
+            )
+
+    def iter_blobs(self):
+        paginator = self.client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get('Contents', ()):
+                key = item['Key'][len(self.prefix):]
+                if BLOB_KEY_PATTERN.match(key):
+                    yield key, item['Size'], item['LastModified']
+
+    @contextlib.contextmanager
+    def local_copy(self, key):
+        fd, path = tempfile.mkstemp(dir=self.scratch_dir, suffix=os.path.splitext(key)[1])
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, self.prefix + key, path)
+            yield path
+        finally:
+            os.unlink(path)
+
+    def url(self, key):
+        return self.public_url + self.prefix + key
+
+
+def blob_storage_settings(config):
+    """저장소를 만드는 데 필요한 설정입니다. 이미지 변환 자식 프로세스에도 그대로 넘깁니다."""
+    return {
+        'backend': config['BLOB_STORAGE_BACKEND'],
+        'root': config['UPLOAD_FOLDER'],
+        'scratch_dir': os.path.join(config['UPLOAD_FOLDER'], '.tmp'),
+        's3_bucket': config['BLOB_S3_BUCKET'],
+        's3_prefix': config['BLOB_S3_PREFIX'],
+        's3_public_url': config['BLOB_S3_PUBLIC_URL'],
+        's3_endpoint_url': config['BLOB_S3_ENDPOINT_URL'],
+        's3_region': config['BLOB_S3_REGION']
+    }
+
+
+def create_blob_storage(settings):
+    if settings['backend'] == 'local':
+        return LocalBlobStorage(settings['root'])
+    if settings['backend'] == 's3':
+        return S3BlobStorage(
+            settings['s3_bucket'],
+            prefix=settings['s3_prefix'],
+            public_url=settings['s3_public_url'],
+            endpoint_url=settings['s3_endpoint_url'],
+            region=settings['s3_region'],
+            scratch_dir=settings['scratch_dir']
+        )
+    raise ValueError(f"Unknown BLOB_STORAGE_BACKEND: {settings['backend']}")
+
+
+def init_blob_storage(app):
+    app.extensions['blob_storage'] = create_blob_storage(blob_storage_settings(app.config))
+
+
+def get_blob_storage():
+    return current_app.extensions['blob_storage']
+
+
+def blob_url(key):
+    return get_blob_storage().url(key)
+
+
+def store_file(path, extension='', content_type=None, digest=None):
+    """로컬 파일을 내용의 SHA-256 키로 저장하고 키를 반환합니다. 같은 내용이 이미 있으면 새로 쓰지 않습니다."""
+    key = blob_key(digest or file_digest(path), extension)
+    get_blob_storage().put(key, path, content_type)
+    return key
@@ -0,0 +1,209 @@
+import csv
+import json
+import re
+import time
+from flask import current_app
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from extensions import db
+from models import User, user_skills
+from services.password_hashing import validate_password, hashing_process_pool, submit_hashes
+from services.profile_sync import sync_student_profiles
+from services.skill_registry import SKILL_NAME_MAX_LENGTH, normalize_skill_name, resolve_skill_ids
+
+COHORT_FORMATS = ('csv', 'ndjson')
+SKILL_SEPARATOR = re.compile(r'[;,]')
+
+
+def detect_format(filename, content_type=None):
+    """파일 이름이나 Content-Type 으로 가져오기 형식(csv/ndjson)을 추측합니다."""
+    name = (filename or '').lower()
+    if name.endswith('.csv') or (content_type or '').startswith('text/csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (content_type or ''):
+        return 'ndjson'
+    return None
+
+
+def read_cohort_rows(stream, fmt):
+    """CSV 또는 NDJSON 텍스트 스트림에서 (줄 번호, 행) 을 읽습니다. 읽을 수 없는 줄은 행이 None 입니다."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_no, row if isinstance(row, dict) else None
+
+
+def _text(row, field):
+    value = row.get(field)
+    return value.strip() if isinstance(value, str) else ''
+
+
+def _skill_names(value):
+    if isinstance(value, str):
+        value = SKILL_SEPARATOR.split(value)
+    if not isinstance(value, list):
+        return []
+    # 대소문자/공백만 다른 이름은 처음 나온 것만 남김
+    unique = {}
+    for name in value:
+        if isinstance(name, str) and name.strip():
+            unique.setdefault(normalize_skill_name(name), name.strip())
+    return list(unique.values())
+
+
+def normalize_row(row, default_course=None):
+    """가져올 행을 검사하고 정리합니다. (정리된 행, 오류 메시지) 를 반환합니다."""
+    if row is None:
+        return None, 'Invalid row'
+
+    record = {
+        'email': _text(row, 'email'),
+        'password': row.get('password') if isinstance(row.get('password'), str) else '',
+        'name': _text(row, 'name'),
+        'course': _text(row, 'course') or (default_course or ''),
+        'phone': _text(row, 'phone') or None,
+        'skills': _skill_names(row.get('skills'))
+    }
+    missing = [field for field in ('email', 'password', 'name', 'course', 'skills') if not record[field]]
+    if missing:
+        return None, f'Missing required fields: {", ".join(missing)}'
+    if '@' not in record['email']:
+        return None, 'Invalid email'
+    if not validate_password(record['password']):
+        return None, 'Password must be at least 8 characters long and contain letters, numbers, and special characters'
+    if any(len(name) > SKILL_NAME_MAX_LENGTH for name in record['skills']):
+        return None, f'Skill names must be at most {SKILL_NAME_MAX_LENGTH} characters'
+    return record, None
+
+
+def _user_values(record, password_hash):
+    return {
+        'email': record['email'],
+        'password': password_hash,
+        'name': record['name'],
+        'user_type': 'student',
+        'course': record['course'],
+        'phone': record['phone']
+    }
+
+
+def _insert_records(records, hashes, skill_ids):
+    """사용자와 user_skills 를 여러 행 INSERT 로 넣고 {이메일: 사용자 id} 를 반환합니다."""
+    inserted = db.session.execute(
+        insert(User).returning(User.id, User.email),
+        [_user_values(record, password_hash) for record, password_hash in zip(records, hashes)]
+    ).all()
+    user_ids = {email: user_id for user_id, email in inserted}
+    skill_rows = [{'user_id': user_ids[record['email']], 'skill_id': skill_ids[normalize_skill_name(name)]}
+                  for record in records for name in record['skills']]
+    if skill_rows:
+        db.session.execute(user_skills.insert(), skill_rows)
+    return user_ids
+
+
+def _insert_records_one_by_one(records, hashes, skill_ids, errors):
+    """여러 행 INSERT 가 충돌하면(동시에 가입한 이메일 등) 행마다 savepoint 를 두고 다시 넣습니다."""
+    user_ids = {}
+    for record, password_hash in zip(records, hashes):
+        try:
+            with db.session.begin_nested():
+                user_ids.update(_insert_records([record], [password_hash], skill_ids))
+        except IntegrityError:
+            errors.append({'line': record['line'], 'email': record['email'], 'error': 'Email already exists'})
+    return user_ids
+
+
+def _import_chunk(records, hashes, skill_ids, errors):
+    existing = set(db.session.execute(
+        select(User.email).where(User.email.in_([record['email'] for record in records]))
+    ).scalars())
+    if existing:
+        errors.extend({'line': record['line'], 'email': record['email'], 'error': 'Email already exists'}
+                      for record in records if record['email'] in existing)
+        pairs = [(record, password_hash) for record, password_hash in zip(records, hashes)
+                 if record['email'] not in existing]
+        records, hashes = [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+    if not records:
+        return 0
+
+    try:
+        user_ids = _insert_records(records, hashes, skill_ids)
+    except IntegrityError:
+        db.session.rollback()
+        user_ids = _insert_records_one_by_one(records, hashes, skill_ids, errors)
+
+    if user_ids:
+        sync_student_profiles(list(user_ids.values()))
+    db.session.commit()
+    return len(user_ids)
+
+
+def import_cohort(rows, default_course=None, chunk_size=None, processes=None, progress=None):
+    """수료생 명단을 한꺼번에 가입시킵니다.
+
+    - rows 는 read_cohort_rows 가 돌려주는 (줄 번호, 행) 입니다.
+    - 기술은 전체 명단에 대해 한 번에 UPSERT 합니다.
+    - 비밀번호는 프로세스 풀에서 병렬로 해싱하며, 다음 묶음의 해싱을 현재 묶음을 저장하는 동안 진행합니다.
+    - chunk_size 명씩 한 트랜잭션으로 저장하므로 잘못된 행이 있어도 나머지는 가져옵니다.
+    - progress(처리한 행 수, 전체 행 수) 를 묶음마다 호출합니다.
+    """
+    started = time.perf_counter()
+    chunk_size = chunk_size or current_app.config['COHORT_IMPORT_CHUNK_SIZE']
+    rounds = current_app.config['BCRYPT_LOG_ROUNDS']
+
+    records, errors, seen = [], [], set()
+    total = 0
+    for line_no, row in rows:
+        total += 1
+        record, error = normalize_row(row, default_course)
+        if record is not None and record['email'] in seen:
+            error = 'Duplicate email in file'
+        if error:
+            email = row.get('email') if isinstance(row, dict) else None
+            errors.append({'line': line_no, 'email': email, 'error': error})
+            continue
+        seen.add(record['email'])
+        record['line'] = line_no
+        records.append(record)
+
+    skill_ids = resolve_skill_ids(name for record in records for name in record['skills'])
+    db.session.commit()
+
+    imported = 0
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    if chunks:
+        with hashing_process_pool(processes) as pool:
+            pending = submit_hashes(pool, [record['password'] for record in chunks[0]], rounds)
+            for index, chunk in enumerate(chunks):
+                hashes = [future.result() for future in pending]
+                if index + 1 < len(chunks):
+                    pending = submit_hashes(pool, [record['password'] for record in chunks[index + 1]], rounds)
+                try:
+                    imported += _import_chunk(chunk, hashes, skill_ids, errors)
+                except Exception as e:
+                    db.session.rollback()
+                    errors.extend({'line': record['line'], 'email': record['email'], 'error': str(e)}
+                                  for record in chunk)
+                if progress is not None:
+                    progress(sum(len(done) for done in chunks[:index + 1]), len(records))
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda error: error['line'])
+    return {
+        'total': total,
+        'imported': imported,
+        'failed': len(errors),
+        'errors': errors,
+        'elapsed_seconds': round(elapsed, 2),
+        'rows_per_second': round(imported / elapsed, 1) if elapsed > 0 else None
+    }
@@ -0,0 +1,230 @@
+from collections import Counter
+from sqlalchemy import select, func, tuple_, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from extensions import db
+from models import User, StudentFacet, FacetCount, FacetLabelCount
+from services.profile_loader import load_profile_bundles
+from services.skill_registry import clean_skill_name, normalize_skill_name
+
+# 요청 파라미터 이름 -> 필터 항목 이름
+FACET_PARAMS = {
+    'course': 'course',
+    'skill': 'skill',
+    'tech': 'tech',
+}
+
+VALUE_MAX_LENGTH = 100
+
+
+def _clean(value):
+    """표시용 값입니다. 앞뒤 공백을 없애고 연속된 공백을 하나로 줄입니다."""
+    value = clean_skill_name(value or '')
+    return value[:VALUE_MAX_LENGTH] if value else None
+
+
+def facet_key(value):
+    """집계와 필터에 쓰는 값입니다. ('React', ' react ' -> 'react')"""
+    value = normalize_skill_name(value or '')
+    return value[:VALUE_MAX_LENGTH] if value else None
+
+
+def student_facet_values(student, bundle):
+    """수료생이 속한 (필터 항목, 정규화된 값) 과 그 값의 표시 이름을 계산합니다."""
+    values = {}
+
+    def add(facet, value):
+        label = _clean(value) if isinstance(value, str) else None
+        if label:
+            values.setdefault((facet, facet_key(label)), label)
+
+    add('course', student.course)
+    for skill in bundle['skills']:
+        add('skill', skill['name'])
+    for proj in bundle['projects']:
+        for tech in proj['tech_stack'] or []:
+            add('tech', tech)
+    return values
+
+
+def _insert(table):
+    """현재 데이터베이스에 맞는 ON CONFLICT 지원 INSERT 구문을 반환합니다."""
+    if db.engine.dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+def _apply_count_deltas(deltas):
+    """필터 항목별 수료생 수 증감을 원자적 UPSERT 로 반영합니다."""
+    rows = [{'facet': facet, 'value': value, 'count': delta}
+            for (facet, value), delta in deltas.items() if delta]
+    if not rows:
+        return
+    stmt = _insert(FacetCount.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['facet', 'value'],
+        set_={'count': FacetCount.__table__.c.count + stmt.excluded.count}
+    )
+    db.session.execute(stmt, rows)
+
+
+def _apply_label_deltas(deltas):
+    """표기별 수료생 수 증감을 반영하고, 바뀐 값의 표시 이름(FacetCount.label)만 다시 고릅니다."""
+    rows = [{'facet': facet, 'value': value, 'label': label, 'count': delta}
+            for (facet, value, label), delta in deltas.items() if delta]
+    if not rows:
+        return
+    stmt = _insert(FacetLabelCount.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['facet', 'value', 'label'],
+        set_={'count': FacetLabelCount.__table__.c.count + stmt.excluded.count}
+    )
+    db.session.execute(stmt, rows)
+
+    keys = list({(facet, value) for facet, value, label in deltas})
+    FacetLabelCount.query.filter(
+        tuple_(FacetLabelCount.facet, FacetLabelCount.value).in_(keys), FacetLabelCount.count <= 0
+    ).delete(synchronize_session=False)
+    _update_display_labels(keys)
+
+
+def _most_used_labels(rows):
+    """(항목, 값, 표기, 수) 행에서 값마다 가장 많이 쓰인 표기를 고릅니다. (수가 같으면 사전순)"""
+    best = {}
+    for facet, value, label, count in rows:
+        current = best.get((facet, value))
+        if current is None or (-count, label) < (-current[0], current[1]):
+            best[(facet, value)] = (count, label)
+    return {key: label for key, (count, label) in best.items()}
+
+
+def _update_display_labels(keys):
+    """주어진 값들의 표시 이름(FacetCount.label)을 표기별 집계에서 다시 골라 저장합니다."""
+    rows = db.session.query(FacetLabelCount.facet, FacetLabelCount.value, FacetLabelCount.label,
+                            FacetLabelCount.count) \
+        .filter(tuple_(FacetLabelCount.facet, FacetLabelCount.value).in_(keys), FacetLabelCount.count > 0).all()
+    labels = _most_used_labels(rows)
+    table = FacetCount.__table__
+    db.session.execute(
+        table.update().where(table.c.facet == bindparam('b_facet'), table.c.value == bindparam('b_value'))
+        .values(label=bindparam('label')),
+        [{'b_facet': facet, 'b_value': value, 'label': labels.get((facet, value))} for facet, value in keys]
+    )
+
+
+def refresh_student_facets(user_ids):
+    """주어진 사용자들의 필터 항목 소속을 다시 계산하고, 바뀐 만큼만 집계를 증감합니다."""
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return
+
+    db.session.flush()
+
+    students = User.query.filter(User.id.in_(user_ids), User.user_type == 'student').all()
+    bundles = load_profile_bundles([student.id for student in students])
+    desired = {student.id: student_facet_values(student, bundles[student.id]) for student in students}
+
+    current = {user_id: {} for user_id in user_ids}
+    for row in StudentFacet.query.filter(StudentFacet.user_id.in_(user_ids)).all():
+        current[row.user_id][(row.facet, row.value)] = row.label
+
+    deltas = Counter()
+    label_deltas = Counter()
+    removed = []
+    added = []
+    relabeled = []
+    for user_id in user_ids:
+        new_values = desired.get(user_id, {})
+        old_values = current[user_id]
+        for facet, value in old_values.keys() - new_values.keys():
+            removed.append((user_id, facet, value))
+            deltas[(facet, value)] -= 1
+            if old_values[(facet, value)]:
+                label_deltas[(facet, value, old_values[(facet, value)])] -= 1
+        for facet, value in new_values.keys() - old_values.keys():
+            added.append({'user_id': user_id, 'facet': facet, 'value': value, 'label': new_values[(facet, value)]})
+            deltas[(facet, value)] += 1
+            label_deltas[(facet, value, new_values[(facet, value)])] += 1
+        # 같은 값의 표기만 바뀐 경우 ('react' -> 'React') 는 집계는 그대로 두고 표시 이름만 갱신
+        for facet, value in new_values.keys() & old_values.keys():
+            if new_values[(facet, value)] != old_values[(facet, value)]:
+                relabeled.append({'b_user_id': user_id, 'b_facet': facet, 'b_value': value,
+                                  'label': new_values[(facet, value)]})
+                if old_values[(facet, value)]:
+                    label_deltas[(facet, value, old_values[(facet, value)])] -= 1
+                label_deltas[(facet, value, new_values[(facet, value)])] += 1
+
+    if removed:
+        StudentFacet.query.filter(
+            tuple_(StudentFacet.user_id, StudentFacet.facet, StudentFacet.value).in_(removed)
+        ).delete(synchronize_session=False)
+    if added:
+        db.session.execute(StudentFacet.__table__.insert(), added)
+    if relabeled:
+        table = StudentFacet.__table__
+        db.session.execute(
+            table.update().where(table.c.user_id == bindparam('b_user_id'), table.c.facet == bindparam('b_facet'),
+                                 table.c.value == bindparam('b_value')).values(label=bindparam('label')),
+            relabeled
+        )
+    _apply_count_deltas(deltas)
+    _apply_label_deltas(label_deltas)
+
+
+def rebuild_facet_counts():
+    """소속 정보로부터 전체 집계와 표시 이름을 다시 계산합니다. (증감 누락을 바로잡는 용도)"""
+    FacetCount.query.delete(synchronize_session=False)
+    FacetLabelCount.query.delete(synchronize_session=False)
+    labels = db.session.query(StudentFacet.facet, StudentFacet.value, StudentFacet.label, func.count()) \
+        .filter(StudentFacet.label.isnot(None)) \
+        .group_by(StudentFacet.facet, StudentFacet.value, StudentFacet.label).all()
+    if labels:
+        db.session.execute(FacetLabelCount.__table__.insert(), [
+            {'facet': facet, 'value': value, 'label': label, 'count': count} for facet, value, label, count in labels
+        ])
+
+    totals = db.session.query(StudentFacet.facet, StudentFacet.value, func.count()) \
+        .group_by(StudentFacet.facet, StudentFacet.value).all()
+    best = _most_used_labels(labels)
+    if totals:
+        db.session.execute(FacetCount.__table__.insert(), [
+            {'facet': facet, 'value': value, 'count': count, 'label': best.get((facet, value))}
+            for facet, value, count in totals
+        ])
+
+
+def facet_counts(limit_per_facet):
+    """필터 항목별 상위 값과 수료생 수를 집계 테이블에서 읽어 반환합니다.
+
+    value 는 필터에 그대로 쓸 수 있는 정규화된 값이고, label 은 가장 많이 쓰인 표기입니다.
+    """
+    result = {}
+    for facet in FACET_PARAMS.values():
+        rows = FacetCount.query.filter(FacetCount.facet == facet, FacetCount.count > 0) \
+            .order_by(FacetCount.count.desc(), FacetCount.value) \
+            .limit(limit_per_facet).all()
+        result[facet] = [{'value': row.value, 'label': row.label or row.value, 'count': row.count}
+                         for row in rows]
+    return result
+
+
+def parse_facet_filters(args):
+    """요청 파라미터에서 필터 조건을 읽습니다. 같은 항목은 여러 번 또는 쉼표로 구분해 지정할 수 있습니다.
+
+    값은 대소문자와 공백 차이를 무시하도록 집계와 같은 방식으로 정규화합니다. (skill=react 와 skill=React 는 같음)
+    """
+    filters = {}
+    for param, facet in FACET_PARAMS.items():
+        values = []
+        for raw in args.getlist(param):
+            values.extend(value for value in (facet_key(part) for part in raw.split(',')) if value)
+        if values:
+            filters[facet] = list(dict.fromkeys(values))
+    return filters
+
+
+def apply_facet_filters(query, filters):
+    """같은 항목 안에서는 OR, 항목 사이에서는 AND 로 수료생 쿼리를 좁힙니다."""
+    for facet, values in filters.items():
+        members = select(StudentFacet.user_id).where(StudentFacet.facet == facet, StudentFacet.value.in_(values))
+        query = query.filter(User.id.in_(members))
+    return query
@@ -0,0 +1,245 @@
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from PIL import Image, ImageOps
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from extensions import db
+from models import Project, UploadedImage
+from services.blob_storage import blob_key, blob_storage_settings, blob_url, create_blob_storage, file_digest, key_from_url
+
+logger = logging.getLogger(__name__)
+
+PENDING_IMAGE_JOBS = 'image_processing_pending'
+# 수료생 목록(카드)에는 작은 변형만 내려보냄 (full 은 본인 프로필/상세 화면용)
+CARD_IMAGE_VARIANTS = ('thumb', 'card')
+ORIENTATION_TAG = 0x0112
+VARIANT_FORMATS = (('webp', 'WEBP', '.webp', 'image/webp'), ('jpeg', 'JPEG', '.jpg', 'image/jpeg'))
+
+
+def _flatten(image):
+    """JPEG 로 저장할 수 있도록 투명 영역을 흰 배경으로 채웁니다."""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, (255, 255, 255))
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def render_variants(storage_settings, key, sizes, quality):
+    """(자식 프로세스) 원본 이미지로 크기별 WebP/JPEG 변형을 만들어 저장소에 넣고 원본 크기와 변형 키를 반환합니다.
+
+    - 회전(EXIF Orientation)은 픽셀에 반영하고, 변형 파일에는 EXIF 를 넣지 않습니다.
+    - 긴 변이 sizes 의 값을 넘지 않게 줄이며 원본보다 키우지 않습니다.
+    - 큰 변형부터 만들고 작은 변형은 바로 앞 변형에서 줄여 리샘플링 비용을 줄입니다.
+    - 변형도 내용의 SHA-256 으로 저장하므로 같은 결과는 한 번만 저장됩니다.
+    """
+    storage = create_blob_storage(storage_settings)
+    with storage.local_copy(key) as source_path, Image.open(source_path) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ORIENTATION_TAG, 1)
+        if orientation in (5, 6, 7, 8):
+            width, height = height, width
+        largest = max(sizes.values())
+        # JPEG 는 필요한 크기에 가깝게 축소하면서 디코딩 (DCT 스케일링)
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        current = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = {}
+    with tempfile.TemporaryDirectory(dir=storage_settings['scratch_dir']) as workdir:
+        for name, edge in sorted(sizes.items(), key=lambda item: -item[1]):
+            current = current.copy()
+            current.thumbnail((edge, edge), Image.LANCZOS)
+            variant = {'width': current.width, 'height': current.height}
+            for field, fmt, extension, content_type in VARIANT_FORMATS:
+                path = os.path.join(workdir, f'{name}{extension}')
+                output = current if fmt == 'WEBP' else _flatten(current)
+                options = {'quality': quality[field]}
+                if fmt == 'JPEG':
+                    options.update(optimize=True, progressive=True)
+                else:
+                    options.update(method=4)
+                output.save(path, fmt, **options)
+                variant[field] = blob_key(file_digest(path), extension)
+                storage.put(variant[field], path, content_type)
+            variants[name] = variant
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def image_process_pool(processes=None):
+    """이미지 변환용 프로세스 풀을 만듭니다. 요청 스레드가 있는 워커 프로세스에서 fork 하지 않도록 spawn 으로 시작합니다."""
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+
+def submit_render(pool, key):
+    config = current_app.config
+    return pool.submit(
+        render_variants,
+        blob_storage_settings(config),
+        key,
+        config['IMAGE_VARIANTS'],
+        config['IMAGE_VARIANT_QUALITY']
+    )
+
+
+def variant_urls(variants):
+    """저장소 키로 기록한 변형 정보를 응답용 URL 로 바꿉니다."""
+    if not variants:
+        return variants
+    return {
+        name: {**variant, **{field: blob_url(variant[field]) for field, _, _, _ in VARIANT_FORMATS}}
+        for name, variant in variants.items()
+    }
+
+
+def record_image_variants(image_id, result):
+    """변환 결과를 업로드 이미지와 그 이미지를 쓰는 프로젝트에 기록합니다. result 가 None 이면 실패로 표시합니다. (커밋은 호출한 쪽에서 함)"""
+    from services.profile_sync import sync_student_profiles
+
+    if result is None:
+        db.session.execute(
+            update(UploadedImage).where(UploadedImage.id == image_id).values(status='failed')
+            .execution_options(synchronize_session=False)
+        )
+        return
+    key = db.session.execute(
+        update(UploadedImage).where(UploadedImage.id == image_id)
+        .values(status='ready', width=result['width'], height=result['height'], variants=result['variants'])
+        .returning(UploadedImage.blob_key)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if key is None:
+        return
+    # 변환이 끝나기 전에 저장한 프로젝트에도 반영
+    user_ids = set(db.session.execute(
+        update(Project).where(Project.image_url == blob_url(key))
+        .values(image_width=result['width'], image_height=result['height'],
+                image_variants=variant_urls(result['variants']))
+        .returning(Project.user_id)
+        .execution_options(synchronize_session=False)
+    ).scalars())
+    if user_ids:
+        sync_student_profiles(sorted(user_ids))
+
+
+def link_project_images(project_ids):
+    """프로젝트의 image_url 이 업로드한 이미지이면 변환 결과(크기, 변형 URL)를 프로젝트에 복사합니다. (커밋은 호출한 쪽에서 함)"""
+    if not project_ids:
+        return
+    rows = db.session.execute(
+        select(Project.id, Project.image_url, Project.image_width, Project.image_height, Project.image_variants)
+        .where(Project.id.in_(project_ids))
+    ).all()
+    keys = {key_from_url(row.image_url) for row in rows} - {None}
+    images = {}
+    if keys:
+        images = {
+            key: (width, height, variant_urls(variants))
+            for key, width, height, variants in db.session.execute(
+                select(UploadedImage.blob_key, UploadedImage.width, UploadedImage.height, UploadedImage.variants)
+                .where(UploadedImage.blob_key.in_(keys), UploadedImage.status == 'ready')
+            )
+        }
+
+    updates = []
+    for row in rows:
+        values = images.get(key_from_url(row.image_url), (None, None, None))
+        if values != (row.image_width, row.image_height, row.image_variants):
+            updates.append({'id': row.id, 'image_width': values[0], 'image_height': values[1], 'image_variants': values[2]})
+    if updates:
+        db.session.execute(update(Project), updates)
+
+
+def pick_variants(variants, names):
+    """화면에 필요한 변형만 남깁니다."""
+    if not variants:
+        return variants
+    return {name: variants[name] for name in names if name in variants}
+
+
+class ImageProcessor:
+    """업로드 이미지 변환을 요청 경로 밖의 프로세스 풀에서 실행하고, 끝나면 결과를 저장합니다. (워커 프로세스별)
+
+    풀은 처음 변환할 때 만듭니다. 자식 프로세스가 죽어 풀이 깨지면 다음 작업에서 새로 만들며,
+    끝나지 못한 이미지는 pending/failed 로 남으므로 `flask user process-images` 로 다시 변환합니다.
+    """
+
+    def __init__(self, app, processes=1):
+        self.app = app
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = image_process_pool(self.processes)
+            return self._pool
+
+    def _reset_pool(self, pool):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False)
+
+    def submit(self, jobs):
+        """{이미지 id: 저장소 키} 의 변환을 풀에 넘깁니다."""
+        for image_id, key in jobs.items():
+            pool = self._get_pool()
+            try:
+                future = submit_render(pool, key)
+            except BrokenProcessPool:
+                self._reset_pool(pool)
+                pool = self._get_pool()
+                future = submit_render(pool, key)
+            future.add_done_callback(lambda done, image_id=image_id, pool=pool: self._finish(image_id, pool, done))
+
+    def _finish(self, image_id, pool, future):
+        with self.app.app_context():
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                self._reset_pool(pool)
+                result = None
+            except Exception as e:
+                logger.error(f"Error processing image {image_id}: {str(e)}")
+                result = None
+            try:
+                record_image_variants(image_id, result)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error recording image variants {image_id}: {str(e)}")
+
+
+def init_image_processor(app):
+    app.extensions['image_processor'] = ImageProcessor(app, app.config['IMAGE_PROCESSING_PROCESSES'])
+
+
+def schedule_image_processing(image):
+    """커밋된 뒤에 이미지 변환을 시작하도록 예약합니다. (after_commit 에서는 SQL 을 실행할 수 없으므로 저장소 키를 함께 보관)"""
+    db.session.info.setdefault(PENDING_IMAGE_JOBS, {})[image.id] = image.blob_key
+
+
+@event.listens_for(Session, 'after_commit')
+def _start_image_processing(session):
+    pending = session.info.pop(PENDING_IMAGE_JOBS, None)
+    processor = current_app.extensions.get('image_processor') if pending else None
+    if processor is not None:
+        try:
+            processor.submit(pending)
+        except Exception as e:
+            # 변환은 나중에 다시 할 수 있으므로 요청은 실패시키지 않음
+            logger.error(f"Error scheduling image processing: {str(e)}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_image_processing(session, previous_transaction):
+    session.info.pop(PENDING_IMAGE_JOBS, None)
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+from flask import Request, current_app
+from sqlalchemy import select
+from extensions import db
+from models import UploadedImage
+from services.blob_storage import HashingFile, blob_url, store_file
+from services.image_processing import schedule_image_processing
+
+# libmagic 이 설치되어 있으면 사용하고, 없으면 파일 시그니처로 형식을 판별
+try:
+    import magic
+except ImportError:
+    magic = None
+
+# 허용하는 이미지 형식 -> 저장할 확장자
+IMAGE_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp'
+}
+SNIFF_BYTES = 2048  # 형식 판별에 읽는 앞부분 크기
+COPY_CHUNK_SIZE = 64 * 1024
+UPLOAD_TMP_DIR = '.tmp'
+
+
+class ImageUploadError(ValueError):
+    """저장할 수 없는 업로드 파일입니다. (빈 파일, 허용하지 않는 형식, 너무 큰 파일)"""
+
+
+def upload_tmp_folder():
+    """업로드 중인 파일을 두는 폴더입니다. 저장할 때 rename 만 하도록 UPLOAD_FOLDER 안에 둡니다."""
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], UPLOAD_TMP_DIR)
+
+
+class UploadRequest(Request):
+    """multipart 파일 파트를 메모리에 모으지 않고 업로드 폴더의 임시 파일에 바로 쓰는 요청 클래스입니다.
+
+    werkzeug 의 multipart 파서가 WSGI 입력을 고정 크기 버퍼로 읽어 이 파일에 이어 쓰며,
+    쓰는 동안 SHA-256 을 계산해 저장소 키를 만들 때 파일을 다시 읽지 않습니다.
+    저장되지 않은 임시 파일은 요청이 끝날 때 지웁니다.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = tempfile.NamedTemporaryFile('wb+', dir=upload_tmp_folder(), prefix='upload-', delete=False)
+        self.__dict__.setdefault('_upload_tmp_paths', []).append(stream.name)
+        return HashingFile(stream)
+
+    def close(self):
+        super().close()
+        for path in self.__dict__.pop('_upload_tmp_paths', ()):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+def sniff_image_type(head):
+    """파일 앞부분으로 이미지 MIME 타입을 판별합니다. 이미지가 아니면 None 입니다."""
+    if magic is not None:
+        content_type = magic.from_buffer(head, mime=True)
+        return content_type if content_type in IMAGE_TYPES else None
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def save_uploaded_image(user_id, file):
+    """업로드된 파일의 형식을 확인해 저장소에 저장하고 UploadedImage 를 반환합니다. (커밋은 호출한 쪽에서 함)
+
+    파일은 내용의 SHA-256 으로 저장하므로 같은 이미지를 다시 올리면 새 파일을 만들지 않고,
+    이미 변환한 이미지이면 변환 결과도 그대로 씁니다.
+    """
+    stream = file.stream
+    head = stream.read(SNIFF_BYTES)
+    if not head:
+        raise ImageUploadError('Empty file')
+    content_type = sniff_image_type(head)
+    if content_type is None:
+        raise ImageUploadError(f'Unsupported image type (allowed: {", ".join(IMAGE_TYPES)})')
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    max_size = current_app.config['IMAGE_UPLOAD_MAX_SIZE']
+    if size > max_size:
+        raise ImageUploadError(f'Image must be at most {max_size // (1024 * 1024)}MB')
+
+    extension = IMAGE_TYPES[content_type]
+    if isinstance(stream, HashingFile):
+        # UploadRequest 가 받은 임시 파일은 받으면서 구한 해시로 바로 저장 (로컬 저장소는 rename 만 함)
+        stream.flush()
+        key = store_file(stream.name, extension, content_type, digest=stream.sha256.hexdigest())
+    else:
+        stream.seek(0)
+        with tempfile.NamedTemporaryFile('wb', dir=upload_tmp_folder(), prefix='upload-', delete=False) as f:
+            shutil.copyfileobj(stream, f, COPY_CHUNK_SIZE)
+        try:
+            key = store_file(f.name, extension, content_type)
+        finally:
+            if os.path.exists(f.name):
+                os.unlink(f.name)
+
+    image = UploadedImage(user_id=user_id, blob_key=key, content_type=content_type, size=size)
+    processed = db.session.execute(
+        select(UploadedImage.width, UploadedImage.height, UploadedImage.variants)
+        .where(UploadedImage.blob_key == key, UploadedImage.status == 'ready')
+        .limit(1)
+    ).first()
+    if processed is not None:
+        image.status, image.width, image.height, image.variants = 'ready', *processed
+    db.session.add(image)
+    db.session.flush()
+    if processed is None:
+        # 크기별 변형은 커밋된 뒤 프로세스 풀에서 만듦
+        schedule_image_processing(image)
+    return image
+
+
+def image_urls(user_id, image_ids):
+    """사용자가 올린 이미지 id 목록을 {id: URL} 로 바꿉니다. 다른 사용자의 이미지는 포함하지 않습니다."""
+    rows = db.session.execute(
+        select(UploadedImage.id, UploadedImage.blob_key)
+        .where(UploadedImage.user_id == user_id, UploadedImage.id.in_(set(image_ids)))
+    ).all()
+    return {image_id: blob_url(key) for image_id, key in rows}
@@ -0,0 +1,246 @@
+import logging
+import select
+import threading
+import time
+from flask import current_app, Response, stream_with_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from extensions import db
+from json_provider import dumps as json_dumps
+from models import NotificationEvent
+
+logger = logging.getLogger(__name__)
+
+PENDING_NOTIFICATIONS = 'pending_notifications'
+SSE_MIMETYPE = 'text/event-stream'
+
+
+class StreamLimitReached(Exception):
+    """이 워커의 SSE 연결이 가득 찼습니다. status_code 와 retry_after(초)로 응답합니다."""
+    status_code = 503
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Subscription:
+    """한 SSE 연결의 구독입니다. 새 알림이 커밋되면 깨어납니다."""
+
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self._wakeup = threading.Event()
+
+    def notify(self):
+        self._wakeup.set()
+
+    def wait(self, timeout):
+        """새 알림 신호를 최대 timeout 초 기다립니다. 신호를 받으면 True 를 반환합니다."""
+        fired = self._wakeup.wait(timeout)
+        self._wakeup.clear()
+        return fired
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class NotificationBroker:
+    """프로세스 내 pub/sub 입니다.
+
+    알림 내용은 notification_event 테이블에서 id 순서로 읽으므로, 구독자에게는 "새 알림이 있음" 신호만 보냅니다.
+    신호가 합쳐지거나 유실돼도 다음에 테이블을 읽을 때 빠짐없이 전달됩니다.
+    """
+
+    def __init__(self, max_streams=None):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._bridge = None
+        # 연결마다 워커 스레드를 하나씩 붙잡으므로, 일반 요청용 스레드가 남도록 동시 구독 수를 제한
+        self._max_streams = max_streams
+        self._streams = 0
+
+    def subscribe(self, user_id):
+        """구독을 만듭니다. 동시 구독 수가 max_streams 에 이르렀으면 None 을 반환합니다."""
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            if self._max_streams is not None and self._streams >= self._max_streams:
+                return None
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            self._streams += 1
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._streams -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.user_id]
+
+    def publish(self, user_id):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscription in subscribers:
+            subscription.notify()
+
+    def ensure_bridge(self, engine, channel):
+        """PostgreSQL 이면 다른 워커의 알림을 받는 LISTEN 스레드를 (프로세스당 한 번) 시작합니다.
+
+        gunicorn 이 fork 한 뒤에 시작되도록 첫 구독 시점에 호출합니다.
+        """
+        if engine.dialect.name != 'postgresql':
+            return
+        with self._lock:
+            if self._bridge is None or not self._bridge.is_alive():
+                self._bridge = PostgresNotificationBridge(engine, self, channel)
+                self._bridge.start()
+
+
+class PostgresNotificationBridge(threading.Thread):
+    """LISTEN 전용 연결로 NOTIFY 를 받아 이 프로세스의 구독자에게 전달합니다. 연결이 끊기면 다시 연결합니다."""
+
+    def __init__(self, engine, broker, channel):
+        super().__init__(name='notification-listener', daemon=True)
+        self.engine = engine
+        self.broker = broker
+        self.channel = channel
+
+    def run(self):
+        backoff = 1
+        while True:
+            try:
+                self._listen()
+            except Exception as e:
+                logger.warning(f'알림 LISTEN 연결 오류, {backoff}초 후 재시도: {e}')
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _listen(self):
+        connection = self.engine.raw_connection()
+        # 풀 크기에 포함되지 않도록 전용 연결로 분리
+        connection.detach()
+        try:
+            dbapi_connection = connection.driver_connection
+            dbapi_connection.autocommit = True
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                if select.select([dbapi_connection], [], [], 30) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    user_id, _, _ = notify.payload.partition(':')
+                    self.broker.publish(int(user_id))
+        finally:
+            connection.close()
+
+
+def init_notifications(app):
+    app.extensions['notifications'] = NotificationBroker(max_streams=app.config['SSE_MAX_STREAMS'])
+
+
+def get_broker():
+    return current_app.extensions['notifications']
+
+
+def publish(user_id, event_type, payload):
+    """알림 이벤트를 현재 트랜잭션에 기록합니다. 커밋되면 해당 사용자의 SSE 스트림으로 전달됩니다."""
+    user_id = int(user_id)
+    notification = NotificationEvent(user_id=user_id, event_type=event_type, payload=payload)
+    db.session.add(notification)
+    if db.engine.dialect.name == 'postgresql':
+        db.session.flush()
+        # NOTIFY 는 커밋될 때 모든 워커의 LISTEN 연결로 전달되고, 롤백되면 버려짐
+        db.session.execute(text('SELECT pg_notify(:channel, :payload)'), {
+            'channel': current_app.config['NOTIFICATION_CHANNEL'],
+            'payload': f'{user_id}:{notification.id}'
+        })
+    else:
+        db.session.info.setdefault(PENDING_NOTIFICATIONS, set()).add(user_id)
+    return notification
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_notifications(session):
+    # PostgreSQL 이 아닌 경우(단일 프로세스 개발 환경) 커밋 후 같은 프로세스의 구독자에게만 전달
+    pending = session.info.pop(PENDING_NOTIFICATIONS, None)
+    broker = current_app.extensions.get('notifications') if pending else None
+    if broker is not None:
+        for user_id in pending:
+            broker.publish(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_notifications(session, previous_transaction):
+    session.info.pop(PENDING_NOTIFICATIONS, None)
+
+
+def latest_event_id(user_id):
+    return db.session.query(db.func.max(NotificationEvent.id)).filter(NotificationEvent.user_id == user_id).scalar() or 0
+
+
+def fetch_events(user_id, after_id, limit):
+    """after_id 이후의 알림을 id 순서로 읽습니다. 긴 연결이 DB 연결을 붙잡지 않도록 읽은 뒤 세션을 닫습니다."""
+    try:
+        return db.session.query(NotificationEvent.id, NotificationEvent.event_type, NotificationEvent.payload) \
+            .filter(NotificationEvent.user_id == user_id, NotificationEvent.id > after_id) \
+            .order_by(NotificationEvent.id) \
+            .limit(limit).all()
+    finally:
+        db.session.close()
+
+
+def format_event(row):
+    return f'id: {row.id}\nevent: {row.event_type}\ndata: {json_dumps(row.payload)}\n\n'
+
+
+def event_stream(user_id, last_event_id=None):
+    """사용자의 알림을 보내는 SSE 응답을 만듭니다.
+
+    last_event_id 가 있으면 그 이후의 알림부터, 없으면 연결한 뒤 발생한 알림부터 보냅니다.
+    연결은 SSE_MAX_DURATION 초 뒤 닫히며, 브라우저는 Last-Event-ID 를 붙여 자동으로 다시 연결합니다.
+    이 워커의 연결 수가 SSE_MAX_STREAMS 에 이르렀으면 StreamLimitReached 를 발생시킵니다.
+    """
+    config = current_app.config
+    broker = get_broker()
+    broker.ensure_bridge(db.engine, config['NOTIFICATION_CHANNEL'])
+    # 처음 읽기 전에 구독해야 그 사이에 커밋된 알림 신호를 놓치지 않음
+    subscription = broker.subscribe(user_id)
+    if subscription is None:
+        raise StreamLimitReached('Too many notification streams', retry_after=config['SSE_BUSY_RETRY_AFTER'])
+    try:
+        if last_event_id is None:
+            last_event_id = latest_event_id(user_id)
+    except Exception:
+        subscription.close()
+        raise
+
+    def generate():
+        last_id = last_event_id
+        batch_size = config['SSE_BATCH_SIZE']
+        deadline = time.monotonic() + config['SSE_MAX_DURATION']
+        yield f"retry: {config['SSE_RETRY_MS']}\n\n"
+        while time.monotonic() < deadline:
+            rows = fetch_events(user_id, last_id, batch_size)
+            for row in rows:
+                yield format_event(row)
+                last_id = row.id
+            if len(rows) == batch_size:
+                continue
+            if not subscription.wait(config['SSE_HEARTBEAT_INTERVAL']):
+                # 프록시/로드밸런서가 유휴 연결을 끊지 않도록 주석 줄 전송
+                yield ': keep-alive\n\n'
+
+    response = Response(stream_with_context(generate()), mimetype=SSE_MIMETYPE)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(subscription.close)
+    return response
+
+
+def prune_events(before):
+    """before 이전에 만들어진 알림을 삭제하고 삭제한 개수를 반환합니다."""
+    return NotificationEvent.query.filter(NotificationEvent.created_at < before).delete(synchronize_session=False)
@@ -0,0 +1,60 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    """잘못된 페이지 커서입니다."""
+
+
+def encode_cursor(last_id):
+    """마지막으로 반환한 행의 키를 불투명한 커서 문자열로 인코딩합니다."""
+    raw = json.dumps({'id': last_id}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """커서 문자열을 마지막 행의 키로 디코딩합니다."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        last_id = payload['id']
+    except (ValueError, KeyError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursor('Invalid cursor')
+    return last_id
+
+
+def parse_page_args(args, default_size, max_size):
+    """요청 파라미터에서 (limit, after) 를 읽습니다. limit 은 서버 최대값으로 제한됩니다."""
+    raw_limit = args.get('limit')
+    if raw_limit in (None, ''):
+        limit = default_size
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise InvalidCursor('limit must be an integer')
+        if limit < 1:
+            raise InvalidCursor('limit must be positive')
+    limit = min(limit, max_size)
+
+    after = args.get('after')
+    last_id = decode_cursor(after) if after else None
+    return limit, last_id
+
+
+def seek_page(query, key_column, limit, last_id=None):
+    """OFFSET 대신 키 비교(seek) 조건으로 다음 페이지를 조회합니다.
+
+    limit + 1 개를 읽어 다음 페이지 존재 여부를 판단하고 (rows, next_cursor) 를 반환합니다.
+    """
+    if last_id is not None:
+        query = query.filter(key_column > last_id)
+    rows = query.order_by(key_column).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key_column.key))
+    return rows, next_cursor
@@ -0,0 +1,196 @@
+import multiprocessing
+import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app
+from werkzeug.security import check_password_hash as werkzeug_check_password_hash
+from extensions import bcrypt
+
+BCRYPT_PREFIXES = ('$2a$', '$2b$', '$2y$')
+
+
+class PasswordHashingUnavailable(Exception):
+    """비밀번호 해싱을 지금 처리할 수 없습니다. status_code 와 retry_after(초)로 응답합니다."""
+    status_code = 503
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PasswordHashingBusy(PasswordHashingUnavailable):
+    """대기열이 가득 차서 해싱 요청을 받지 않았습니다."""
+    status_code = 429
+
+
+class PasswordHashingTimeout(PasswordHashingUnavailable):
+    """대기열에서 제한 시간 안에 차례가 오지 않았습니다."""
+    status_code = 503
+
+
+class HashingStats:
+    """해싱 작업의 대기/실행 시간과 거절 횟수를 모읍니다. (워커 프로세스별 값)"""
+
+    def __init__(self):
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hash_total = 0.0
+        self.hash_max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait, duration):
+        with self._lock:
+            self.completed += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.hash_total += duration
+            self.hash_max = max(self.hash_max, duration)
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'wait_avg_ms': round(self.wait_total / completed * 1000, 2),
+                'wait_max_ms': round(self.wait_max * 1000, 2),
+                'hash_avg_ms': round(self.hash_total / completed * 1000, 2),
+                'hash_max_ms': round(self.hash_max * 1000, 2)
+            }
+
+
+class PasswordHasher:
+    """비밀번호 해싱 전용 스레드 풀입니다.
+
+    해싱은 GIL 을 놓고 실행되지만 CPU 를 오래 쓰므로, 동시에 실행하는 수(workers)와
+    기다리는 수(queue_size)를 제한해서 로그인이 몰려도 다른 요청 스레드가 막히지 않게 합니다.
+    대기열이 가득 차면 바로 PasswordHashingBusy, 제한 시간 안에 끝나지 않으면
+    PasswordHashingTimeout 을 발생시킵니다.
+    """
+
+    def __init__(self, workers=2, queue_size=8, timeout=5):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self.stats = HashingStats()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.stats.count('rejected')
+                raise PasswordHashingBusy('Too many password hashing requests', retry_after=1)
+            self._pending += 1
+
+        queued_at = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            result = fn(*args)
+            self.stats.record(started - queued_at, time.perf_counter() - started)
+            return result
+
+        future = self._executor.submit(job)
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # 아직 대기 중이면 취소하고, 이미 실행 중이면 끝날 때까지 자리를 차지함
+            future.cancel()
+            self.stats.count('timed_out')
+            raise PasswordHashingTimeout('Password hashing timed out', retry_after=self.timeout)
+
+
+def init_password_hasher(app):
+    app.extensions['password_hasher'] = PasswordHasher(
+        app.config['PASSWORD_HASH_WORKERS'],
+        app.config['PASSWORD_HASH_QUEUE_SIZE'],
+        app.config['PASSWORD_HASH_TIMEOUT']
+    )
+
+
+def get_password_hasher():
+    return current_app.extensions['password_hasher']
+
+
+def validate_password(password):
+    """비밀번호 유효성 검사"""
+    if len(password) < 8:
+        return False
+    if not re.search(r"[A-Za-z]", password):
+        return False
+    if not re.search(r"\d", password):
+        return False
+    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        return False
+    return True
+
+
+def _generate(password, rounds):
+    return bcrypt.generate_password_hash(password, rounds).decode('utf-8')
+
+
+def hashing_process_pool(processes=None):
+    """대량 가져오기에서 비밀번호를 병렬로 해싱할 프로세스 풀을 만듭니다.
+
+    요청 스레드가 있는 워커 프로세스에서 fork 하지 않도록 spawn 으로 시작합니다.
+    """
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+
+
+def submit_hashes(pool, passwords, rounds):
+    """비밀번호 목록의 해싱을 프로세스 풀에 넘기고 같은 순서의 Future 목록을 반환합니다."""
+    return [pool.submit(_generate, password, rounds) for password in passwords]
+
+
+def _verify(password_hash, password):
+    if password_hash.startswith(BCRYPT_PREFIXES):
+        return bcrypt.check_password_hash(password_hash, password)
+    # 이전 models.py 에서 werkzeug(pbkdf2/scrypt)로 저장한 비밀번호
+    return werkzeug_check_password_hash(password_hash, password)
+
+
+def hash_password(password):
+    """설정된 work factor(BCRYPT_LOG_ROUNDS)로 비밀번호를 해싱합니다."""
+    return get_password_hasher().run(_generate, password, current_app.config['BCRYPT_LOG_ROUNDS'])
+
+
+def verify_password(password_hash, password):
+    """저장된 해시(bcrypt 또는 werkzeug)와 비밀번호가 일치하는지 확인합니다."""
+    if not password_hash:
+        return False
+    try:
+        return get_password_hasher().run(_verify, password_hash, password)
+    except ValueError:
+        # 알 수 없는 해시 형식
+        return False
+
+
+def needs_rehash(password_hash):
+    """bcrypt 가 아니거나 현재 설정과 다른 cost 로 저장된 해시인지 확인합니다."""
+    if not password_hash or not password_hash.startswith(BCRYPT_PREFIXES):
+        return True
+    try:
+        rounds = int(password_hash[4:6])
+    except ValueError:
+        return True
+    return rounds != current_app.config['BCRYPT_LOG_ROUNDS']
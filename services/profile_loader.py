@@ -0,0 +1,57 @@
+from extensions import db
+from models import WorkExperience, Project, Education, Award, Certificate, Skill, user_skills
+from services.serializers import WORK_EXPERIENCE, PROJECT, EDUCATION, AWARD, CERTIFICATE, SKILL
+
+# 사용자별로 묶어서 가져올 이력 섹션 (응답 키, 모델, 직렬화기)
+PROFILE_SECTIONS = (
+    ('work_experiences', WorkExperience, WORK_EXPERIENCE),
+    ('projects', Project, PROJECT),
+    ('education', Education, EDUCATION),
+    ('awards', Award, AWARD),
+    ('certificates', Certificate, CERTIFICATE),
+)
+
+
+def _empty_bundle():
+    bundle = {key: [] for key, _, _ in PROFILE_SECTIONS}
+    bundle['skills'] = []
+    return bundle
+
+
+def load_profile_bundles(user_ids):
+    """여러 사용자의 이력 데이터를 테이블당 한 번의 쿼리로 조회해 사용자별로 묶어 반환합니다.
+
+    반환값은 {user_id: {'work_experiences': [...], 'projects': [...], ..., 'skills': [...]}}
+    형태이며, 각 항목은 응답 형식의 dict 입니다. 사용자 수와 관계없이 쿼리 수는
+    섹션 수 + 1(기술 스택)로 고정됩니다.
+    """
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    bundles = {user_id: _empty_bundle() for user_id in user_ids}
+    if not user_ids:
+        return bundles
+
+    for key, model, schema in PROFILE_SECTIONS:
+        # ORM 객체 대신 필요한 컬럼만 튜플로 읽고, 마지막 컬럼(user_id)으로 묶음
+        rows = db.session.query(*schema.columns, model.user_id) \
+            .filter(model.user_id.in_(user_ids)) \
+            .order_by(model.user_id, model.id) \
+            .all()
+        serialize = schema.serialize
+        for row in rows:
+            bundles[row[-1]][key].append(serialize(row))
+
+    # 기술 스택은 연결 테이블과 조인해 한 번에 조회
+    skill_rows = db.session.query(*SKILL.columns, user_skills.c.user_id) \
+        .join(user_skills, Skill.id == user_skills.c.skill_id) \
+        .filter(user_skills.c.user_id.in_(user_ids)) \
+        .order_by(user_skills.c.user_id, Skill.id) \
+        .all()
+    for row in skill_rows:
+        bundles[row[-1]]['skills'].append(SKILL.serialize(row))
+
+    return bundles
+
+
+def load_profile_bundle(user_id):
+    """단일 사용자의 이력 데이터를 조회합니다."""
+    return load_profile_bundles([user_id])[int(user_id)]
@@ -0,0 +1,23 @@
+from services.student_card import rebuild_student_cards
+from services.search import index_students
+from services.facets import refresh_student_facets
+from services.ranking import changed_student_terms, student_terms, update_ranking_rows
+from services.recommendations import refresh_recommendations_for_students
+from services.response_cache import invalidate, user_version, DIRECTORY_VERSION
+
+
+def sync_student_profiles(user_ids):
+    """수료생 프로필이 바뀐 뒤 파생 데이터(수료생 카드, 검색 색인, 필터 집계, 기업별 추천, 응답 캐시)를 갱신합니다.
+
+    이력서/프로필을 수정하는 API 는 커밋 직전에 이 함수를 호출해야 합니다.
+    """
+    # 추천 대상 기업을 고르기 위해 필터 항목을 갱신하기 전의 기술을 먼저 읽어 둠
+    previous_terms = student_terms(user_ids)
+    rebuild_student_cards(user_ids)
+    index_students(user_ids)
+    refresh_student_facets(user_ids)
+    # 추천 행렬은 다시 만들지 않고 커밋 후 바뀐 수료생만 반영
+    changed = changed_student_terms(previous_terms)
+    update_ranking_rows(changed)
+    refresh_recommendations_for_students(previous_terms, changed)
+    invalidate(DIRECTORY_VERSION, *(user_version(user_id) for user_id in user_ids))
@@ -0,0 +1,339 @@
+import logging
+import math
+import threading
+import time
+import numpy as np
+from scipy import sparse
+from flask import current_app
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from extensions import db
+from models import StudentFacet
+from services.response_cache import get_cache, DIRECTORY_VERSION
+
+# 추천 점수에 사용하는 필터 항목 (기술 스택 + 프로젝트 사용 기술)
+RANKING_FACETS = ('skill', 'tech')
+METRICS = ('cosine', 'jaccard')
+PENDING_RANKING_UPDATES = 'ranking_updates'
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_term(value):
+    """'React', ' react ' 처럼 표기만 다른 기술 이름을 같은 항목으로 취급하도록 정규화합니다."""
+    return ' '.join(str(value or '').split()).lower()
+
+
+class SkillMatrix:
+    """수료생 × 기술 희소 행렬과 IDF 가중치입니다.
+
+    한 번 만들어 두면 질의 하나에 대한 전체 수료생의 점수를 희소 행렬-벡터 곱 한 번으로 계산합니다.
+    """
+
+    def __init__(self, user_ids, terms, labels, binary):
+        self.user_ids = np.asarray(user_ids, dtype=np.int64)
+        self.row_of = {int(user_id): index for index, user_id in enumerate(self.user_ids)}
+        self.column_of = {term: index for index, term in enumerate(terms)}
+        self.labels = labels
+        self.binary = sparse.csr_matrix(binary, dtype=np.float64)
+        self.binary.sum_duplicates()
+        self.binary.data[:] = 1.0
+
+        # 드문 기술일수록 큰 가중치 (smooth idf)
+        document_frequency = np.diff(self.binary.tocsc().indptr)
+        self.idf = np.log((1.0 + len(self.user_ids)) / (1.0 + document_frequency)) + 1.0
+        self.weighted = (self.binary @ sparse.diags(self.idf)).tocsr()
+        self.row_weight_sums = np.asarray(self.weighted.sum(axis=1)).ravel()
+        self.row_norms = np.sqrt(np.asarray(self.weighted.multiply(self.weighted).sum(axis=1)).ravel())
+
+    @classmethod
+    def from_memberships(cls, memberships):
+        """(user_id, 기술 이름) 쌍 목록으로 행렬을 만듭니다."""
+        row_of = {}
+        column_of = {}
+        labels = []
+        rows = []
+        columns = []
+        for user_id, value in memberships:
+            term = normalize_term(value)
+            if not term:
+                continue
+            row = row_of.setdefault(user_id, len(row_of))
+            column = column_of.get(term)
+            if column is None:
+                column = column_of[term] = len(labels)
+                labels.append(value)
+            rows.append(row)
+            columns.append(column)
+        binary = sparse.coo_matrix(
+            (np.ones(len(rows)), (np.asarray(rows, dtype=np.int64), np.asarray(columns, dtype=np.int64))),
+            shape=(len(row_of), len(labels))
+        )
+        return cls(list(row_of), list(column_of), labels, binary)
+
+    @classmethod
+    def load(cls):
+        """필터 항목 소속 테이블에서 수료생별 기술을 읽어 행렬을 만듭니다."""
+        # value 는 정규화된 값이므로 표시용 이름(label)을 읽고, 같은 기술인지는 normalize_term 으로 비교
+        memberships = db.session.query(StudentFacet.user_id, func.coalesce(StudentFacet.label, StudentFacet.value)) \
+            .filter(StudentFacet.facet.in_(RANKING_FACETS)) \
+            .order_by(StudentFacet.user_id) \
+            .execution_options(yield_per=10000)
+        return cls.from_memberships(memberships)
+
+    @property
+    def unseen_idf(self):
+        """아직 어떤 수료생도 갖지 않은 기술의 IDF 입니다."""
+        return math.log(1.0 + len(self.user_ids)) + 1.0
+
+    def term_idf(self, term):
+        column = self.column_of.get(term)
+        return float(self.idf[column]) if column is not None else self.unseen_idf
+
+    def query_columns(self, terms):
+        """질의 기술 중 행렬에 있는 열 번호와, 행렬에 없는 기술 개수를 반환합니다."""
+        normalized = {normalize_term(term) for term in terms}
+        normalized.discard('')
+        columns = sorted(self.column_of[term] for term in normalized if term in self.column_of)
+        return np.asarray(columns, dtype=np.int64), len(normalized) - len(columns)
+
+    def scores(self, columns, metric='cosine', unseen=0):
+        """질의 기술 열에 대한 모든 수료생의 점수 배열을 계산합니다.
+
+        unseen 은 행렬에 없는 질의 기술 수로, 겹칠 수는 없지만 질의 벡터의 크기에는 포함됩니다.
+        """
+        query = np.zeros(len(self.labels))
+        query[columns] = self.idf[columns]
+        shared = self.weighted @ query if metric == 'cosine' else self.binary @ query
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if metric == 'cosine':
+                query_norm = math.sqrt(float(query @ query) + unseen * self.unseen_idf ** 2)
+                scores = shared / (self.row_norms * query_norm)
+            else:
+                # IDF 가중 Jaccard: 겹치는 기술 가중치 합 / 합집합 가중치 합
+                query_sum = float(query.sum()) + unseen * self.unseen_idf
+                scores = shared / (self.row_weight_sums + query_sum - shared)
+        return np.nan_to_num(scores, copy=False)
+
+    def score_terms(self, terms, query_terms, metric='cosine'):
+        """수료생 한 명의 기술 목록과 질의 기술 목록의 (점수, 겹치는 기술) 을 계산합니다.
+
+        행렬을 다시 만들지 않고 방금 바뀐 수료생의 점수를 rank() 와 같은 기준으로 구할 때 사용합니다.
+        """
+        student = {}
+        for term in terms:
+            student.setdefault(normalize_term(term), term)
+        student.pop('', None)
+        query = {normalize_term(term) for term in query_terms}
+        query.discard('')
+        shared = student.keys() & query
+        if not shared:
+            return 0.0, []
+
+        idf = {term: self.term_idf(term) for term in student.keys() | query}
+        if metric == 'cosine':
+            score = sum(idf[term] ** 2 for term in shared) / (
+                math.sqrt(sum(idf[term] ** 2 for term in student)) * math.sqrt(sum(idf[term] ** 2 for term in query)))
+        else:
+            shared_weight = sum(idf[term] for term in shared)
+            score = shared_weight / (sum(idf[term] for term in student) + sum(idf[term] for term in query) - shared_weight)
+
+        labels = [self.labels[self.column_of[term]] if term in self.column_of else student[term] for term in shared]
+        return round(score, 6), sorted(labels)
+
+    def rank(self, terms, limit, metric='cosine', candidate_ids=None, exclude_ids=()):
+        """질의 기술 목록과 가장 비슷한 수료생 상위 limit 명을 점수 순으로 반환합니다."""
+        if metric not in METRICS:
+            raise ValueError(f'Unknown ranking metric: {metric}')
+        columns, unseen = self.query_columns(terms)
+        if limit < 1 or not len(columns) or not len(self.user_ids):
+            return []
+
+        scores = self.scores(columns, metric, unseen)
+        if candidate_ids is not None:
+            allowed = np.zeros(len(scores), dtype=bool)
+            allowed[[self.row_of[user_id] for user_id in candidate_ids if user_id in self.row_of]] = True
+            scores[~allowed] = 0.0
+        for user_id in exclude_ids:
+            row = self.row_of.get(user_id)
+            if row is not None:
+                scores[row] = 0.0
+
+        positive = np.flatnonzero(scores > 0)
+        if len(positive) > limit:
+            positive = positive[np.argpartition(-scores[positive], limit - 1)[:limit]]
+        # 점수 내림차순, 같은 점수는 user_id 오름차순
+        top = positive[np.lexsort((self.user_ids[positive], -scores[positive]))]
+
+        results = []
+        for row in top:
+            row_columns = self.binary.indices[self.binary.indptr[row]:self.binary.indptr[row + 1]]
+            matched = np.intersect1d(row_columns, columns, assume_unique=True)
+            results.append({
+                'user_id': int(self.user_ids[row]),
+                'score': round(float(scores[row]), 6),
+                'matching_skills': sorted(self.labels[column] for column in matched)
+            })
+        return results
+
+
+def rank_with_overrides(matrix, terms, limit, overrides, metric='cosine', candidate_ids=None, exclude_ids=()):
+    """행렬로 순위를 구하되, 행렬을 만든 뒤 기술이 바뀐 수료생(overrides: {user_id: [기술]})은
+    새 기술로 점수를 계산해 합칩니다."""
+    excluded = set(exclude_ids)
+    ranked = matrix.rank(terms, limit, metric=metric, candidate_ids=candidate_ids,
+                         exclude_ids=excluded | overrides.keys())
+    allowed = set(candidate_ids) if candidate_ids is not None else None
+    for user_id, student in overrides.items():
+        if user_id in excluded or (allowed is not None and user_id not in allowed):
+            continue
+        score, matching_skills = matrix.score_terms(student, terms, metric)
+        if score > 0:
+            ranked.append({'user_id': user_id, 'score': score, 'matching_skills': matching_skills})
+    ranked.sort(key=lambda item: (-item['score'], item['user_id']))
+    return ranked[:limit]
+
+
+class SkillMatrixCache:
+    """프로세스별 수료생 × 기술 행렬과, 행렬을 만든 뒤 기술이 바뀐 수료생 목록입니다.
+
+    - 처음 한 번만 요청 안에서 만들고, 이후에는 RANKING_MATRIX_TTL 이 지나거나 다른 워커의 변경
+      (DIRECTORY_VERSION) 이 보이면 백그라운드 스레드에서 다시 만듭니다. 다시 만드는 동안에는 이전 행렬을 씁니다.
+    - 이 프로세스에서 커밋한 변경은 행렬을 다시 만들지 않고 overrides 로 바로 반영합니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.matrix = None
+        self.overrides = {}  # {user_id: (기록 시각, [기술])}
+        self.version = None
+        self.built_at = 0.0
+        self._rebuilding = False
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def snapshot(self):
+        """(행렬, {user_id: [기술]}) 을 반환합니다."""
+        if self.matrix is None:
+            with self._build_lock:
+                if self.matrix is None:
+                    self._build()
+        else:
+            self._refresh_if_stale()
+        with self._lock:
+            return self.matrix, {user_id: terms for user_id, (_, terms) in self.overrides.items()}
+
+    def record(self, changed):
+        """커밋된 수료생 기술 변경을 반영합니다."""
+        now = time.monotonic()
+        with self._lock:
+            for user_id, terms in changed.items():
+                self.overrides[int(user_id)] = (now, list(terms))
+
+    def _refresh_if_stale(self):
+        now = time.monotonic()
+        config = self.app.config
+        expired = self.built_at <= now - config['RANKING_MATRIX_TTL']
+        changed_elsewhere = self.built_at <= now - config['RANKING_MATRIX_MIN_REFRESH'] \
+            and get_cache().get_version(DIRECTORY_VERSION) != self.version
+        if not (expired or changed_elsewhere):
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name='skill-matrix-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            with self.app.app_context():
+                self._build()
+        except Exception as e:
+            logger.error(f"Error rebuilding skill matrix: {str(e)}")
+        finally:
+            self._rebuilding = False
+
+    def _build(self):
+        # 읽기 시작 전에 커밋된 변경은 새 행렬에 포함되므로 그 이후 기록된 overrides 만 남김
+        started = time.monotonic()
+        version = get_cache().get_version(DIRECTORY_VERSION)
+        matrix = SkillMatrix.load()
+        with self._lock:
+            self.matrix = matrix
+            self.version = version
+            self.built_at = started
+            self.overrides = {user_id: entry for user_id, entry in self.overrides.items() if entry[0] >= started}
+
+
+def _matrix_cache():
+    cache = current_app.extensions.get('skill_matrix')
+    if cache is None:
+        cache = current_app.extensions.setdefault('skill_matrix', SkillMatrixCache(current_app._get_current_object()))
+    return cache
+
+
+def ranking_snapshot():
+    """현재 행렬과 행렬에 아직 반영되지 않은 수료생별 기술 {user_id: [기술]} 을 반환합니다."""
+    return _matrix_cache().snapshot()
+
+
+def get_skill_matrix():
+    """현재 프로세스의 수료생 × 기술 행렬을 반환합니다. (최근 바뀐 수료생은 ranking_snapshot 의 overrides 참고)"""
+    return ranking_snapshot()[0]
+
+
+def changed_student_terms(previous_terms):
+    """변경 전 student_terms() 결과와 지금 기술을 비교해, 기술이 바뀐 수료생의 {user_id: [기술]} 을 반환합니다."""
+    current_terms = student_terms(previous_terms)
+    return {user_id: terms for user_id, terms in current_terms.items()
+            if {normalize_term(term) for term in terms} - {''}
+            != {normalize_term(term) for term in previous_terms[user_id]} - {''}}
+
+
+def update_ranking_rows(changed):
+    """현재 트랜잭션이 커밋되면 이 프로세스의 행렬에 수료생 기술 변경을 반영하도록 예약합니다."""
+    if changed:
+        db.session.info.setdefault(PENDING_RANKING_UPDATES, {}).update(changed)
+
+
+@event.listens_for(Session, 'after_commit')
+def _apply_pending_ranking_updates(session):
+    changed = session.info.pop(PENDING_RANKING_UPDATES, None)
+    cache = current_app.extensions.get('skill_matrix') if changed else None
+    if cache is not None:
+        cache.record(changed)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_ranking_updates(session, previous_transaction):
+    session.info.pop(PENDING_RANKING_UPDATES, None)
+
+
+def student_terms(user_ids):
+    """수료생별 추천용 기술 목록을 {user_id: [기술]} 로 반환합니다. (기술이 없는 수료생도 빈 목록으로 포함)"""
+    terms = {int(user_id): [] for user_id in user_ids}
+    if terms:
+        rows = db.session.query(StudentFacet.user_id, func.coalesce(StudentFacet.label, StudentFacet.value)) \
+            .filter(StudentFacet.user_id.in_(list(terms)), StudentFacet.facet.in_(RANKING_FACETS))
+        for user_id, value in rows:
+            terms[user_id].append(value)
+    return terms
+
+
+def query_terms_for(user):
+    """추천 질의로 사용할 기술 목록입니다. 기업 회원은 요구 기술, 수료생은 본인 기술/프로젝트 사용 기술입니다."""
+    if user.user_type == 'company':
+        return user.required_skills or []
+    return student_terms([user.id])[user.id]
+
+
+def rank_students(terms, limit, candidate_ids=None, exclude_ids=()):
+    """기술 목록과 비슷한 수료생 상위 limit 명을 [{user_id, score, matching_skills}] 로 반환합니다."""
+    matrix, overrides = ranking_snapshot()
+    return rank_with_overrides(
+        matrix, terms, limit, overrides,
+        metric=current_app.config['RANKING_METRIC'],
+        candidate_ids=candidate_ids,
+        exclude_ids=exclude_ids
+    )
@@ -0,0 +1,138 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select
+from extensions import db
+from models import User, StudentCard, CompanyRecommendation, CompanyRecommendationSet, CompanyRequiredSkill
+from services.facets import apply_facet_filters
+from services.ranking import normalize_term, rank_with_overrides, ranking_snapshot
+from services.response_cache import invalidate, user_version
+from services.student_card import load_card_documents
+
+
+def _normalized(terms):
+    return {normalize_term(term) for term in terms} - {''}
+
+
+def company_requirements(company_ids=None):
+    """기업별 요구 기술 목록을 {company_id: [기술]} 로 반환합니다. (요구 기술이 없는 기업도 빈 목록으로 포함)"""
+    query = db.session.query(User.id, User.required_skills).filter(User.user_type == 'company')
+    if company_ids is not None:
+        query = query.filter(User.id.in_(company_ids))
+    return {company_id: required or [] for company_id, required in query}
+
+
+def set_required_skills(company, skills):
+    """기업 요구 기술을 저장하고, 수료생 변경 시 대상 기업을 찾는 정규화된 기술 목록도 맞춰 둡니다."""
+    company.required_skills = skills
+    CompanyRequiredSkill.query.filter_by(company_id=company.id).delete(synchronize_session=False)
+    terms = _normalized(skills)
+    if terms:
+        db.session.execute(CompanyRequiredSkill.__table__.insert(),
+                           [{'company_id': company.id, 'term': term[:100]} for term in terms])
+
+
+def companies_requiring(terms):
+    """주어진 기술 중 하나라도 요구하는 기업의 요구 기술을 {company_id: [기술]} 로 반환합니다."""
+    terms = [term[:100] for term in terms]
+    if not terms:
+        return {}
+    return company_requirements(select(CompanyRequiredSkill.company_id).where(CompanyRequiredSkill.term.in_(terms)))
+
+
+def _rank_company(matrix, required, overrides):
+    """행렬로 나머지 수료생의 순위를 구하고, 행렬을 만든 뒤 바뀐 수료생은 새 기술로 점수를 계산해 합칩니다."""
+    return rank_with_overrides(matrix, required, current_app.config['RECOMMENDATION_TOP_N'], overrides,
+                               metric=current_app.config['RANKING_METRIC'])
+
+
+def _store(company_id, ranked, now, rebuilt=False):
+    CompanyRecommendation.query.filter_by(company_id=company_id).delete(synchronize_session=False)
+    if ranked:
+        db.session.execute(CompanyRecommendation.__table__.insert(), [{
+            'company_id': company_id,
+            'student_id': item['user_id'],
+            'rank': rank,
+            'score': item['score'],
+            'matching_skills': item['matching_skills']
+        } for rank, item in enumerate(ranked, 1)])
+
+    state = db.session.get(CompanyRecommendationSet, company_id)
+    if state is None:
+        state = CompanyRecommendationSet(company_id=company_id)
+        db.session.add(state)
+    state.computed_at = now
+    if rebuilt:
+        state.rebuilt_at = now
+    invalidate(user_version(company_id))
+
+
+def refresh_company_recommendations(company_ids, matrix=None, rebuilt=False):
+    """주어진 기업들의 추천 목록을 다시 계산해 현재 세션에 반영합니다."""
+    company_ids = list(dict.fromkeys(int(company_id) for company_id in company_ids))
+    if not company_ids:
+        return 0
+
+    db.session.flush()
+    if matrix is not None:
+        overrides = {}
+    else:
+        matrix, overrides = ranking_snapshot()
+    now = datetime.utcnow()
+    requirements = company_requirements(company_ids)
+    for company_id, required in requirements.items():
+        _store(company_id, _rank_company(matrix, required, overrides), now, rebuilt)
+    return len(requirements)
+
+
+def refresh_recommendations_for_students(previous_terms, changed):
+    """수료생 기술이 바뀐 뒤, 바뀌기 전 또는 후의 기술을 요구하는 기업의 추천 목록만 다시 계산합니다.
+
+    previous_terms 는 변경 전에 읽어 둔 student_terms() 결과, changed 는 기술이 바뀐 수료생의 지금 기술입니다.
+    대상 기업은 요구 기술 색인(company_required_skill)에서 찾고, 행렬은 다시 만들지 않습니다.
+    """
+    touched = set()
+    for user_id, terms in changed.items():
+        touched |= _normalized(previous_terms[user_id]) | _normalized(terms)
+    requirements = companies_requiring(touched)
+    if not requirements:
+        return 0
+
+    matrix, overrides = ranking_snapshot()
+    overrides.update(changed)
+    now = datetime.utcnow()
+    for company_id, required in requirements.items():
+        _store(company_id, _rank_company(matrix, required, overrides), now)
+    return len(requirements)
+
+
+def recommended_students(company_id, limit, filters=None):
+    """저장된 추천 목록을 순위대로 읽어 수료생 목록 항목으로 반환합니다. 각 항목에 match_score, matching_skills 가 추가됩니다."""
+    query = db.session.query(
+        User.id.label('id'),
+        StudentCard.document.label('document'),
+        CompanyRecommendation.score,
+        CompanyRecommendation.matching_skills
+    ).join(CompanyRecommendation, CompanyRecommendation.student_id == User.id) \
+        .outerjoin(StudentCard, StudentCard.user_id == User.id) \
+        .filter(CompanyRecommendation.company_id == company_id, User.user_type == 'student')
+    if filters:
+        query = apply_facet_filters(query, filters)
+    rows = query.order_by(CompanyRecommendation.rank).limit(limit).all()
+
+    documents = {document['user']['id']: document for document in load_card_documents(rows)}
+    return [dict(documents[row.id], match_score=row.score, matching_skills=row.matching_skills)
+            for row in rows if row.id in documents]
+
+
+def recommendation_freshness(company_id):
+    """추천 목록의 계산 시각과 경과 시간을 반환합니다. 한 번도 계산되지 않았거나 너무 오래됐으면 stale 입니다."""
+    state = db.session.get(CompanyRecommendationSet, company_id)
+    if state is None:
+        return {'computed_at': None, 'rebuilt_at': None, 'age_seconds': None, 'stale': True}
+    age = (datetime.utcnow() - state.computed_at).total_seconds()
+    return {
+        'computed_at': state.computed_at,
+        'rebuilt_at': state.rebuilt_at,
+        'age_seconds': int(age),
+        'stale': age > current_app.config['RECOMMENDATION_MAX_AGE']
+    }
@@ -0,0 +1,90 @@
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, decode_token
+from sqlalchemy import update
+from extensions import db
+from models import RefreshToken
+
+
+class InvalidRefreshToken(Exception):
+    """사용할 수 없는 refresh token 입니다. (이미 교체됨, 폐기됨, 발급 기록 없음)"""
+
+
+def issue_tokens(user_id, user_type, family=None, fresh=False):
+    """access token 과 refresh token 을 함께 발급합니다. (커밋은 호출한 쪽에서 함)
+
+    family 를 넘기지 않으면 새 로그인 세션으로 보고 새 family 를 만듭니다.
+    """
+    family = family or str(uuid.uuid4())
+    claims = {'user_type': user_type}
+    access_token = create_access_token(identity=user_id, additional_claims=claims, fresh=fresh)
+    refresh_token = create_refresh_token(identity=user_id, additional_claims={**claims, 'family': family})
+
+    payload = decode_token(refresh_token)
+    db.session.add(RefreshToken(
+        jti=payload['jti'],
+        family=family,
+        user_id=user_id,
+        expires_at=datetime.utcfromtimestamp(payload['exp'])
+    ))
+    return access_token, refresh_token
+
+
+def revoke_family(family):
+    """같은 로그인 세션에서 발급된 refresh token 을 모두 폐기합니다. (커밋은 호출한 쪽에서 함)"""
+    return db.session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family == family, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def rotate_refresh_token(jwt_payload, user_type):
+    """refresh token 을 새 토큰 쌍으로 교체합니다. 각 refresh token 은 한 번만 사용할 수 있습니다.
+
+    이미 교체된 토큰이 다시 제출되면 탈취된 것으로 보고 family 전체를 폐기한 뒤
+    InvalidRefreshToken 을 발생시킵니다. (폐기 내역을 남기려면 호출한 쪽에서 커밋해야 함)
+    """
+    now = datetime.utcnow()
+    # 조건부 UPDATE 로 사용 처리해서 같은 토큰으로 동시에 갱신해도 한 요청만 성공
+    claimed = db.session.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == jwt_payload['jti'],
+            RefreshToken.used_at.is_(None),
+            RefreshToken.revoked_at.is_(None)
+        )
+        .values(used_at=now)
+        .returning(RefreshToken.family)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if claimed is None:
+        token = RefreshToken.query.filter_by(jti=jwt_payload['jti']).first()
+        if token is None or token.revoked_at is not None:
+            raise InvalidRefreshToken('Refresh token has been revoked')
+        # 여러 탭이 같은 토큰으로 거의 동시에 갱신한 경우는 재사용으로 보지 않음
+        grace = timedelta(seconds=current_app.config['JWT_REFRESH_REUSE_GRACE'])
+        if now - token.used_at > grace:
+            revoke_family(token.family)
+        raise InvalidRefreshToken('Refresh token has already been used')
+
+    return issue_tokens(int(jwt_payload['sub']), user_type, family=claimed.family)
+
+
+def revoke_refresh_token(encoded_token, user_id):
+    """로그아웃할 때 함께 받은 refresh token 의 family 를 폐기합니다. (커밋은 호출한 쪽에서 함)"""
+    payload = decode_token(encoded_token, allow_expired=True)
+    if payload.get('type') != 'refresh' or int(payload['sub']) != user_id:
+        raise InvalidRefreshToken('Invalid refresh token')
+    token = RefreshToken.query.filter_by(jti=payload['jti']).first()
+    if token is not None:
+        revoke_family(token.family)
+
+
+def prune_refresh_tokens():
+    """만료된 refresh token 기록을 삭제합니다."""
+    return RefreshToken.query.filter(RefreshToken.expires_at <= datetime.utcnow()) \
+        .delete(synchronize_session=False)
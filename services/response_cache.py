@@ -0,0 +1,252 @@
+import hashlib
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request, Response
+from flask_jwt_extended import get_jwt, get_jwt_identity, current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+DIRECTORY_VERSION = 'directory'
+PENDING_INVALIDATIONS = 'response_cache_invalidations'
+
+
+def user_version(user_id):
+    """사용자별 버전 카운터 이름입니다."""
+    return f'user:{int(user_id)}'
+
+
+class LocalCacheBackend:
+    """프로세스 내 LRU 캐시입니다. 버전 카운터도 프로세스별로 관리되므로
+    워커가 하나인 개발 서버에서만 사용합니다."""
+
+    def __init__(self, max_entries=1024, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, name):
+        with self._lock:
+            return self._versions.get(name, 0)
+
+    def bump_version(self, name):
+        with self._lock:
+            self._versions[name] = self._versions.get(name, 0) + 1
+
+
+class SharedMemoryCacheBackend:
+    """tmpfs(/dev/shm) 디렉터리를 이용해 같은 서버의 모든 워커가 캐시와 버전 카운터를 공유합니다."""
+
+    def __init__(self, path, ttl=60):
+        import fcntl
+        self._fcntl = fcntl
+        self.ttl = ttl
+        self.entries_path = os.path.join(path, 'entries')
+        self.versions_path = os.path.join(path, 'versions')
+        os.makedirs(self.entries_path, exist_ok=True)
+        os.makedirs(self.versions_path, exist_ok=True)
+
+    def _entry_file(self, key):
+        return os.path.join(self.entries_path, hashlib.sha256(key.encode('utf-8')).hexdigest())
+
+    def _version_file(self, name):
+        return os.path.join(self.versions_path, hashlib.sha256(name.encode('utf-8')).hexdigest())
+
+    def get(self, key):
+        path = self._entry_file(key)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, value):
+        # 임시 파일에 쓴 뒤 rename 해서 다른 워커가 쓰다 만 파일을 읽지 않도록 함
+        fd, tmp_path = tempfile.mkstemp(dir=self.entries_path)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(value)
+        os.replace(tmp_path, self._entry_file(key))
+        if random.random() < 0.01:
+            self._prune()
+
+    def _prune(self):
+        deadline = time.time() - self.ttl
+        for entry in os.scandir(self.entries_path):
+            try:
+                if entry.stat().st_mtime < deadline:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def get_version(self, name):
+        try:
+            with open(self._version_file(name), 'rb') as f:
+                return int(f.read() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def bump_version(self, name):
+        with open(self._version_file(name), 'a+b') as f:
+            self._fcntl.flock(f, self._fcntl.LOCK_EX)
+            f.seek(0)
+            version = int(f.read() or 0) + 1
+            f.seek(0)
+            f.truncate()
+            f.write(str(version).encode('ascii'))
+
+
+class RedisCacheBackend:
+    """Redis 호환 서버를 이용해 여러 서버의 워커가 캐시와 버전 카운터를 공유합니다."""
+
+    def __init__(self, url, ttl=60, prefix='lion_connect:cache:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('RESPONSE_CACHE_BACKEND=redis 를 사용하려면 redis 패키지가 필요합니다.')
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + 'entry:' + key)
+
+    def set(self, key, value):
+        self.client.setex(self.prefix + 'entry:' + key, self.ttl, value)
+
+    def get_version(self, name):
+        return int(self.client.get(self.prefix + 'version:' + name) or 0)
+
+    def bump_version(self, name):
+        self.client.incr(self.prefix + 'version:' + name)
+
+
+def create_cache_backend(config):
+    """설정에 따라 응답 캐시 저장소를 생성합니다."""
+    backend = config['RESPONSE_CACHE_BACKEND']
+    ttl = config['RESPONSE_CACHE_TTL']
+    if backend == 'local' and config['WEB_WORKERS'] > 1:
+        # 워커마다 버전 카운터가 따로 있으면 다른 워커의 무효화를 보지 못하므로 허용하지 않음
+        raise ValueError('RESPONSE_CACHE_BACKEND=local 은 워커가 하나일 때만 사용할 수 있습니다. shm 또는 redis 를 사용하세요.')
+    if backend == 'local':
+        return LocalCacheBackend(config['RESPONSE_CACHE_MAX_ENTRIES'], ttl)
+    if backend == 'shm':
+        return SharedMemoryCacheBackend(config['RESPONSE_CACHE_SHM_PATH'], ttl)
+    if backend == 'redis':
+        return RedisCacheBackend(config['RESPONSE_CACHE_REDIS_URL'], ttl)
+    raise ValueError(f'Unknown RESPONSE_CACHE_BACKEND: {backend}')
+
+
+def init_response_cache(app):
+    app.extensions['response_cache'] = create_cache_backend(app.config)
+
+
+def get_cache():
+    return current_app.extensions['response_cache']
+
+
+def invalidate(*version_names):
+    """현재 트랜잭션이 커밋되면 주어진 버전 카운터를 올리도록 예약합니다.
+
+    커밋 전에 올리면 다른 요청이 커밋 전 데이터로 새 버전의 응답을 캐시할 수 있으므로
+    실제 증가는 after_commit 시점에 합니다.
+    """
+    from extensions import db
+    pending = db.session.info.setdefault(PENDING_INVALIDATIONS, set())
+    pending.update(version_names)
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_pending_versions(session):
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    cache = current_app.extensions.get('response_cache') if pending else None
+    if cache is not None:
+        for name in pending:
+            cache.bump_version(name)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_versions(session, previous_transaction):
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def _caller_role():
+    # 로그인 시 토큰에 넣은 user_type 을 우선 사용하고, 예전 토큰이면 사용자 정보에서 확인
+    role = get_jwt().get('user_type')
+    if role is None and current_user is not None:
+        role = current_user.user_type
+    return role
+
+
+def cached_response(version_name):
+    """JSON 응답을 (엔드포인트, 호출자 역할, 버전 카운터, 요청 파라미터) 기준으로 캐시합니다.
+
+    version_name 은 JWT identity 를 받아 버전 카운터 이름(또는 이름 튜플)을 돌려주는 함수입니다.
+    ETag 는 응답 본문의 해시로 만들어 캐시 항목에 함께 저장하므로, 본문이 다르면 ETag 도 다릅니다.
+    If-None-Match 가 일치하면 본문 없이 304 를 반환합니다.
+    200 이 아닌 응답이나 Response 객체(스트리밍 등)는 캐시하지 않습니다.
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            names = version_name(get_jwt_identity())
+            if isinstance(names, str):
+                names = (names,)
+            key_source = '|'.join([
+                request.endpoint or '',
+                str(_caller_role()),
+                *(f'{name}={cache.get_version(name)}' for name in names),
+                request.query_string.decode('utf-8', 'replace'),
+                request.headers.get('Accept', '')
+            ])
+            key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+            # 캐시 항목은 "ETag\n본문" 형식으로 저장
+            entry = cache.get(key)
+            if entry is not None:
+                etag, _, body = entry.partition(b'\n')
+                etag = etag.decode('ascii')
+            else:
+                result = f(*args, **kwargs)
+                if isinstance(result, Response):
+                    return result
+                data, status = result if isinstance(result, tuple) else (result, 200)
+                if status != 200:
+                    return result
+                body = current_app.json.dumps(data).encode('utf-8')
+                etag = hashlib.sha256(body).hexdigest()
+                cache.set(key, etag.encode('ascii') + b'\n' + body)
+
+            headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache', 'Vary': 'Authorization, Accept'}
+            if etag in request.if_none_match:
+                return Response(status=304, headers=headers)
+            return Response(body, status=200, mimetype='application/json', headers=headers)
+        return wrapper
+    return decorator
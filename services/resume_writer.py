@@ -0,0 +1,393 @@
+from datetime import datetime
+from sqlalchemy import select, insert, update, delete
+from extensions import db
+from models import User, WorkExperience, Project, Education, Award, Certificate, Skill, user_skills
+from services.skill_registry import normalize_skill_name, resolve_skill_ids
+from services.image_uploads import image_urls
+from services.image_processing import link_project_images
+
+# 이력서 저장 요청에서 그대로 덮어쓰는 기본 정보 (이메일 제외)
+PROFILE_FIELDS = ('name', 'phone', 'introduction', 'portfolio', 'blog', 'github')
+
+
+class ResumeValidationError(ValueError):
+    """이력서 항목의 필수 값이 없거나 형식이 잘못됐습니다."""
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+def _value(value):
+    return value
+
+
+BOOLEAN_STRINGS = {'true': True, '1': True, 'yes': True, 'false': False, '0': False, 'no': False}
+
+
+def _bool(value):
+    # bool("false") 는 True 이므로 JSON 불리언과 흔한 문자열/숫자 표기만 받고 나머지는 잘못된 값으로 처리
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in BOOLEAN_STRINGS:
+        return BOOLEAN_STRINGS[value.strip().lower()]
+    raise ValueError(f'Invalid boolean: {value!r}')
+
+
+class ResumeSection:
+    """이력서의 한 섹션(경력, 프로젝트 등)을 요청 형식과 모델 컬럼 사이에서 변환합니다.
+
+    fields 는 (컬럼 이름, 요청 키, 변환 함수, 기본값) 목록이며,
+    모델에서 NOT NULL 인 컬럼은 필수 값으로 검사합니다.
+    """
+
+    def __init__(self, key, name, model, fields):
+        self.key = key
+        self.name = name
+        self.model = model
+        self.fields = fields
+        self.columns = [getattr(model, column) for column, _, _, _ in fields]
+        self.required = {column for column, _, _, _ in fields if not model.__table__.c[column].nullable}
+
+    def values(self, entry, index, current=None):
+        """요청 항목을 컬럼 값으로 바꿉니다. current 를 넘기면 요청에 없는 필드는 현재 값을 유지합니다."""
+        if not isinstance(entry, dict):
+            raise ResumeValidationError(f'{self.key}[{index}] must be an object')
+        values = {}
+        for column, request_key, convert, default in self.fields:
+            if current is not None and request_key not in entry:
+                values[column] = current[column]
+                continue
+            raw = entry.get(request_key)
+            try:
+                value = convert(raw) if raw is not None else default
+            except (TypeError, ValueError):
+                raise ResumeValidationError(f'{self.key}[{index}].{request_key} is invalid')
+            if value is None and column in self.required:
+                raise ResumeValidationError(f'{self.key}[{index}].{request_key} is required')
+            values[column] = value
+        return values
+
+
+RESUME_SECTIONS = (
+    ResumeSection('workExperience', 'work_experiences', WorkExperience, [
+        ('company', 'company', _value, None),
+        ('department', 'department', _value, None),
+        ('position', 'position', _value, None),
+        ('is_current', 'is_current', _bool, False),
+        ('description', 'description', _value, None),
+        ('start_date', 'startDate', _date, None),
+        ('end_date', 'endDate', _date, None),
+    ]),
+    ResumeSection('projects', 'projects', Project, [
+        ('title', 'title', _value, None),
+        ('organization', 'organization', _value, None),
+        ('description', 'description', _value, None),
+        ('portfolio_url', 'portfolio_url', _value, None),
+        ('image_url', 'image_url', _value, None),
+        ('is_representative', 'is_representative', _bool, False),
+        ('start_date', 'startDate', _date, None),
+        ('end_date', 'endDate', _date, None),
+        ('tech_stack', 'techStack', _value, []),
+    ]),
+    ResumeSection('education', 'education', Education, [
+        ('school', 'school', _value, None),
+        ('major', 'major', _value, None),
+        ('degree', 'degree', _value, None),
+        ('start_date', 'startDate', _date, None),
+        ('end_date', 'endDate', _date, None),
+    ]),
+    ResumeSection('awards', 'awards', Award, [
+        ('title', 'title', _value, None),
+        ('start_date', 'startDate', _date, None),
+        ('end_date', 'endDate', _date, None),
+        ('description', 'description', _value, None),
+    ]),
+    ResumeSection('certificates', 'certificates', Certificate, [
+        ('title', 'title', _value, None),
+        ('organization', 'organization', _value, None),
+        ('issue_date', 'issueDate', _date, None),
+        ('credential_id', 'credential_id', _value, None),
+    ]),
+)
+
+
+def _content_key(section, values):
+    # 같은 내용인지 비교하기 위한 해시 가능한 키 (JSON 목록은 튜플로)
+    return tuple(
+        tuple(value) if isinstance(value, list) else value
+        for value in (values[column] for column, _, _, _ in section.fields)
+    )
+
+
+def diff_section(section, existing, entries):
+    """기존 행과 요청 항목을 짝지어 필요한 INSERT/UPDATE/DELETE 를 계산합니다.
+
+    - existing: {id: 컬럼 값 dict} (id 순)
+    - 요청 항목에 기존 행의 id 가 있으면 그 행과, 없으면 내용이 같은 행과 짝짓습니다.
+    - 남은 항목은 남은 기존 행과 순서대로 짝지어 UPDATE 하고, 그래도 남으면 INSERT/DELETE 합니다.
+    반환값은 (INSERT 할 값 목록, UPDATE 할 {id: 값}, DELETE 할 id 목록) 입니다.
+    """
+    values_list = [section.values(entry, index) for index, entry in enumerate(entries)]
+    unclaimed = dict(existing)
+    matched = [None] * len(entries)
+
+    for index, entry in enumerate(entries):
+        entry_id = entry.get('id')
+        if isinstance(entry_id, int) and entry_id in unclaimed:
+            matched[index] = entry_id
+            del unclaimed[entry_id]
+
+    by_content = {}
+    for row_id, values in unclaimed.items():
+        by_content.setdefault(_content_key(section, values), []).append(row_id)
+    for index, values in enumerate(values_list):
+        if matched[index] is None:
+            candidates = by_content.get(_content_key(section, values))
+            if candidates:
+                matched[index] = candidates.pop(0)
+                del unclaimed[matched[index]]
+
+    leftovers = list(unclaimed)
+    inserts, updates = [], {}
+    for index, values in enumerate(values_list):
+        row_id = matched[index]
+        if row_id is None and leftovers:
+            row_id = leftovers.pop(0)
+        if row_id is None:
+            inserts.append(values)
+        elif existing[row_id] != values:
+            updates[row_id] = values
+    return inserts, updates, leftovers
+
+
+def resolve_image_ids(user_id, entries):
+    """프로젝트 항목의 imageId(POST /user/images 로 올린 이미지)를 image_url 로 바꿉니다."""
+    if not isinstance(entries, list):
+        return entries
+    ids = [entry['imageId'] for entry in entries if isinstance(entry, dict) and entry.get('imageId') is not None]
+    if not ids:
+        return entries
+    urls = image_urls(user_id, ids)
+    missing = [image_id for image_id in ids if image_id not in urls]
+    if missing:
+        raise ResumeValidationError(f'Image not found: {", ".join(map(str, missing))}')
+    return [{**entry, 'image_url': urls[entry['imageId']]}
+            if isinstance(entry, dict) and entry.get('imageId') is not None else entry
+            for entry in entries]
+
+
+RESUME_SECTIONS_BY_KEY = {
+    **{section.key: section for section in RESUME_SECTIONS},
+    **{section.name: section for section in RESUME_SECTIONS},
+}
+
+
+def _load_section(user_id, section):
+    rows = db.session.execute(
+        select(section.model.id, *section.columns)
+        .where(section.model.user_id == user_id)
+        .order_by(section.model.id)
+    ).all()
+    columns = [column for column, _, _, _ in section.fields]
+    return {row[0]: dict(zip(columns, row[1:])) for row in rows}
+
+
+def _apply_section(user_id, section, inserts, updates, deletes):
+    inserted = []
+    if inserts:
+        inserted = list(db.session.execute(
+            insert(section.model).returning(section.model.id, sort_by_parameter_order=True),
+            [{'user_id': user_id, **values} for values in inserts]
+        ).scalars())
+    if updates:
+        db.session.execute(
+            update(section.model),
+            [{'id': row_id, **values} for row_id, values in updates.items()]
+        )
+    if deletes:
+        db.session.execute(
+            delete(section.model)
+            .where(section.model.id.in_(deletes))
+            .execution_options(synchronize_session=False)
+        )
+    if section.model is Project:
+        # 바뀐 프로젝트의 이미지가 업로드한 이미지이면 크기/변형 정보를 함께 기록
+        link_project_images(inserted + list(updates))
+    return {'inserted': inserted, 'updated': list(updates), 'deleted': list(deletes)}
+
+
+def write_section(user_id, section, entries):
+    """섹션을 요청 항목과 같아지도록 바뀐 행만 여러 행 INSERT/UPDATE 와 한 번의 DELETE 로 저장합니다. (커밋은 호출한 쪽에서 함)"""
+    existing = _load_section(user_id, section)
+    inserts, updates, deletes = diff_section(section, existing, entries)
+    return _apply_section(user_id, section, inserts, updates, deletes)
+
+
+def patch_section(user_id, section, upsert, delete_ids):
+    """섹션의 일부 항목만 바꿉니다. (커밋은 호출한 쪽에서 함)
+
+    - upsert 항목에 id 가 있으면 그 항목에서 보낸 필드만 수정하고, 없으면 새 항목으로 추가합니다.
+    - delete_ids 의 항목은 삭제합니다.
+    """
+    if not isinstance(upsert, list) or not isinstance(delete_ids, list):
+        raise ResumeValidationError('upsert and delete must be lists')
+    if section.key == 'projects':
+        upsert = resolve_image_ids(user_id, upsert)
+    existing = _load_section(user_id, section)
+
+    inserts, updates = [], {}
+    for index, entry in enumerate(upsert):
+        entry_id = entry.get('id') if isinstance(entry, dict) else None
+        if entry_id is None:
+            inserts.append(section.values(entry, index))
+            continue
+        if entry_id not in existing:
+            raise ResumeValidationError(f'{section.key}[{index}].id {entry_id} not found')
+        values = section.values(entry, index, current=existing[entry_id])
+        if values != existing[entry_id]:
+            updates[entry_id] = values
+
+    for entry_id in delete_ids:
+        if entry_id not in existing:
+            raise ResumeValidationError(f'{section.key} id {entry_id} not found')
+        if entry_id in updates:
+            raise ResumeValidationError(f'{section.key} id {entry_id} cannot be updated and deleted at once')
+    deletes = list(dict.fromkeys(delete_ids))
+
+    return _apply_section(user_id, section, inserts, updates, deletes)
+
+
+def _current_skill_ids(user_id):
+    return set(db.session.execute(
+        select(user_skills.c.skill_id).where(user_skills.c.user_id == user_id)
+    ).scalars())
+
+
+def _link_skills(user, added, removed):
+    if added:
+        db.session.execute(user_skills.insert(), [{'user_id': user.id, 'skill_id': skill_id} for skill_id in added])
+    if removed:
+        db.session.execute(
+            user_skills.delete().where(user_skills.c.user_id == user.id, user_skills.c.skill_id.in_(removed))
+        )
+    if added or removed:
+        db.session.expire(user, ['skills'])
+    return {'added': added, 'removed': removed}
+
+
+def write_skills(user, names):
+    """사용자의 기술 스택을 요청 목록과 같게 맞춥니다. 추가/삭제할 연결만 씁니다. (커밋은 호출한 쪽에서 함)"""
+    if not isinstance(names, list):
+        raise ResumeValidationError('skills must be a list')
+    desired = list(dict.fromkeys(resolve_skill_ids(names).values()))
+    current = _current_skill_ids(user.id)
+    return _link_skills(
+        user,
+        [skill_id for skill_id in desired if skill_id not in current],
+        sorted(current - set(desired))
+    )
+
+
+def patch_skills(user, add, remove):
+    """기술 스택에 add 를 연결하고 remove 를 뺍니다. (커밋은 호출한 쪽에서 함)"""
+    if not isinstance(add, list) or not isinstance(remove, list):
+        raise ResumeValidationError('add and remove must be lists')
+    if not all(isinstance(name, str) for name in remove):
+        raise ResumeValidationError('Skill names must be strings')
+    # 빼는 기술은 새로 만들 필요가 없으므로 조회만 함
+    remove_keys = {normalize_skill_name(name) for name in remove}
+    remove_ids = set(db.session.execute(
+        select(Skill.id).where(Skill.normalized_name.in_(remove_keys))
+    ).scalars()) if remove_keys else set()
+    add_ids = list(dict.fromkeys(resolve_skill_ids(add).values()))
+    current = _current_skill_ids(user.id)
+    return _link_skills(
+        user,
+        [skill_id for skill_id in add_ids if skill_id not in current and skill_id not in remove_ids],
+        sorted(current & remove_ids)
+    )
+
+
+def patch_profile(user, data):
+    """보낸 기본 정보 필드만 수정하고 바뀐 필드 이름 목록을 반환합니다."""
+    unknown = [field for field in data if field not in PROFILE_FIELDS]
+    if unknown:
+        raise ResumeValidationError(f'Unknown profile fields: {", ".join(unknown)}')
+    changed = []
+    for field in PROFILE_FIELDS:
+        if field in data and data[field] != getattr(user, field):
+            setattr(user, field, data[field])
+            changed.append(field)
+    return changed
+
+
+def bump_resume_version(user_id, expected_versions=None):
+    """이력서 버전을 1 올리고 새 버전을 반환합니다.
+
+    expected_versions 를 넘기면 현재 버전이 그중 하나일 때만 올리고, 아니면 None 을 반환합니다.
+    조건부 UPDATE 하나로 처리하므로 동시에 수정해도 한 요청만 성공합니다.
+    """
+    stmt = update(User).where(User.id == user_id)
+    if expected_versions is not None:
+        stmt = stmt.where(User.resume_version.in_(expected_versions))
+    return db.session.execute(
+        stmt.values(resume_version=User.resume_version + 1)
+        .returning(User.resume_version)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+
+
+def _section_changed(change):
+    if isinstance(change, list):
+        return bool(change)
+    return any(change.values())
+
+
+RESUME_PATCH_SECTIONS = ('profile', 'skills', *(section.key for section in RESUME_SECTIONS))
+
+
+def patch_resume_section(user, key, data):
+    """이력서의 한 섹션만 부분 수정하고 (섹션 이름, 바뀐 내용, 변경 여부) 를 반환합니다. (커밋은 호출한 쪽에서 함)
+
+    - profile: 보낸 기본 정보 필드만 수정합니다.
+    - skills: {"add": [...], "remove": [...]}
+    - 그 밖의 섹션: {"upsert": [...], "delete": [id, ...]}
+    없는 섹션이면 KeyError 를 발생시킵니다.
+    """
+    if key == 'profile':
+        name, change = 'profile', patch_profile(user, data)
+    elif key == 'skills':
+        name, change = 'skills', patch_skills(user, data.get('add') or [], data.get('remove') or [])
+    else:
+        section = RESUME_SECTIONS_BY_KEY[key]
+        name, change = section.name, patch_section(user.id, section, data.get('upsert') or [], data.get('delete') or [])
+    return name, change, _section_changed(change)
+
+
+def write_resume(user, data):
+    """이력서 전체를 저장하고 바뀐 내용을 반환합니다. (커밋은 호출한 쪽에서 함)
+
+    섹션 키가 없으면 빈 목록으로 보고, skills 키가 없으면 기술 스택은 그대로 둡니다.
+    반환값의 changed 가 False 이면 아무것도 쓰지 않았으므로 후속 작업을 건너뛰어도 됩니다.
+    """
+    changes = {'profile': patch_profile(user, {field: data[field] for field in PROFILE_FIELDS if field in data})}
+
+    changed = bool(changes['profile'])
+    for section in RESUME_SECTIONS:
+        entries = data.get(section.key) or []
+        if not isinstance(entries, list):
+            raise ResumeValidationError(f'{section.key} must be a list')
+        if section.key == 'projects':
+            entries = resolve_image_ids(user.id, entries)
+        changes[section.name] = write_section(user.id, section, entries)
+        changed = changed or _section_changed(changes[section.name])
+
+    if 'skills' in data:
+        changes['skills'] = write_skills(user, data['skills'] or [])
+        changed = changed or _section_changed(changes['skills'])
+
+    changes['changed'] = changed
+    return changes
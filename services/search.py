@@ -0,0 +1,177 @@
+import re
+from datetime import datetime
+from markupsafe import escape
+from sqlalchemy import text
+from extensions import db
+from models import User, StudentSearchDocument
+from services.profile_loader import load_profile_bundles
+
+# 한글 음절/자모 연속 구간과 그 외 문자/숫자 연속 구간
+HANGUL_RUN = r'[가-힣ㄱ-ㅎㅏ-ㅣ]+'
+TOKEN_PATTERN = re.compile(rf'({HANGUL_RUN})|([^\W_가-힣ㄱ-ㅎㅏ-ㅣ]+)')
+
+SNIPPET_RADIUS = 40
+
+# PostgreSQL: tokens 로부터 자동 계산되는 tsvector 컬럼과 GIN 인덱스
+POSTGRESQL_DDL = (
+    "ALTER TABLE student_search ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', tokens)) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_student_search_vector ON student_search USING GIN (search_vector)",
+)
+
+# SQLite: student_search 를 원본으로 하는 FTS5 외부 콘텐츠 테이블과 동기화 트리거
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS student_search_fts USING fts5("
+    "tokens, content='student_search', content_rowid='user_id')",
+    "CREATE TRIGGER IF NOT EXISTS student_search_ai AFTER INSERT ON student_search BEGIN "
+    "INSERT INTO student_search_fts(rowid, tokens) VALUES (new.user_id, new.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS student_search_ad AFTER DELETE ON student_search BEGIN "
+    "INSERT INTO student_search_fts(student_search_fts, rowid, tokens) VALUES ('delete', old.user_id, old.tokens); END",
+    "CREATE TRIGGER IF NOT EXISTS student_search_au AFTER UPDATE ON student_search BEGIN "
+    "INSERT INTO student_search_fts(student_search_fts, rowid, tokens) VALUES ('delete', old.user_id, old.tokens); "
+    "INSERT INTO student_search_fts(rowid, tokens) VALUES (new.user_id, new.tokens); END",
+)
+
+
+def tokenize(value):
+    """검색용 토큰 목록을 만듭니다.
+
+    한글은 띄어쓰기/조사와 무관하게 부분 일치하도록 글자 bigram 으로 나누고
+    (한 글자 구간은 그대로), 그 외 단어는 소문자로 바꿔 그대로 사용합니다.
+    """
+    tokens = []
+    for hangul, word in TOKEN_PATTERN.findall((value or '').lower()):
+        if hangul:
+            if len(hangul) == 1:
+                tokens.append(hangul)
+            else:
+                tokens.extend(hangul[i:i + 2] for i in range(len(hangul) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def build_search_content(user, bundle):
+    """수료생의 검색 대상 필드를 하나의 원문으로 합칩니다."""
+    parts = [user.name, user.course, user.introduction]
+    parts.extend(skill['name'] for skill in bundle['skills'])
+    for proj in bundle['projects']:
+        parts.extend([proj['title'], proj['description']])
+        parts.extend(tech for tech in proj['tech_stack'] or [] if isinstance(tech, str))
+    parts.extend(exp['description'] for exp in bundle['work_experiences'])
+    return '\n'.join(part for part in parts if part)
+
+
+def index_students(user_ids):
+    """주어진 사용자들의 검색 문서를 다시 만들어 현재 세션에 반영합니다."""
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return 0
+
+    db.session.flush()
+
+    students = User.query.filter(User.id.in_(user_ids), User.user_type == 'student').all()
+    bundles = load_profile_bundles([student.id for student in students])
+    documents = {doc.user_id: doc for doc in StudentSearchDocument.query.filter(StudentSearchDocument.user_id.in_(user_ids)).all()}
+
+    now = datetime.utcnow()
+    indexed = set()
+    for student in students:
+        content = build_search_content(student, bundles[student.id])
+        tokens = ' '.join(tokenize(content))
+        doc = documents.get(student.id)
+        if doc is None:
+            db.session.add(StudentSearchDocument(user_id=student.id, content=content, tokens=tokens, updated_at=now))
+        elif doc.tokens != tokens or doc.content != content:
+            doc.content = content
+            doc.tokens = tokens
+            doc.updated_at = now
+        indexed.add(student.id)
+
+    # 수료생이 아니게 된 사용자의 문서는 제거
+    for user_id, doc in documents.items():
+        if user_id not in indexed:
+            db.session.delete(doc)
+
+    return len(indexed)
+
+
+def ensure_search_schema():
+    """현재 데이터베이스 종류에 맞는 전문 검색 색인 구조를 생성합니다."""
+    StudentSearchDocument.__table__.create(db.engine, checkfirst=True)
+    statements = POSTGRESQL_DDL if db.engine.dialect.name == 'postgresql' else SQLITE_DDL
+    with db.engine.begin() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+def _match_postgresql(tokens, limit):
+    # 각 토큰을 접두어 검색으로 AND 결합 (토큰은 문자/숫자만 포함)
+    query = ' & '.join(f"'{token}':*" for token in tokens)
+    return db.session.execute(text(
+        "SELECT user_id, ts_rank(search_vector, q) AS rank "
+        "FROM student_search, to_tsquery('simple', :query) AS q "
+        "WHERE search_vector @@ q "
+        "ORDER BY rank DESC, user_id LIMIT :limit"
+    ), {'query': query, 'limit': limit}).all()
+
+
+def _match_sqlite(tokens, limit):
+    query = ' AND '.join(f'"{token}"*' for token in tokens)
+    # bm25 는 관련도가 높을수록 작은 값이므로 부호를 바꿔 점수로 사용
+    return db.session.execute(text(
+        "SELECT rowid AS user_id, -bm25(student_search_fts) AS rank "
+        "FROM student_search_fts WHERE student_search_fts MATCH :query "
+        "ORDER BY bm25(student_search_fts), rowid LIMIT :limit"
+    ), {'query': query, 'limit': limit}).all()
+
+
+def highlight_snippet(content, query):
+    """검색어가 처음 나타나는 부분 주변을 잘라 <mark> 로 강조한 스니펫을 만듭니다."""
+    words = sorted({word for word in query.split() if word}, key=len, reverse=True)
+    if not words or not content:
+        return escape((content or '')[:SNIPPET_RADIUS * 2])
+
+    pattern = re.compile('|'.join(re.escape(word) for word in words), re.IGNORECASE)
+    first = pattern.search(content)
+    if first is None:
+        return escape(content[:SNIPPET_RADIUS * 2])
+
+    start = max(first.start() - SNIPPET_RADIUS, 0)
+    end = min(first.end() + SNIPPET_RADIUS, len(content))
+    window = content[start:end].replace('\n', ' ')
+
+    pieces = []
+    cursor = 0
+    for match in pattern.finditer(window):
+        pieces.append(str(escape(window[cursor:match.start()])))
+        pieces.append(f'<mark>{escape(match.group())}</mark>')
+        cursor = match.end()
+    pieces.append(str(escape(window[cursor:])))
+
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(content) else ''
+    return prefix + ''.join(pieces) + suffix
+
+
+def search_students(query, limit):
+    """검색어와 일치하는 수료생 (user_id, 점수, 스니펫) 목록을 관련도 순으로 반환합니다."""
+    tokens = list(dict.fromkeys(tokenize(query)))
+    if not tokens:
+        return []
+
+    if db.engine.dialect.name == 'postgresql':
+        matches = _match_postgresql(tokens, limit)
+    else:
+        matches = _match_sqlite(tokens, limit)
+    if not matches:
+        return []
+
+    user_ids = [row.user_id for row in matches]
+    contents = dict(db.session.query(StudentSearchDocument.user_id, StudentSearchDocument.content)
+                    .filter(StudentSearchDocument.user_id.in_(user_ids)).all())
+    return [{
+        'user_id': row.user_id,
+        'score': float(row.rank),
+        'snippet': str(highlight_snippet(contents.get(row.user_id, ''), query))
+    } for row in matches]
@@ -0,0 +1,172 @@
+from models import User, WorkExperience, Project, Education, Award, Certificate, Skill, Match, Post, Comment
+
+
+class Schema:
+    """모델 출력 형식을 한 번만 컴파일해 두고 튜플 행을 dict 로 바꾸는 직렬화기입니다.
+
+    columns 는 SELECT 할 컬럼 목록이며, serialize(row) 는 같은 순서의 튜플 행(추가 컬럼이
+    뒤에 붙어 있어도 무시)을 받아 출력 dict 를 반환합니다. 필드 값으로 다른 Schema 를 주면
+    그 컬럼들을 이어서 SELECT 하고 중첩 dict 로 출력합니다.
+    """
+
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.columns = [column for _, value in fields
+                        for column in (value.columns if isinstance(value, Schema) else [value])]
+        self.serialize = self._compile()
+
+    def _literal(self, start):
+        items = []
+        index = start
+        for key, value in self.fields:
+            if isinstance(value, Schema):
+                items.append(f'{key!r}: {value._literal(index)}')
+                index += len(value.columns)
+            else:
+                items.append(f'{key!r}: row[{index}]')
+                index += 1
+        return '{' + ', '.join(items) + '}'
+
+    def _compile(self):
+        # 필드마다 함수 호출/분기를 거치지 않도록 dict 리터럴을 만드는 함수를 생성.
+        # 날짜는 date 객체 그대로 두고 JSON provider 가 ISO 8601 문자열로 직렬화
+        source = f'def serialize_{self.name}(row):\n    return {self._literal(0)}'
+        namespace = {}
+        exec(compile(source, f'<serializer {self.name}>', 'exec'), namespace)
+        return namespace[f'serialize_{self.name}']
+
+    def serialize_many(self, rows):
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+
+WORK_EXPERIENCE = Schema('work_experience', [
+    ('id', WorkExperience.id),
+    ('company', WorkExperience.company),
+    ('department', WorkExperience.department),
+    ('position', WorkExperience.position),
+    ('is_current', WorkExperience.is_current),
+    ('start_date', WorkExperience.start_date),
+    ('end_date', WorkExperience.end_date),
+    ('description', WorkExperience.description),
+])
+
+PROJECT = Schema('project', [
+    ('id', Project.id),
+    ('title', Project.title),
+    ('description', Project.description),
+    ('organization', Project.organization),
+    ('portfolio_url', Project.portfolio_url),
+    ('image_url', Project.image_url),
+    ('is_representative', Project.is_representative),
+    ('start_date', Project.start_date),
+    ('end_date', Project.end_date),
+    ('tech_stack', Project.tech_stack),
+    ('image_width', Project.image_width),
+    ('image_height', Project.image_height),
+    ('image_variants', Project.image_variants),
+])
+
+EDUCATION = Schema('education', [
+    ('id', Education.id),
+    ('school', Education.school),
+    ('major', Education.major),
+    ('degree', Education.degree),
+    ('start_date', Education.start_date),
+    ('end_date', Education.end_date),
+])
+
+AWARD = Schema('award', [
+    ('id', Award.id),
+    ('title', Award.title),
+    ('start_date', Award.start_date),
+    ('end_date', Award.end_date),
+    ('description', Award.description),
+])
+
+CERTIFICATE = Schema('certificate', [
+    ('id', Certificate.id),
+    ('title', Certificate.title),
+    ('organization', Certificate.organization),
+    ('issue_date', Certificate.issue_date),
+    ('credential_id', Certificate.credential_id),
+])
+
+SKILL = Schema('skill', [
+    ('id', Skill.id),
+    ('name', Skill.name),
+])
+
+# 수료생 목록(카드)의 user 항목. skills 는 이름 목록으로 따로 채움
+STUDENT_USER = Schema('student_user', [
+    ('id', User.id),
+    ('email', User.email),
+    ('name', User.name),
+    ('introduction', User.introduction),
+    ('phone', User.phone),
+    ('portfolio', User.portfolio),
+    ('blog', User.blog),
+    ('github', User.github),
+    ('course', User.course),
+])
+
+# 본인 프로필 조회의 user 항목
+PROFILE_USER = Schema('profile_user', [
+    ('id', User.id),
+    ('email', User.email),
+    ('name', User.name),
+    ('introduction', User.introduction),
+    ('phone', User.phone),
+    ('portfolio', User.portfolio),
+    ('blog', User.blog),
+    ('github', User.github),
+    ('user_type', User.user_type),
+    ('resume_version', User.resume_version),
+])
+
+COMPANY_PROFILE = Schema('company_profile', [
+    ('company_name', User.company_name),
+    ('company_description', User.company_description),
+    ('industry', User.industry),
+    ('company_size', User.company_size),
+    ('company_website', User.company_website),
+    ('required_skills', User.required_skills),
+])
+
+# 게시글 작성자, 매칭 상대방처럼 다른 사용자를 가리키는 항목
+USER_SUMMARY = Schema('user_summary', [
+    ('id', User.id),
+    ('name', User.name),
+])
+
+# 받은 매칭 요청 (Match.requester 와 JOIN 해서 조회)
+RECEIVED_MATCH = Schema('received_match', [
+    ('id', Match.id),
+    ('requester', USER_SUMMARY),
+    ('created_at', Match.created_at),
+])
+
+# 보낸 매칭 요청 (Match.receiver 와 JOIN 해서 조회)
+SENT_MATCH = Schema('sent_match', [
+    ('id', Match.id),
+    ('receiver', USER_SUMMARY),
+    ('status', Match.status),
+    ('created_at', Match.created_at),
+])
+
+POST = Schema('post', [
+    ('id', Post.id),
+    ('title', Post.title),
+    ('content', Post.content),
+    ('user', USER_SUMMARY),
+    ('created_at', Post.created_at),
+    ('likes', Post.likes),
+])
+
+COMMENT = Schema('comment', [
+    ('id', Comment.id),
+    ('content', Comment.content),
+    ('user', USER_SUMMARY),
+    ('created_at', Comment.created_at),
+])
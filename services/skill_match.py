@@ -0,0 +1,26 @@
+from extensions import db
+from models import User
+from services.ranking import query_terms_for, rank_students
+
+
+def match_suggestions(user, limit):
+    """사용자의 기술(기업 회원은 요구 기술)과 비슷한 수료생 상위 limit 명의 추천 목록을 만듭니다.
+
+    드문 기술이 겹칠수록 높은 점수를 받도록 IDF 가중 유사도로 정렬합니다.
+    """
+    ranked = rank_students(query_terms_for(user), limit, exclude_ids=[user.id])
+    if not ranked:
+        return []
+
+    users = {row.id: row for row in db.session.query(User.id, User.name, User.introduction)
+             .filter(User.id.in_([item['user_id'] for item in ranked]))}
+    return [{
+        'user': {
+            'id': item['user_id'],
+            'name': users[item['user_id']].name,
+            'introduction': users[item['user_id']].introduction
+        },
+        'matching_skills': item['matching_skills'],
+        'overlap': len(item['matching_skills']),
+        'score': item['score']
+    } for item in ranked if item['user_id'] in users]
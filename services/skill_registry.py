@@ -0,0 +1,130 @@
+import threading
+import unicodedata
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from extensions import db
+from models import Skill
+
+PENDING_SKILL_IDS = 'skill_registry_pending'
+SKILL_NAME_MAX_LENGTH = 50
+
+
+class InvalidSkillName(ValueError):
+    """저장할 수 없는 기술 이름입니다. (빈 이름, 너무 긴 이름)"""
+
+
+def clean_skill_name(name):
+    """표시용 기술 이름입니다. 앞뒤 공백을 없애고 연속된 공백을 하나로 줄입니다."""
+    return ' '.join(unicodedata.normalize('NFKC', name).split())
+
+
+def normalize_skill_name(name):
+    """같은 기술인지 비교할 때 쓰는 이름입니다. ('React', 'react ', 'REACT' -> 'react')"""
+    return clean_skill_name(name).casefold()
+
+
+def _insert(table):
+    """현재 데이터베이스에 맞는 ON CONFLICT 지원 INSERT 구문을 반환합니다."""
+    if db.engine.dialect.name == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+class SkillRegistry:
+    """정규화한 기술 이름 -> id 를 프로세스 메모리에 보관합니다.
+
+    기술은 지우지 않으므로 한 번 찾은 id 는 바뀌지 않습니다. 새로 만든 기술은
+    트랜잭션이 롤백될 수 있으므로 커밋된 뒤에 캐시에 넣습니다.
+    """
+
+    def __init__(self, max_entries=50000):
+        self.max_entries = max_entries
+        self._ids = {}
+        self._lock = threading.Lock()
+
+    def _remember(self, ids):
+        with self._lock:
+            if len(self._ids) + len(ids) > self.max_entries:
+                self._ids.clear()
+            self._ids.update(ids)
+
+    def get_or_create(self, names):
+        """기술 이름 목록을 입력 순서대로 {정규화한 이름: id} 로 바꿉니다. 없는 기술은 새로 만듭니다. (커밋은 호출한 쪽에서 함)
+
+        캐시에 없는 이름만 INSERT ... ON CONFLICT DO NOTHING RETURNING 한 번과 SELECT 한 번으로 처리합니다.
+        다른 워커가 같은 이름을 동시에 넣으면 충돌로 건너뛰고 SELECT 에서 그 행을 읽습니다.
+        """
+        display_names = {}
+        for name in names:
+            if not isinstance(name, str):
+                raise InvalidSkillName('Skill names must be strings')
+            display = clean_skill_name(name)
+            if not display:
+                continue
+            if len(display) > SKILL_NAME_MAX_LENGTH:
+                raise InvalidSkillName(f'Skill names must be at most {SKILL_NAME_MAX_LENGTH} characters')
+            display_names.setdefault(display.casefold(), display)
+
+        # 이 트랜잭션에서 이미 만든 기술은 아직 캐시에 없으므로 세션에 보관한 값을 먼저 봄
+        pending = db.session.info.get(PENDING_SKILL_IDS, {})
+        with self._lock:
+            ids = {key: self._ids.get(key, pending.get(key)) for key in display_names}
+        ids = {key: skill_id for key, skill_id in ids.items() if skill_id is not None}
+        missing = [key for key in display_names if key not in ids]
+        if not missing:
+            return ids
+
+        created = dict(db.session.execute(
+            _insert(Skill.__table__)
+            .values([{'name': display_names[key], 'normalized_name': key} for key in missing])
+            .on_conflict_do_nothing()
+            .returning(Skill.normalized_name, Skill.id)
+        ).all())
+        existing = [key for key in missing if key not in created]
+        found = dict(db.session.execute(
+            select(Skill.normalized_name, Skill.id).where(Skill.normalized_name.in_(existing))
+        ).all()) if existing else {}
+
+        self._remember(found)
+        if created:
+            db.session.info.setdefault(PENDING_SKILL_IDS, {}).update(created)
+        ids.update(found)
+        ids.update(created)
+        return {key: ids[key] for key in display_names}
+
+
+def init_skill_registry(app):
+    app.extensions['skill_registry'] = SkillRegistry(app.config['SKILL_REGISTRY_MAX_ENTRIES'])
+
+
+def get_skill_registry():
+    return current_app.extensions['skill_registry']
+
+
+def resolve_skill_ids(names):
+    """기술 이름 목록을 {정규화한 이름: id} 로 바꿉니다. 없는 기술은 새로 만듭니다."""
+    return get_skill_registry().get_or_create(names)
+
+
+def resolve_skills(names):
+    """기술 이름 목록을 입력 순서대로 중복 없는 Skill 객체 목록으로 바꿉니다."""
+    ids = list(dict.fromkeys(resolve_skill_ids(names).values()))
+    if not ids:
+        return []
+    skills = {skill.id: skill for skill in Skill.query.filter(Skill.id.in_(ids))}
+    return [skills[skill_id] for skill_id in ids]
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_created_skills(session):
+    pending = session.info.pop(PENDING_SKILL_IDS, None)
+    registry = current_app.extensions.get('skill_registry') if pending else None
+    if registry is not None:
+        registry._remember(pending)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_created_skills(session, previous_transaction):
+    session.info.pop(PENDING_SKILL_IDS, None)
@@ -0,0 +1,94 @@
+from datetime import datetime
+from extensions import db
+from models import User, StudentCard
+from services.profile_loader import load_profile_bundles
+from services.serializers import STUDENT_USER
+from services.image_processing import CARD_IMAGE_VARIANTS, pick_variants
+
+
+def build_student_profiles(user_ids):
+    """수료생 목록 응답 데이터를 구성합니다. (user_id 순서)"""
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return []
+
+    rows = db.session.query(*STUDENT_USER.columns) \
+        .filter(User.id.in_(user_ids), User.user_type == 'student') \
+        .order_by(User.id) \
+        .all()
+    # 모든 학생의 관련 데이터를 테이블당 한 번의 쿼리로 조회
+    bundles = load_profile_bundles([row.id for row in rows])
+
+    response_data = []
+    for row in rows:
+        bundle = bundles[row.id]
+        user = STUDENT_USER.serialize(row)
+        user['skills'] = [skill['name'] for skill in bundle['skills']]
+        for project in bundle['projects']:
+            project['image_variants'] = pick_variants(project['image_variants'], CARD_IMAGE_VARIANTS)
+        response_data.append({
+            'user': user,
+            'work_experiences': bundle['work_experiences'],
+            'projects': bundle['projects'],
+            'education': bundle['education'],
+            'awards': bundle['awards'],
+            'certificates': bundle['certificates']
+        })
+
+    return response_data
+
+
+def rebuild_student_cards(user_ids):
+    """주어진 사용자들의 수료생 카드를 다시 만들어 현재 세션에 반영합니다.
+
+    커밋은 호출한 쪽에서 하므로 이력 저장과 같은 트랜잭션으로 묶입니다.
+    수료생이 아니거나 삭제된 사용자의 카드는 제거합니다.
+    """
+    user_ids = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    if not user_ids:
+        return 0
+
+    # 아직 flush 되지 않은 변경 사항도 카드에 반영되도록 먼저 flush
+    db.session.flush()
+
+    documents = {profile['user']['id']: profile for profile in build_student_profiles(user_ids)}
+    cards = {card.user_id: card for card in StudentCard.query.filter(StudentCard.user_id.in_(user_ids)).all()}
+
+    now = datetime.utcnow()
+    for user_id in user_ids:
+        card = cards.get(user_id)
+        document = documents.get(user_id)
+        if document is None:
+            if card is not None:
+                db.session.delete(card)
+        elif card is None:
+            db.session.add(StudentCard(user_id=user_id, document=document, updated_at=now))
+        else:
+            card.document = document
+            card.updated_at = now
+
+    return len(documents)
+
+
+def load_card_documents(rows):
+    """(id, document) 행 목록을 목록 응답 문서로 바꿉니다.
+
+    아직 카드가 만들어지지 않은 수료생은 그 자리에서 문서를 만들어 채웁니다.
+    """
+    missing_ids = [row.id for row in rows if row.document is None]
+    built = {}
+    if missing_ids:
+        built = {profile['user']['id']: profile for profile in build_student_profiles(missing_ids)}
+    documents = []
+    for row in rows:
+        document = row.document if row.document is not None else built.get(row.id)
+        if document is not None:
+            documents.append(document)
+    return documents
+
+
+def student_card_query():
+    """수료생 id 와 카드 문서를 한 번에 읽는 쿼리를 반환합니다."""
+    return db.session.query(User.id.label('id'), StudentCard.document.label('document')) \
+        .outerjoin(StudentCard, StudentCard.user_id == User.id) \
+        .filter(User.user_type == 'student')
@@ -0,0 +1,174 @@
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from extensions import db
+from models import RevokedToken, UserTokenRevocation
+
+
+class BloomFilter:
+    """거짓 양성은 있지만 거짓 음성은 없는 집합입니다. '포함되지 않음'이면 확실히 없는 키입니다."""
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        # 128비트 해시 하나를 둘로 나눠 k 개의 위치를 만드는 double hashing
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def user_key(user_id):
+    return f'user:{int(user_id)}'
+
+
+class RevocationFilter:
+    """폐기된 jti 와 일괄 폐기된 사용자를 담은 Bloom filter 를 테이블과 주기적으로 동기화합니다.
+
+    필터에 없으면 DB 를 조회하지 않고 바로 유효한 토큰으로 판단합니다.
+    다른 워커에서 폐기한 토큰은 최대 sync_interval 초 뒤에 반영됩니다.
+    """
+
+    def __init__(self, capacity, error_rate, sync_interval, rebuild_interval):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._bloom = None
+        self._last_token_id = 0
+        self._synced_at = 0.0
+        self._rebuilt_at = 0.0
+        self._lock = threading.Lock()
+
+    def _rebuild(self, now):
+        # 만료된 jti 는 다시 넣지 않으므로 주기적으로 새로 만들어 필터가 포화되지 않게 함
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        last_token_id = 0
+        rows = db.session.query(RevokedToken.id, RevokedToken.jti) \
+            .filter(RevokedToken.expires_at > datetime.utcnow())
+        for token_id, jti in rows:
+            bloom.add(jti)
+            last_token_id = max(last_token_id, token_id)
+        for (user_id,) in db.session.query(UserTokenRevocation.user_id):
+            bloom.add(user_key(user_id))
+        self._bloom = bloom
+        self._last_token_id = last_token_id
+        self._rebuilt_at = now
+
+    def _sync_new(self):
+        rows = db.session.query(RevokedToken.id, RevokedToken.jti) \
+            .filter(RevokedToken.id > self._last_token_id) \
+            .order_by(RevokedToken.id)
+        for token_id, jti in rows:
+            self._bloom.add(jti)
+            self._last_token_id = token_id
+        # 사용자 일괄 폐기는 드물고 행 수가 적으므로 매번 전체를 다시 읽음
+        for (user_id,) in db.session.query(UserTokenRevocation.user_id):
+            self._bloom.add(user_key(user_id))
+
+    def sync(self):
+        now = time.monotonic()
+        if self._bloom is not None and now - self._synced_at < self.sync_interval:
+            return
+        with self._lock:
+            if self._bloom is not None and now - self._synced_at < self.sync_interval:
+                return
+            if self._bloom is None or self._bloom.count >= self.capacity or now - self._rebuilt_at >= self.rebuild_interval:
+                self._rebuild(now)
+            else:
+                self._sync_new()
+            self._synced_at = now
+
+    def add(self, key):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(key)
+
+    def might_be_revoked(self, jti, user_id):
+        self.sync()
+        bloom = self._bloom
+        return jti in bloom or user_key(user_id) in bloom
+
+
+def init_token_blocklist(app):
+    app.extensions['token_blocklist'] = RevocationFilter(
+        app.config['JWT_BLOCKLIST_BLOOM_CAPACITY'],
+        app.config['JWT_BLOCKLIST_BLOOM_ERROR_RATE'],
+        app.config['JWT_BLOCKLIST_SYNC_INTERVAL'],
+        app.config['JWT_BLOCKLIST_REBUILD_INTERVAL']
+    )
+
+
+def get_revocation_filter():
+    return current_app.extensions['token_blocklist']
+
+
+def _utc_timestamp(value):
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def is_token_revoked(jwt_payload):
+    """토큰이 폐기됐는지 확인합니다. Bloom filter 에 없으면 DB 를 조회하지 않습니다."""
+    jti = jwt_payload['jti']
+    user_id = int(jwt_payload['sub'])
+    if not get_revocation_filter().might_be_revoked(jti, user_id):
+        return False
+
+    if db.session.query(RevokedToken.id).filter(RevokedToken.jti == jti).first() is not None:
+        return True
+    revoked_before = db.session.query(UserTokenRevocation.revoked_before) \
+        .filter(UserTokenRevocation.user_id == user_id).scalar()
+    # iat 는 초 단위이므로 같은 초에 발급된 토큰도 폐기된 것으로 봄
+    return revoked_before is not None and jwt_payload['iat'] <= _utc_timestamp(revoked_before)
+
+
+def revoke_token(jwt_payload):
+    """토큰 하나를 폐기 목록에 추가합니다. (커밋은 호출한 쪽에서 함)"""
+    jti = jwt_payload['jti']
+    if RevokedToken.query.filter_by(jti=jti).first() is None:
+        db.session.add(RevokedToken(
+            jti=jti,
+            user_id=int(jwt_payload['sub']),
+            token_type=jwt_payload.get('type', 'access'),
+            expires_at=datetime.utcfromtimestamp(jwt_payload['exp'])
+        ))
+    # 롤백되더라도 필터의 거짓 양성일 뿐이므로 바로 추가
+    get_revocation_filter().add(jti)
+
+
+def revoke_all_tokens(user_id):
+    """사용자에게 지금까지 발급된 모든 토큰을 폐기합니다. (커밋은 호출한 쪽에서 함)"""
+    revocation = db.session.get(UserTokenRevocation, user_id)
+    if revocation is None:
+        revocation = UserTokenRevocation(user_id=user_id)
+        db.session.add(revocation)
+    revocation.revoked_before = datetime.utcnow()
+    get_revocation_filter().add(user_key(user_id))
+
+
+def prune_revoked_tokens():
+    """더 이상 필요 없는 폐기 기록(만료된 jti, 모든 토큰이 만료된 뒤의 사용자 일괄 폐기)을 삭제합니다."""
+    now = datetime.utcnow()
+    deleted = RevokedToken.query.filter(RevokedToken.expires_at <= now).delete(synchronize_session=False)
+    token_lifetime = max(
+        current_app.config['JWT_ACCESS_TOKEN_EXPIRES'],
+        current_app.config.get('JWT_REFRESH_TOKEN_EXPIRES', timedelta(days=30))
+    )
+    deleted += UserTokenRevocation.query.filter(UserTokenRevocation.revoked_before <= now - token_lifetime) \
+        .delete(synchronize_session=False)
+    return deleted
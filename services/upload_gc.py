@@ -0,0 +1,152 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import JSON, String, delete, inspect, select
+from extensions import db
+from models import Project, UploadedImage, User
+from services.blob_storage import blob_url, get_blob_storage, key_from_url
+
+# 업로드 파일 URL 을 저장하는 컬럼 (업로드 파일을 쓰는 컬럼이 생기면 여기에 추가)
+IMAGE_URL_COLUMNS = (Project.image_url, User.profile_image)
+# {'변형 이름': {'webp': URL, 'jpeg': URL}} 형식으로 변형 URL 을 저장하는 컬럼
+VARIANT_URL_COLUMNS = (Project.image_variants,)
+VARIANT_FIELDS = ('webp', 'jpeg')
+
+
+class UnlistedImageColumns(Exception):
+    """업로드 URL 을 담을 수 있는 컬럼이 참조 목록에 빠져 있어 정리를 진행할 수 없을 때 발생합니다."""
+
+
+def unlisted_image_columns():
+    """데이터베이스에서 이름에 image 가 들어간 문자열/JSON 컬럼 중 참조 목록에 없는 컬럼을 찾습니다."""
+    listed = {(column.table.name, column.name) for column in IMAGE_URL_COLUMNS + VARIANT_URL_COLUMNS}
+    inspector = inspect(db.engine)
+    found = []
+    for table in inspector.get_table_names():
+        if table == UploadedImage.__tablename__:
+            continue
+        for column in inspector.get_columns(table):
+            if 'image' in column['name'] and isinstance(column['type'], (String, JSON)) \
+                    and (table, column['name']) not in listed:
+                found.append(f"{table}.{column['name']}")
+    return found
+
+
+def _stream(stmt, batch_size):
+    return db.session.execute(stmt.execution_options(yield_per=batch_size))
+
+
+def _variant_keys(variants, to_key=lambda value: value):
+    for variant in (variants or {}).values():
+        for field in VARIANT_FIELDS:
+            key = to_key(variant.get(field))
+            if key:
+                yield key
+
+
+def blob_reference_counts(batch_size=1000, exclude_upload_ids=()):
+    """저장소 키별 참조 수를 셉니다. 업로드 기록(원본, 변형)과 URL 컬럼의 참조를 모두 더합니다.
+
+    테이블을 batch_size 행씩 읽으므로 메모리에는 키별 카운트만 남습니다.
+    """
+    counts = Counter()
+    for column in IMAGE_URL_COLUMNS:
+        for url in _stream(select(column).where(column.isnot(None)), batch_size).scalars():
+            key = key_from_url(url)
+            if key:
+                counts[key] += 1
+    for column in VARIANT_URL_COLUMNS:
+        for variants in _stream(select(column).where(column.isnot(None)), batch_size).scalars():
+            counts.update(_variant_keys(variants, key_from_url))
+    rows = _stream(select(UploadedImage.id, UploadedImage.blob_key, UploadedImage.variants), batch_size)
+    for upload_id, key, variants in rows:
+        if upload_id in exclude_upload_ids:
+            continue
+        counts[key] += 1
+        counts.update(_variant_keys(variants))
+    return counts
+
+
+def _unused_uploads(cutoff, batch_size):
+    """cutoff 전에 올렸지만 어느 URL 컬럼에서도 쓰지 않는 업로드 기록의 id 를 찾습니다."""
+    used = set()
+    for column in IMAGE_URL_COLUMNS:
+        for url in _stream(select(column).where(column.isnot(None)), batch_size).scalars():
+            used.add(key_from_url(url))
+    rows = _stream(
+        select(UploadedImage.id, UploadedImage.blob_key).where(UploadedImage.created_at < cutoff),
+        batch_size
+    )
+    return [upload_id for upload_id, key in rows if key not in used]
+
+
+def _still_referenced(keys):
+    """삭제 직전에 다시 확인합니다. 표시(mark) 이후 같은 내용의 파일이 다시 올라와 참조된 경우를 거릅니다."""
+    referenced = set(db.session.execute(
+        select(UploadedImage.blob_key).where(UploadedImage.blob_key.in_(keys))
+    ).scalars())
+    urls = {blob_url(key): key for key in keys}
+    for column in IMAGE_URL_COLUMNS:
+        referenced.update(urls[url] for url in db.session.execute(
+            select(column).where(column.in_(list(urls)))
+        ).scalars())
+    return referenced
+
+
+def collect_garbage(grace=timedelta(hours=24), dry_run=False, batch_size=1000, progress=None):
+    """참조가 없는 업로드 파일을 지웁니다. (mark and sweep)
+
+    1. grace 보다 오래됐지만 아무 데서도 쓰지 않는 업로드 기록을 지웁니다. (이미지만 올리고 저장하지 않은 경우)
+    2. 남은 업로드 기록과 URL 컬럼에서 참조하는 저장소 키를 모읍니다. (mark)
+    3. 저장소를 처음부터 끝까지 훑으며 참조가 없고 grace 보다 오래된 파일을 batch_size 개씩 지웁니다. (sweep)
+
+    grace 안에 올라온 파일은 아직 저장 중인 요청이 참조할 수 있으므로 지우지 않습니다.
+    progress(검사한 파일 수, 지운 파일 수) 를 batch 마다 호출합니다.
+    참조 목록에 없는 이미지 컬럼이 있으면 그 컬럼이 가리키는 파일을 지울 수 있으므로 UnlistedImageColumns 를 발생시킵니다.
+    """
+    unlisted = unlisted_image_columns()
+    if unlisted:
+        raise UnlistedImageColumns(
+            f"IMAGE_URL_COLUMNS 에 없는 이미지 컬럼이 있어 정리하지 않습니다: {', '.join(unlisted)}"
+        )
+
+    cutoff = datetime.now(timezone.utc) - grace
+    unused_uploads = _unused_uploads(cutoff.replace(tzinfo=None), batch_size)
+    if unused_uploads and not dry_run:
+        for start in range(0, len(unused_uploads), batch_size):
+            db.session.execute(
+                delete(UploadedImage).where(UploadedImage.id.in_(unused_uploads[start:start + batch_size]))
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+
+    counts = blob_reference_counts(batch_size, exclude_upload_ids=set(unused_uploads))
+    storage = get_blob_storage()
+    stats = {'pruned_uploads': len(unused_uploads), 'scanned': 0, 'referenced': 0, 'deleted': 0, 'freed_bytes': 0}
+
+    def sweep(batch):
+        live = _still_referenced([key for key, _ in batch])
+        garbage = [(key, size) for key, size in batch if key not in live]
+        if garbage and not dry_run:
+            storage.delete([key for key, _ in garbage])
+        stats['deleted'] += len(garbage)
+        stats['freed_bytes'] += sum(size for _, size in garbage)
+        if progress is not None:
+            progress(stats['scanned'], stats['deleted'])
+
+    batch = []
+    for key, size, modified in storage.iter_blobs():
+        stats['scanned'] += 1
+        if counts.get(key):
+            stats['referenced'] += 1
+            continue
+        if modified > cutoff:
+            continue
+        batch.append((key, size))
+        if len(batch) >= batch_size:
+            sweep(batch)
+            batch = []
+    if batch:
+        sweep(batch)
+    # 읽기만 한 트랜잭션을 끝냄
+    db.session.rollback()
+    return stats